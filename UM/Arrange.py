@@ -0,0 +1,268 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import math
+
+import numpy
+
+from UM.Logger import Logger
+from UM.Math.Polygon import Polygon
+from UM.Math.Vector import Vector
+from UM.Operations.GroupedOperation import GroupedOperation
+from UM.Operations.TranslateOperation import TranslateOperation
+
+
+##  Automatic arrangement of nodes on a build area.
+#
+#   The footprint of every node is a convex hull Polygon on the X/Z plane.
+#   Each footprint is grown with Polygon.getMinkowskiHull to keep parts apart
+#   and then rasterized onto an occupancy grid that covers the build area.
+#   Parts are placed largest first, each at the first free spot when scanning
+#   the grid row by row from the minimum X/Z corner (bottom-left fill).
+#
+#   Every row of a rasterized convex footprint is a single span of cells, so
+#   the overlap of a footprint with the grid can be computed for all
+#   positions at once from per-row prefix sums of the occupancy grid.
+#
+#   The build area is centred on the origin, which matches the way scenes are
+#   set up.
+class Arrange:
+    ##  Number of grid rows that are searched at once for a free spot.
+    SearchRowChunk = 8
+
+    ##  Create an arrangement for a build area.
+    #
+    #   \param width \type{float} The size of the build area along the X axis.
+    #   \param depth \type{float} The size of the build area along the Z axis.
+    #   \param spacing \type{float} Minimum distance between two parts.
+    #   \param cell_size \type{float} Size of a cell of the occupancy grid.
+    #   Smaller cells pack tighter but take longer.
+    def __init__(self, width, depth, spacing = 2.0, cell_size = 1.0):
+        self._width = width
+        self._depth = depth
+        self._spacing = spacing
+        self._cell_size = cell_size
+
+        self._columns = max(int(math.floor(width / cell_size)), 0)
+        self._rows = max(int(math.floor(depth / cell_size)), 0)
+        self._origin = numpy.array([-width / 2, -depth / 2]) #World X/Z coordinates of the corner of cell (0, 0).
+
+        self._occupied = numpy.zeros((self._rows, self._columns), dtype = numpy.int32)
+        self._prefix = numpy.zeros((self._rows, self._columns + 1), dtype = numpy.int32) #Per-row prefix sums of _occupied.
+        self._longest_free_run = numpy.full(self._rows, self._columns, dtype = numpy.int64) #Length of the longest run of free cells in each row.
+
+        # Footprints are grown by half the spacing, so two grown footprints are always at least spacing apart.
+        # They are also grown by half a cell in every direction, which makes sure that each cell a footprint touches has its centre inside the grown footprint.
+        half_cell = cell_size / 2
+        self._grow_polygon = Polygon(numpy.array([[-half_cell, -half_cell], [half_cell, -half_cell], [half_cell, half_cell], [-half_cell, half_cell]], numpy.float32))
+        if spacing > 0:
+            self._grow_polygon = self._grow_polygon.getMinkowskiHull(Polygon.approximatedCircle(spacing / 2))
+
+    ##  Get the footprint of a node on the build plate.
+    #
+    #   If the node has a getConvexHull decoration that is used, otherwise the
+    #   footprint is computed from the convex hull of its (transformed) mesh.
+    #
+    #   \param node \type{SceneNode} The node to get the footprint of.
+    #   \return \type{Polygon} The footprint in world X/Z coordinates, or None if the node has no mesh.
+    @staticmethod
+    def getNodeFootprint(node):
+        if node.hasDecoration("getConvexHull"):
+            return node.callDecoration("getConvexHull")
+
+        meshes = []
+        if node.getMeshData():
+            meshes.append((node.getMeshData(), node.getWorldTransformation()))
+        for child in node.getAllChildren():
+            if child.getMeshData():
+                meshes.append((child.getMeshData(), child.getWorldTransformation()))
+
+        points = []
+        for mesh, transformation in meshes:
+            if mesh.getConvexHull() is not None:
+                vertices = mesh.getConvexHullTransformedVertices(transformation)
+            else: #Too few vertices for a hull.
+                vertices = mesh.getTransformed(transformation).getVertices()
+            if vertices is not None and len(vertices):
+                points.append(vertices[:, [0, 2]])
+        if not points:
+            return None
+
+        return Polygon(numpy.concatenate(points, axis = 0).astype(numpy.float32)).getConvexHull()
+
+    ##  Mark the area of a polygon as occupied.
+    #
+    #   This can be used for parts that should stay where they are, or for
+    #   areas of the build plate that can not be used. The spacing is applied to
+    #   the polygon as well.
+    #
+    #   \param polygon \type{Polygon} The area to occupy, in world X/Z coordinates.
+    def occupy(self, polygon):
+        mask = self._rasterize(polygon)
+        if mask is None:
+            return
+        first, last, minimum = mask
+
+        # The polygon is generally not aligned to the grid, so also cover the next cell in both directions.
+        cell = numpy.floor((minimum - self._origin) / self._cell_size).astype(numpy.int64)
+        for row in range(len(first) + 1):
+            if row < len(first):
+                span_first, span_last = first[row], last[row]
+            else:
+                span_first, span_last = 0, -1
+            if row > 0:
+                span_first = min(span_first, first[row - 1]) if span_last >= span_first else first[row - 1]
+                span_last = max(span_last, last[row - 1])
+            grid_row = cell[1] + row
+            if grid_row < 0 or grid_row >= self._rows or span_last < span_first:
+                continue
+            start = max(cell[0] + span_first, 0)
+            end = min(cell[0] + span_last + 2, self._columns)
+            if start < end:
+                self._occupied[grid_row, start:end] = 1
+        self._updatePrefix(max(cell[1], 0), min(cell[1] + len(first) + 1, self._rows))
+
+    ##  Find a place for each of a list of footprints.
+    #
+    #   The footprints are placed largest first, but the results are in the
+    #   same order as the input.
+    #
+    #   \param polygons \type{list} The footprints to place, in world X/Z coordinates.
+    #   \return A list with for every footprint the (x, z) offset to move it
+    #   by, or None if it could not be placed.
+    def arrangePolygons(self, polygons):
+        masks = [self._rasterize(polygon) for polygon in polygons]
+        areas = [numpy.sum(numpy.maximum(mask[1] - mask[0] + 1, 0)) if mask is not None else 0 for mask in masks]
+
+        offsets = [None] * len(polygons)
+        for index in sorted(range(len(polygons)), key = lambda i: -areas[i]):
+            if masks[index] is None:
+                continue
+            first, last, minimum = masks[index]
+            position = self._findPosition(first, last)
+            if position is None:
+                continue
+
+            self._place(first, last, position)
+            target = self._origin + numpy.array([position[1], position[0]]) * self._cell_size
+            offsets[index] = (float(target[0] - minimum[0]), float(target[1] - minimum[1]))
+
+        return offsets
+
+    ##  Arrange a list of nodes on the build area.
+    #
+    #   \param nodes \type{list} The nodes to arrange.
+    #   \return A tuple of a GroupedOperation with a TranslateOperation for
+    #   every node that was placed, and a list of nodes that did not fit.
+    #   The operation is not pushed.
+    def arrange(self, nodes):
+        footprints = [self.getNodeFootprint(node) for node in nodes]
+        offsets = self.arrangePolygons([footprint for footprint in footprints if footprint is not None])
+
+        operation = GroupedOperation()
+        unplaced_nodes = []
+        offset_index = 0
+        for node, footprint in zip(nodes, footprints):
+            if footprint is None: #Nothing to place.
+                continue
+            offset = offsets[offset_index]
+            offset_index += 1
+            if offset is None:
+                unplaced_nodes.append(node)
+                continue
+            operation.addOperation(TranslateOperation(node, Vector(offset[0], 0, offset[1])))
+
+        if unplaced_nodes:
+            Logger.log("w", "Could not find a place for %s of %s nodes", len(unplaced_nodes), len(nodes))
+        return operation, unplaced_nodes
+
+    ##  Rasterize a footprint into one span of cells per grid row.
+    #
+    #   \return A tuple of the first and last column of every row, relative to
+    #   the corner of the grown footprint, and the X/Z position of that corner.
+    #   None if the polygon is empty.
+    def _rasterize(self, polygon):
+        if polygon is None or not polygon.isValid():
+            return None
+
+        grown = polygon.getMinkowskiHull(self._grow_polygon)
+
+        points = numpy.array(grown.getPoints(), dtype = numpy.float64)
+        minimum = points.min(axis = 0)
+        points -= minimum
+        size = points.max(axis = 0)
+
+        row_count = max(int(math.ceil(size[1] / self._cell_size)), 1)
+        centers = (numpy.arange(row_count) + 0.5)[:, numpy.newaxis] * self._cell_size
+
+        # Intersect the centre line of every row with every edge of the convex footprint.
+        start = points[numpy.newaxis, :, :]
+        end = numpy.roll(points, -1, axis = 0)[numpy.newaxis, :, :]
+        delta_z = end[:, :, 1] - start[:, :, 1]
+        crosses = (numpy.minimum(start[:, :, 1], end[:, :, 1]) <= centers) & (centers <= numpy.maximum(start[:, :, 1], end[:, :, 1])) & (delta_z != 0)
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            fraction = (centers - start[:, :, 1]) / delta_z
+        x = start[:, :, 0] + fraction * (end[:, :, 0] - start[:, :, 0])
+        x_min = numpy.where(crosses, x, numpy.inf).min(axis = 1)
+        x_max = numpy.where(crosses, x, -numpy.inf).max(axis = 1)
+
+        # Cells whose centre lies in [x_min, x_max]. Rows without crossings get an empty span.
+        empty = ~numpy.isfinite(x_min)
+        x_min[empty] = 0
+        x_max[empty] = -self._cell_size
+        first = numpy.ceil(x_min / self._cell_size - 0.5).astype(numpy.int64)
+        last = numpy.floor(x_max / self._cell_size - 0.5).astype(numpy.int64)
+        first = numpy.maximum(first, 0)
+        return first, last, minimum
+
+    ##  Find the first free position for a rasterized footprint.
+    #
+    #   \return A tuple of (row, column) of the corner of the footprint, or None if it does not fit.
+    def _findPosition(self, first, last):
+        rows = numpy.nonzero(last >= first)[0]
+        if len(rows) == 0:
+            return None
+        row_count = rows[-1] + 1
+        column_count = self._columns - (last[rows].max() + 1) + 1 #Number of columns the corner can be in.
+        row_positions = self._rows - row_count + 1
+        if column_count <= 0 or row_positions <= 0:
+            return None
+
+        # A row can only hold the corner if every row of the footprint has a long enough run of free cells to fit its span.
+        candidates = numpy.ones(row_positions, dtype = numpy.bool_)
+        for row in rows:
+            candidates &= self._longest_free_run[row:row + row_positions] >= last[row] - first[row] + 1
+        candidates = numpy.nonzero(candidates)[0]
+
+        for chunk_start in range(0, len(candidates), self.SearchRowChunk):
+            chunk = candidates[chunk_start:chunk_start + self.SearchRowChunk]
+            overlap = numpy.zeros((len(chunk), column_count), dtype = numpy.int32)
+            for row in rows:
+                prefix = self._prefix[chunk + row]
+                overlap += prefix[:, last[row] + 1:last[row] + 1 + column_count]
+                overlap -= prefix[:, first[row]:first[row] + column_count]
+
+            free = (overlap == 0).ravel()
+            index = int(numpy.argmax(free))
+            if free[index]:
+                return int(chunk[index // column_count]), index % column_count
+
+        return None
+
+    ##  Mark the cells of a rasterized footprint at a position as occupied.
+    def _place(self, first, last, position):
+        row, column = position
+        for mask_row in range(len(first)):
+            if last[mask_row] >= first[mask_row]:
+                self._occupied[row + mask_row, column + first[mask_row]:column + last[mask_row] + 1] = 1
+        self._updatePrefix(row, row + len(first))
+
+    ##  Recompute the prefix sums of a range of rows after they changed.
+    def _updatePrefix(self, start, end):
+        if start >= end or self._columns == 0:
+            return
+        numpy.cumsum(self._occupied[start:end], axis = 1, out = self._prefix[start:end, 1:])
+        # The length of the free run ending at a cell is its distance to the last occupied cell before it.
+        columns = numpy.arange(self._columns)
+        last_occupied = numpy.maximum.accumulate(numpy.where(self._occupied[start:end] != 0, columns, -1), axis = 1)
+        self._longest_free_run[start:end] = (columns - last_occupied).max(axis = 1)
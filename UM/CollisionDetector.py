@@ -0,0 +1,255 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import numpy
+
+from UM.Arrange import Arrange
+
+
+##  Finds all overlapping pairs in a set of convex footprints.
+#
+#   Every footprint is stored under a key, usually the SceneNode it belongs
+#   to. Collisions are found in two phases. The broad phase is a sweep and
+#   prune over the axis-aligned bounding boxes of the footprints. The narrow
+#   phase is a separating axis test on the remaining pairs, done for all pairs
+#   at once with the precomputed edge normals of each hull.
+#
+#   Results are cached. When only some footprints change, only the pairs that
+#   involve those footprints are computed again.
+#
+#   The penetration vectors use the same convention as
+#   Polygon.intersectsPolygon: the vector of a pair (a, b) is the shortest
+#   translation that moves a out of b.
+class CollisionDetector:
+    ##  Maximum number of pairs for which the separating axis test is done at once.
+    PairChunk = 4096
+
+    def __init__(self):
+        self._keys = [] #Key of every footprint, by index.
+        self._indices = {} #Index of every key.
+
+        self._boxes = numpy.zeros((0, 4), dtype = numpy.float64) #Minimum X, minimum Y, maximum X and maximum Y of every footprint.
+        self._points = numpy.zeros((0, 1, 2), dtype = numpy.float64) #Hull vertices, padded by repeating the first vertex.
+        self._normals = numpy.full((0, 1, 2), numpy.nan, dtype = numpy.float64) #Unit edge normals, padded with NaN.
+
+        self._collisions = {} #For every key, the keys it collides with and the penetration vector.
+        self._dirty = set() #Keys whose collisions need to be computed again.
+        self._all_dirty = True
+
+    ##  Set or replace the footprint of a key.
+    #
+    #   Only the convex hull of the footprint is used. Footprints without a
+    #   surface are removed, as they can not collide.
+    #
+    #   \param key The key to store the footprint under. Must be hashable.
+    #   \param polygon \type{Polygon} The footprint.
+    def setFootprint(self, key, polygon):
+        points = None
+        if polygon is not None and polygon.isValid():
+            points = numpy.array(polygon.getConvexHull().getPoints(), dtype = numpy.float64)
+        if points is None or len(points) < 3:
+            self.removeFootprint(key)
+            return
+
+        if key in self._indices:
+            index = self._indices[key]
+        else:
+            index = len(self._keys)
+            self._keys.append(key)
+            self._indices[key] = index
+            self._collisions[key] = {}
+            self._reserve(len(self._keys), len(points))
+        if len(points) > self._points.shape[1]:
+            self._reserve(len(self._keys), len(points))
+
+        edges = numpy.roll(points, -1, axis = 0) - points
+        normals = numpy.column_stack((edges[:, 1], -edges[:, 0]))
+        lengths = numpy.linalg.norm(normals, axis = 1)
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            normals /= lengths[:, numpy.newaxis]
+        normals[lengths == 0] = numpy.nan #Duplicate vertices give no axis to test.
+
+        self._points[index] = points[0]
+        self._points[index, :len(points)] = points
+        self._normals[index] = numpy.nan
+        self._normals[index, :len(points)] = normals
+        self._boxes[index] = numpy.concatenate((points.min(axis = 0), points.max(axis = 0)))
+        self._dirty.add(key)
+
+    ##  Set or replace the footprint of a node.
+    #
+    #   The footprint is computed by Arrange.getNodeFootprint, in world X/Z
+    #   coordinates.
+    #
+    #   \param node \type{SceneNode} The node to update.
+    def updateNode(self, node):
+        self.setFootprint(node, Arrange.getNodeFootprint(node))
+
+    ##  Remove the footprint of a key.
+    #
+    #   \param key The key to remove. Nothing happens if it is not known.
+    def removeFootprint(self, key):
+        if key not in self._indices:
+            return
+
+        index = self._indices.pop(key)
+        last = len(self._keys) - 1
+        if index != last: #Move the last footprint into the gap.
+            moved_key = self._keys[last]
+            self._keys[index] = moved_key
+            self._indices[moved_key] = index
+            self._boxes[index] = self._boxes[last]
+            self._points[index] = self._points[last]
+            self._normals[index] = self._normals[last]
+        self._keys.pop()
+
+        for other in self._collisions.pop(key):
+            del self._collisions[other][key]
+        self._dirty.discard(key)
+
+    ##  Get all pairs of footprints that overlap.
+    #
+    #   \return A list of (key_a, key_b, (x, y)) tuples with the penetration
+    #   vector that moves key_a out of key_b. Every pair is listed once.
+    def getCollisions(self):
+        self._update()
+        result = []
+        for key in self._keys:
+            index = self._indices[key]
+            for other, penetration in self._collisions[key].items():
+                if index < self._indices[other]:
+                    result.append((key, other, penetration))
+        return result
+
+    ##  Get the footprints that overlap with the footprint of a key.
+    #
+    #   \param key The key to get the collisions of.
+    #   \return A dictionary with for every colliding key the (x, y)
+    #   penetration vector that moves the given key out of it.
+    def getCollisionsWith(self, key):
+        if key not in self._indices:
+            return {}
+        self._update()
+        return dict(self._collisions[key])
+
+    ##  Check whether the footprint of a key overlaps with any other footprint.
+    def hasCollisions(self, key):
+        return bool(self.getCollisionsWith(key))
+
+    ##  Make sure there is room for a number of footprints with a number of vertices.
+    def _reserve(self, count, vertex_count):
+        capacity, vertices = self._points.shape[:2]
+        if count <= capacity and vertex_count <= vertices:
+            return
+        new_capacity = max(count, capacity * 2, 16) if count > capacity else capacity
+        new_vertices = max(vertex_count, vertices)
+
+        boxes = numpy.zeros((new_capacity, 4), dtype = numpy.float64)
+        boxes[:capacity] = self._boxes
+        points = numpy.zeros((new_capacity, new_vertices, 2), dtype = numpy.float64)
+        points[:capacity, :vertices] = self._points
+        points[:capacity, vertices:] = self._points[:, :1] #Keep repeating the first vertex.
+        normals = numpy.full((new_capacity, new_vertices, 2), numpy.nan, dtype = numpy.float64)
+        normals[:capacity, :vertices] = self._normals
+
+        self._boxes = boxes
+        self._points = points
+        self._normals = normals
+
+    ##  Compute the collisions of all footprints that changed.
+    def _update(self):
+        if self._all_dirty:
+            for key in self._keys:
+                self._collisions[key] = {}
+            first, second = self._sweepAndPrune()
+        elif self._dirty:
+            for key in self._dirty:
+                for other in self._collisions[key]:
+                    del self._collisions[other][key]
+                self._collisions[key] = {}
+            first, second = self._candidatesFor(numpy.array([self._indices[key] for key in self._dirty], dtype = numpy.int64))
+        else:
+            return
+
+        self._all_dirty = False
+        self._dirty.clear()
+        self._narrowPhase(first, second)
+
+    ##  Broad phase for all footprints.
+    #
+    #   The boxes are sorted on their minimum X. A box can then only overlap
+    #   with the boxes that follow it in that order until the first one that
+    #   starts beyond its maximum X.
+    #
+    #   \return Two arrays with the indices of the footprints of every candidate pair.
+    def _sweepAndPrune(self):
+        count = len(self._keys)
+        boxes = self._boxes[:count]
+        order = numpy.argsort(boxes[:, 0], kind = "mergesort")
+        sorted_minimum = boxes[order, 0]
+        ends = numpy.searchsorted(sorted_minimum, boxes[order, 2], side = "right")
+        counts = numpy.maximum(ends - numpy.arange(count) - 1, 0)
+
+        #Expand the ranges of sorted positions into pairs.
+        first = numpy.repeat(numpy.arange(count), counts)
+        second = first + 1 + numpy.arange(len(first)) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        first = order[first]
+        second = order[second]
+
+        overlap = (boxes[first, 1] <= boxes[second, 3]) & (boxes[second, 1] <= boxes[first, 3])
+        return first[overlap], second[overlap]
+
+    ##  Broad phase for a few footprints against all others.
+    #
+    #   \param indices The indices of the footprints that changed.
+    #   \return Two arrays with the indices of the footprints of every candidate pair.
+    def _candidatesFor(self, indices):
+        count = len(self._keys)
+        boxes = self._boxes[:count]
+        changed = boxes[indices]
+        overlap = (changed[:, numpy.newaxis, 0] <= boxes[numpy.newaxis, :, 2]) & (boxes[numpy.newaxis, :, 0] <= changed[:, numpy.newaxis, 2])
+        overlap &= (changed[:, numpy.newaxis, 1] <= boxes[numpy.newaxis, :, 3]) & (boxes[numpy.newaxis, :, 1] <= changed[:, numpy.newaxis, 3])
+        overlap[numpy.arange(len(indices)), indices] = False
+
+        rows, second = numpy.nonzero(overlap)
+        first = indices[rows]
+
+        #Pairs of two changed footprints are found twice. Keep only one of them.
+        is_changed = numpy.zeros(count, dtype = numpy.bool_)
+        is_changed[indices] = True
+        keep = ~is_changed[second] | (first < second)
+        return first[keep], second[keep]
+
+    ##  Separating axis test for a list of candidate pairs.
+    #
+    #   The edge normals of both hulls of a pair are the axes to test. The pair
+    #   collides if the projections of the hulls overlap on every axis; the
+    #   penetration vector lies along the axis with the least overlap.
+    def _narrowPhase(self, first, second):
+        for start in range(0, len(first), self.PairChunk):
+            chunk_first = first[start:start + self.PairChunk]
+            chunk_second = second[start:start + self.PairChunk]
+
+            axes = numpy.concatenate((self._normals[chunk_first], self._normals[chunk_second]), axis = 1)
+            projection_first = numpy.einsum("pac,pvc->pav", axes, self._points[chunk_first])
+            projection_second = numpy.einsum("pac,pvc->pav", axes, self._points[chunk_second])
+            minimum_first = projection_first.min(axis = 2)
+            maximum_first = projection_first.max(axis = 2)
+            minimum_second = projection_second.min(axis = 2)
+            maximum_second = projection_second.max(axis = 2)
+
+            overlap = numpy.minimum(maximum_first, maximum_second) - numpy.maximum(minimum_first, minimum_second)
+            overlap[numpy.isnan(overlap)] = numpy.inf #Padding never separates anything.
+            colliding = numpy.all(overlap >= 0, axis = 1)
+
+            pairs = numpy.nonzero(colliding)[0]
+            best = numpy.argmin(overlap[pairs], axis = 1)
+            size = overlap[pairs, best]
+            sign = numpy.where(minimum_first[pairs, best] < minimum_second[pairs, best], -1.0, 1.0)
+            penetrations = axes[pairs, best] * (size * sign)[:, numpy.newaxis]
+
+            for pair, penetration in zip(pairs, penetrations):
+                key_first = self._keys[chunk_first[pair]]
+                key_second = self._keys[chunk_second[pair]]
+                self._collisions[key_first][key_second] = (float(penetration[0]), float(penetration[1]))
+                self._collisions[key_second][key_first] = (float(-penetration[0]), float(-penetration[1]))
@@ -56,6 +56,33 @@ class AxisAlignedBox:
     def __iadd__(self, other):
         raise NotImplementedError()
 
+    ##  Combine this box with a list of boxes.
+    #
+    #   This gives the same result as adding the boxes one by one, but only
+    #   creates a single new box, which matters when merging the boxes of
+    #   many scene nodes.
+    #
+    #   \param boxes \type{list} The boxes to combine this box with. Boxes that
+    #   are None or not valid are ignored, like with the + operator.
+    #   \return \type{AxisAlignedBox} A box that encloses this box and all valid boxes.
+    def combine(self, boxes):
+        left, bottom, back = self._min._x, self._min._y, self._min._z
+        right, top, front = self._max._x, self._max._y, self._max._z
+        changed = False
+        for box in boxes:
+            if box is None or not box.isValid():
+                continue
+            changed = True
+            left = min(left, box._min._x)
+            bottom = min(bottom, box._min._y)
+            back = min(back, box._min._z)
+            right = max(right, box._max._x)
+            top = max(top, box._max._y)
+            front = max(front, box._max._z)
+        if not changed:
+            return self
+        return AxisAlignedBox(minimum = Vector(left, bottom, back), maximum = Vector(right, top, front))
+
     @property
     def width(self):
         return self._max.x - self._min.x
@@ -108,9 +135,9 @@ class AxisAlignedBox:
     #   Uses fuzzycompare to validate.
     #   \sa Float::fuzzyCompare()
     def isValid(self):
-        return not(Float.fuzzyCompare(self._min.x, self._max.x) or
-                   Float.fuzzyCompare(self._min.y, self._max.y) or
-                   Float.fuzzyCompare(self._min.z, self._max.z))
+        return not(Float.fuzzyCompare(self._min._x, self._max._x) or
+                   Float.fuzzyCompare(self._min._y, self._max._y) or
+                   Float.fuzzyCompare(self._min._z, self._max._z))
 
     ##  Intersect the bounding box with a ray 
     #   \param ray \type{Ray}
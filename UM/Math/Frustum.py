@@ -0,0 +1,76 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import numpy
+
+from UM.Math.Plane import Plane
+from UM.Math.Vector import Vector
+
+
+##  The volume that can be seen by a camera, bounded by six planes.
+#
+#   The planes are stored as rows of (a, b, c, d), where a point (x, y, z) is
+#   on the inside of a plane when ax + by + cz + d >= 0.
+class Frustum:
+    ##  Create a frustum from its planes.
+    #
+    #   \param planes A 6x4 array-like with the planes, in the order left,
+    #   right, bottom, top, near and far.
+    def __init__(self, planes):
+        planes = numpy.array(planes, dtype = numpy.float64).reshape(6, 4)
+        lengths = numpy.linalg.norm(planes[:, :3], axis = 1)
+        lengths[lengths == 0] = 1
+        self._planes = planes / lengths[:, numpy.newaxis]
+
+    ##  Create the frustum of a view-projection matrix.
+    #
+    #   Everything inside the frustum is projected inside the clip volume of
+    #   the matrix. The planes are extracted from the rows of the matrix.
+    #
+    #   \param matrix \type{Matrix} The projection matrix multiplied with the view matrix.
+    @staticmethod
+    def fromMatrix(matrix):
+        m = numpy.array(matrix._data, dtype = numpy.float64)
+        return Frustum([
+            m[3] + m[0], # Left
+            m[3] - m[0], # Right
+            m[3] + m[1], # Bottom
+            m[3] - m[1], # Top
+            m[3] + m[2], # Near
+            m[3] - m[2]  # Far
+        ])
+
+    ##  Get the planes of the frustum, with their normals pointing inwards.
+    #
+    #   \return \type{list} of six Plane objects.
+    def getPlanes(self):
+        return [Plane(Vector(data = plane), -plane[3]) for plane in self._planes]
+
+    ##  Check which of a list of boxes are at least partly inside the frustum.
+    #
+    #   All boxes are tested at once. A box is outside when its corner that is
+    #   furthest along the normal of a plane is still outside that plane. Boxes
+    #   that cross the corners of the frustum may be reported as inside, which
+    #   is fine for culling.
+    #
+    #   \param minimums An Nx3 array with the minimum corner of every box.
+    #   \param maximums An Nx3 array with the maximum corner of every box.
+    #   \return A numpy array of N booleans, True for boxes that are not outside the frustum.
+    def intersectsBoxes(self, minimums, maximums):
+        minimums = numpy.asarray(minimums, dtype = numpy.float64).reshape(-1, 3)
+        maximums = numpy.asarray(maximums, dtype = numpy.float64).reshape(-1, 3)
+        normals = self._planes[:, :3]
+
+        # The corner of every box that is furthest inside every plane, as an Nx6x3 array.
+        corners = numpy.where(normals >= 0, maximums[:, numpy.newaxis, :], minimums[:, numpy.newaxis, :])
+        distances = numpy.einsum("npk,pk->np", corners, normals) + self._planes[:, 3]
+        return numpy.all(distances >= 0, axis = 1)
+
+    ##  Check whether a box is at least partly inside the frustum.
+    #
+    #   \param box \type{AxisAlignedBox} The box to check.
+    def intersectsBox(self, box):
+        return bool(self.intersectsBoxes(box.minimum.getData(), box.maximum.getData())[0])
+
+    def __repr__(self):
+        return "Frustum( {0} )".format(self._planes)
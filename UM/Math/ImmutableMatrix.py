@@ -0,0 +1,98 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+from UM.Math.Matrix import Matrix
+
+
+##  A Matrix that can not be modified.
+#
+#   Objects like SceneNode return their transformations as ImmutableMatrix,
+#   so they can hand out their own matrices instead of a copy for every call.
+#   All methods that do not modify the matrix work as usual, and return
+#   regular Matrix objects. Methods that would modify the matrix raise a
+#   TypeError. Use copy() to get a Matrix that can be modified.
+class ImmutableMatrix(Matrix):
+    def __init__(self, data = None):
+        super().__init__(data)
+        self._data.flags.writeable = False
+
+    ##  Get an ImmutableMatrix with the same data as a matrix.
+    #
+    #   \param matrix \type{Matrix} The matrix to get the data from.
+    #   \return The matrix itself if it is already immutable, or an immutable copy otherwise.
+    @staticmethod
+    def fromMatrix(matrix):
+        if isinstance(matrix, ImmutableMatrix):
+            return matrix
+        return ImmutableMatrix(matrix._data)
+
+    ##  Immutable objects can be shared, so a copy is the object itself.
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def multiply(self, matrix, copy = False):
+        if not copy:
+            self._raiseImmutable()
+        return super().multiply(matrix, copy = True)
+
+    def preMultiply(self, matrix, copy = False):
+        if not copy:
+            self._raiseImmutable()
+        return super().preMultiply(matrix, copy = True)
+
+    def setRow(self, index, value):
+        self._raiseImmutable()
+
+    def setColumn(self, index, value):
+        self._raiseImmutable()
+
+    def setToIdentity(self):
+        self._raiseImmutable()
+
+    def invert(self):
+        self._raiseImmutable()
+
+    def translate(self, direction):
+        self._raiseImmutable()
+
+    def setByTranslation(self, direction):
+        self._raiseImmutable()
+
+    def setTranslation(self, translation):
+        self._raiseImmutable()
+
+    def rotateByAxis(self, angle, direction, point = None):
+        self._raiseImmutable()
+
+    def setByRotationAxis(self, angle, direction, point = None):
+        self._raiseImmutable()
+
+    def compose(self, scale = None, shear = None, angles = None, translate = None, perspective = None, mirror = None):
+        self._raiseImmutable()
+
+    def setByEuler(self, ai, aj, ak, axes = "sxyz"):
+        self._raiseImmutable()
+
+    def scaleByFactor(self, factor, origin = None, direction = None):
+        self._raiseImmutable()
+
+    def setByScaleFactor(self, factor, origin = None, direction = None):
+        self._raiseImmutable()
+
+    def setByScaleVector(self, scale):
+        self._raiseImmutable()
+
+    def setOrtho(self, left, right, bottom, top, near, far):
+        self._raiseImmutable()
+
+    def setPerspective(self, fovy, aspect, near, far):
+        self._raiseImmutable()
+
+    def __repr__(self):
+        return "ImmutableMatrix( {0} )".format(self._data)
+
+    def _raiseImmutable(self):
+        raise TypeError("An ImmutableMatrix can not be modified. Use copy() to get a Matrix that can be modified.")
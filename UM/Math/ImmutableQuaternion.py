@@ -0,0 +1,61 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+from UM.Math.Quaternion import Quaternion
+
+
+##  A Quaternion that can not be modified.
+#
+#   Objects like SceneNode return their orientations as ImmutableQuaternion,
+#   so they can hand out their own quaternions instead of a copy for every
+#   call. Arithmetic returns regular Quaternion objects, and the in-place
+#   operators (*=, += and /=) produce a new Quaternion instead of modifying
+#   this one, like they do for tuples. Methods that would modify the
+#   quaternion raise a TypeError. Use copy() to get a Quaternion that can be
+#   modified.
+class ImmutableQuaternion(Quaternion):
+    def __init__(self, x = 0.0, y = 0.0, z = 0.0, w = 1.0):
+        super().__init__(x, y, z, w)
+        self._data.flags.writeable = False
+
+    ##  Get an ImmutableQuaternion with the same data as a quaternion.
+    #
+    #   \param quaternion \type{Quaternion} The quaternion to get the data from.
+    #   \return The quaternion itself if it is already immutable, or an immutable copy otherwise.
+    @staticmethod
+    def fromQuaternion(quaternion):
+        if isinstance(quaternion, ImmutableQuaternion):
+            return quaternion
+        data = quaternion.getData()
+        return ImmutableQuaternion(data[0], data[1], data[2], data[3])
+
+    ##  Immutable objects can be shared, so a copy is the object itself.
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __imul__(self, other):
+        return self * other
+
+    def __iadd__(self, other):
+        return self + other
+
+    def __itruediv__(self, other):
+        return self / other
+
+    def setByAngleAxis(self, angle, axis):
+        self._raiseImmutable()
+
+    def invert(self):
+        self._raiseImmutable()
+
+    def normalize(self):
+        self._raiseImmutable()
+
+    def setByMatrix(self, matrix, is_precise = False):
+        self._raiseImmutable()
+
+    def _raiseImmutable(self):
+        raise TypeError("An ImmutableQuaternion can not be modified. Use copy() to get a Quaternion that can be modified.")
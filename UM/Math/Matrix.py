@@ -51,10 +51,45 @@ class Matrix(object):
         else:
             self._data = numpy.array(data, copy=True, dtype = numpy.float64)
 
+        # Results that are derived from the data are cached until the matrix is modified.
+        # Every modification increases the version, which invalidates the cached results.
+        self._version = 0
+        self._float32_data = None
+        self._float32_data_version = -1
+        self._decomposition = None
+        self._decomposition_version = -1
+
+    ##  Create a matrix that takes ownership of a numpy array, without copying it.
+    #
+    #   Only to be used with arrays that are not referenced anywhere else.
+    @classmethod
+    def _fromOwnedData(cls, data):
+        matrix = cls.__new__(cls)
+        matrix._data = data
+        matrix._version = 0
+        matrix._float32_data = None
+        matrix._float32_data_version = -1
+        matrix._decomposition = None
+        matrix._decomposition_version = -1
+        return matrix
+
+    ##  Get the version of the data of this matrix.
+    #
+    #   The version changes every time the matrix is modified, so it can be used
+    #   to find out whether results computed from this matrix are still valid.
+    def getVersion(self):
+        return self._version
+
+    ##  Mark the data of this matrix as modified, invalidating all cached results.
+    #
+    #   Every method that modifies the data must call this.
+    def _dataChanged(self):
+        self._version += 1
+
     def __eq__(self, other):
         if self is other:
             return True
-        if type(other) is not Matrix:
+        if not isinstance(other, Matrix):
             return False
 
         if self._data is None and other._data is None:
@@ -78,6 +113,7 @@ class Matrix(object):
             self._data[3, index] = value[3]
         else:
             self._data[3, index] = 0
+        self._dataChanged()
 
     def setColumn(self, index, value):
         if index < 0 or index > 3:
@@ -91,44 +127,57 @@ class Matrix(object):
             self._data[index, 3] = value[3]
         else:
             self._data[index, 3] = 0
+        self._dataChanged()
 
     def multiply(self, matrix, copy = False):
         if not copy:
             self._data = numpy.dot(self._data, matrix.getData())
+            self._dataChanged()
             return self
         else:
-            new_matrix = Matrix(data = self._data)
-            new_matrix.multiply(matrix)
-            return new_matrix
+            return Matrix._fromOwnedData(numpy.dot(self._data, matrix.getData())) # The product is a new array already, so don't copy it again.
 
     def preMultiply(self, matrix, copy = False):
         if not copy:
             self._data = numpy.dot(matrix.getData(), self._data)
+            self._dataChanged()
             return self
         else:
-            new_matrix = Matrix(data = self._data)
-            new_matrix.preMultiply(matrix)
-            return new_matrix
-
+            return Matrix._fromOwnedData(numpy.dot(matrix.getData(), self._data))
 
     ##  Get raw data.
+    #
+    #   The result is cached until the matrix is modified, so it is read-only.
+    #   Copy it if you need to modify it.
     #   \returns 4x4 numpy array
     def getData(self):
-        return self._data.astype(numpy.float32)
+        if self._float32_data_version != self._version:
+            self._float32_data = self._data.astype(numpy.float32)
+            self._float32_data.flags.writeable = False
+            self._float32_data_version = self._version
+        return self._float32_data
+
+    ##  Return a copy of this matrix that can be modified.
+    #
+    #   This is the way to get a modifiable matrix from an ImmutableMatrix.
+    def copy(self):
+        return Matrix(self._data)
 
     ##  Create a 4x4 identity matrix. This overwrites any existing data.
     def setToIdentity(self):
         self._data = numpy.identity(4, dtype = numpy.float64)
+        self._dataChanged()
 
     ##  Invert the matrix
     def invert(self):
         self._data = numpy.linalg.inv(self._data)
+        self._dataChanged()
 
     ##  Return a inverted copy of the matrix.
     #   \returns The invertex matrix.
     def getInverse(self):
         try:
-            return Matrix(numpy.linalg.inv(self._data))
+            return Matrix._fromOwnedData(numpy.linalg.inv(self._data))
         except:
             return deepcopy(self)
 
@@ -152,9 +201,11 @@ class Matrix(object):
         M = numpy.identity(4,dtype = numpy.float64)
         M[:3, 3] = direction.getData()[:3]
         self._data = M
+        self._dataChanged()
 
     def setTranslation(self, translation):
         self._data[:3, 3] = translation.getData()
+        self._dataChanged()
 
     def getTranslation(self):
         return Vector(data = self._data[:3, 3])
@@ -190,6 +241,7 @@ class Matrix(object):
             point = numpy.array(point[:3], dtype = numpy.float64, copy=False)
             M[:3, 3] = point - numpy.dot(R, point)
         self._data = M
+        self._dataChanged()
 
     ##  Return transformation matrix from sequence of transformations.
     #   This is the inverse of the decompose_matrix function.
@@ -233,6 +285,7 @@ class Matrix(object):
             M = numpy.dot(M, mir)
         M /= M[3, 3]
         self._data = M
+        self._dataChanged()
 
     ## Return Euler angles from rotation matrix for specified axis sequence.
     #  axes : One of 24 axis sequences as string or encoded tuple
@@ -323,6 +376,7 @@ class Matrix(object):
             M[k, j] = cj * si
             M[k, k] = cj * ci
         self._data = M
+        self._dataChanged()
 
     ##  Scale the matrix by factor wrt origin & direction.
     #   \param factor The factor by which to scale
@@ -353,9 +407,11 @@ class Matrix(object):
             if origin is not None:
                 M[:3, 3] = (factor * numpy.dot(origin[:3], direction_data)) * direction_data
         self._data = M
+        self._dataChanged()
 
     def setByScaleVector(self, scale):
         self._data = numpy.diag([scale.x, scale.y, scale.z, 1.0])
+        self._dataChanged()
 
     def getScale(self):
         x = numpy.linalg.norm(self._data[0,0:3])
@@ -379,6 +435,7 @@ class Matrix(object):
         self._data[3, 0] = -((right + left) / (right - left))
         self._data[3, 1] = -((top + bottom) / (top - bottom))
         self._data[3, 2] = -((far + near) / (far - near))
+        self._dataChanged()
 
     ##  Set the matrix to a perspective projection. This overwrites any existing data.
     #   \param fovy Field of view in the Y direction
@@ -395,11 +452,20 @@ class Matrix(object):
         self._data[2, 2] = (far + near) / (near - far)
         self._data[2, 3] = -1.
         self._data[3, 2] = (2. * far * near) / (near - far)
+        self._dataChanged()
 
     ##  Return sequence of transformations from transformation matrix.
+    #
+    #   The result is cached until the matrix is modified.
     #   @return Tuple containing scale (vector), shear (vector), angles (vector) and translation (vector)
     #   It will raise a ValueError if matrix is of wrong type or degenerative.
     def decompose(self):
+        if self._decomposition_version != self._version:
+            self._decomposition = self._decompose()
+            self._decomposition_version = self._version
+        return self._decomposition
+
+    def _decompose(self):
         M = numpy.array(self._data, dtype = numpy.float64, copy = True).T
         if abs(M[3, 3]) < self._EPS:
             raise ValueError("M[3, 3] is zero")
@@ -0,0 +1,228 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import numpy
+
+from UM.Math.Matrix import Matrix
+from UM.Math.VectorArray import VectorArray
+
+
+##  A list of 4x4 homogeneous matrices, stored in one contiguous numpy array.
+#
+#   This is the batch counterpart of Matrix. Every operation works on all
+#   matrices at once, so scene-wide operations on many nodes take a single
+#   numpy call instead of one call per node.
+#
+#   Operations that take another MatrixArray work element-wise. Where a single
+#   Matrix is accepted instead, it is applied to every matrix in the array.
+class MatrixArray(object):
+    ##  Create a new array of matrices.
+    #
+    #   \param data An Nx4x4 array-like with the matrices. If None, the array is empty.
+    def __init__(self, data = None):
+        if data is None:
+            self._data = numpy.zeros((0, 4, 4), dtype = numpy.float64)
+        else:
+            self._data = numpy.array(data, dtype = numpy.float64).reshape(-1, 4, 4)
+
+    ##  Create an array of identity matrices.
+    #
+    #   \param count \type{int} The number of matrices.
+    @staticmethod
+    def identity(count):
+        return MatrixArray(numpy.tile(numpy.identity(4, dtype = numpy.float64), (count, 1, 1)))
+
+    ##  Create an array from a list of Matrix objects.
+    #
+    #   \param matrices \type{list} The matrices to put in the array.
+    @staticmethod
+    def fromMatrices(matrices):
+        if not matrices:
+            return MatrixArray()
+        return MatrixArray(numpy.array([matrix._data for matrix in matrices]))
+
+    ##  Convert this array to a list of Matrix objects.
+    def toMatrices(self):
+        return [Matrix(data) for data in self._data]
+
+    ##  Get raw data.
+    #   \returns Nx4x4 numpy array, in the same precision as Matrix.getData.
+    def getData(self):
+        return self._data.astype(numpy.float32)
+
+    def __len__(self):
+        return len(self._data)
+
+    ##  Get one matrix as Matrix, or a slice of the array as MatrixArray.
+    def __getitem__(self, index):
+        if isinstance(index, (int, numpy.integer)):
+            return Matrix(self._data[index])
+        return MatrixArray(self._data[index])
+
+    def __iter__(self):
+        for data in self._data:
+            yield Matrix(data)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is not MatrixArray:
+            return False
+        return numpy.array_equal(self._data, other._data)
+
+    ##  Post-multiply every matrix, like Matrix.multiply.
+    #
+    #   \param matrix \type{Matrix} to multiply every matrix with, or a
+    #   \type{MatrixArray} with one matrix per matrix in this array.
+    #   \param copy If True, return a new array instead of modifying this one.
+    def multiply(self, matrix, copy = False):
+        data = numpy.matmul(self._data, matrix._data)
+        if copy:
+            return MatrixArray(data)
+        self._data = data
+        return self
+
+    ##  Pre-multiply every matrix, like Matrix.preMultiply.
+    #
+    #   \param matrix \type{Matrix} to multiply every matrix with, or a
+    #   \type{MatrixArray} with one matrix per matrix in this array.
+    #   \param copy If True, return a new array instead of modifying this one.
+    def preMultiply(self, matrix, copy = False):
+        data = numpy.matmul(matrix._data, self._data)
+        if copy:
+            return MatrixArray(data)
+        self._data = data
+        return self
+
+    ##  Invert all matrices.
+    def invert(self):
+        self._data = self._invertData()
+
+    ##  Return an array with the inverse of every matrix.
+    #
+    #   Like Matrix.getInverse, singular matrices are returned as they are.
+    def getInverse(self):
+        return MatrixArray(self._invertData())
+
+    ##  Return an array with the transpose of every matrix.
+    def getTransposed(self):
+        return MatrixArray(numpy.transpose(self._data, (0, 2, 1)))
+
+    ##  Return the translation of every matrix.
+    def getTranslation(self):
+        return VectorArray(self._data[:, :3, 3])
+
+    ##  Return the scale of every matrix, like Matrix.getScale.
+    def getScale(self):
+        return VectorArray(numpy.linalg.norm(self._data[:, :3, :3], axis = 2))
+
+    ##  Return sequence of transformations from every transformation matrix.
+    #
+    #   This does the same as Matrix.decompose for all matrices at once.
+    #
+    #   \return Tuple of VectorArrays with the scale, shear, angles,
+    #   translation and mirror of every matrix.
+    #   It will raise a ValueError if any matrix is of wrong type or degenerative.
+    def decompose(self):
+        M = numpy.transpose(self._data, (0, 2, 1)).copy()
+        w = M[:, 3, 3]
+        if numpy.any(numpy.abs(w) < Matrix._EPS):
+            raise ValueError("M[3, 3] is zero")
+        M /= w[:, numpy.newaxis, numpy.newaxis]
+        P = M.copy()
+        P[:, :, 3] = (0.0, 0.0, 0.0, 1.0)
+        if not numpy.all(numpy.linalg.det(P)):
+            raise ValueError("matrix is singular")
+
+        count = len(M)
+        scale = numpy.zeros((count, 3))
+        shear = numpy.zeros((count, 3))
+        angles = numpy.zeros((count, 3))
+
+        translate = M[:, 3, :3].copy()
+
+        #Gram-Schmidt orthogonalisation of the rows, for all matrices at once.
+        row = M[:, :3, :3].copy()
+        scale[:, 0] = numpy.linalg.norm(row[:, 0], axis = 1)
+        row[:, 0] /= scale[:, 0, numpy.newaxis]
+        shear[:, 0] = numpy.einsum("ij,ij->i", row[:, 0], row[:, 1])
+        row[:, 1] -= row[:, 0] * shear[:, 0, numpy.newaxis]
+        scale[:, 1] = numpy.linalg.norm(row[:, 1], axis = 1)
+        row[:, 1] /= scale[:, 1, numpy.newaxis]
+        shear[:, 0] /= scale[:, 1]
+        shear[:, 1] = numpy.einsum("ij,ij->i", row[:, 0], row[:, 2])
+        row[:, 2] -= row[:, 0] * shear[:, 1, numpy.newaxis]
+        shear[:, 2] = numpy.einsum("ij,ij->i", row[:, 1], row[:, 2])
+        row[:, 2] -= row[:, 1] * shear[:, 2, numpy.newaxis]
+        scale[:, 2] = numpy.linalg.norm(row[:, 2], axis = 1)
+        row[:, 2] /= scale[:, 2, numpy.newaxis]
+        shear[:, 1:] /= scale[:, 2, numpy.newaxis]
+
+        flipped = numpy.einsum("ij,ij->i", row[:, 0], numpy.cross(row[:, 1], row[:, 2])) < 0
+        scale[flipped] *= -1
+        row[flipped] *= -1
+
+        # If the scale was negative, we give back a seperate mirror vector to indicate this.
+        mirror = numpy.where(numpy.diagonal(M[:, :3, :3], axis1 = 1, axis2 = 2) < 0, -1.0, 1.0)
+
+        angles[:, 1] = numpy.arcsin(numpy.clip(-row[:, 0, 2], -1.0, 1.0))
+        regular = numpy.cos(angles[:, 1]) != 0
+        angles[:, 0] = numpy.where(regular, numpy.arctan2(row[:, 1, 2], row[:, 2, 2]), numpy.arctan2(-row[:, 2, 1], row[:, 1, 1]))
+        angles[:, 2] = numpy.where(regular, numpy.arctan2(row[:, 0, 1], row[:, 0, 0]), 0.0)
+
+        return VectorArray(scale), VectorArray(shear), VectorArray(angles), VectorArray(translate), VectorArray(mirror)
+
+    def __repr__(self):
+        return "MatrixArray( {0} )".format(self._data)
+
+    ##  Create the transformation matrices of many objects at once.
+    #
+    #   This does the same as Matrix.fromPositionOrientationScale for every
+    #   element of the arrays.
+    #
+    #   \param positions \type{VectorArray} The position of every object.
+    #   \param orientations The orientation of every object, as a list of
+    #   \type{Quaternion} or as an Nx4 array of XYZW components.
+    #   \param scales \type{VectorArray} The scale of every object.
+    @staticmethod
+    def fromPositionOrientationScale(positions, orientations, scales):
+        if isinstance(orientations, numpy.ndarray):
+            quaternions = orientations.astype(numpy.float64).reshape(-1, 4)
+        else:
+            quaternions = numpy.array([orientation.getData() for orientation in orientations], dtype = numpy.float64).reshape(-1, 4)
+        x, y, z, w = quaternions[:, 0], quaternions[:, 1], quaternions[:, 2], quaternions[:, 3]
+
+        s = 2.0 / numpy.einsum("ij,ij->i", quaternions, quaternions)
+        xs, ys, zs = s * x, s * y, s * z
+        wx, wy, wz = w * xs, w * ys, w * zs
+        xx, xy, xz = x * xs, x * ys, x * zs
+        yy, yz, zz = y * ys, y * zs, z * zs
+
+        data = numpy.zeros((len(quaternions), 4, 4), dtype = numpy.float64)
+        data[:, 0, 0] = 1.0 - (yy + zz)
+        data[:, 0, 1] = xy - wz
+        data[:, 0, 2] = xz + wy
+        data[:, 1, 0] = xy + wz
+        data[:, 1, 1] = 1.0 - (xx + zz)
+        data[:, 1, 2] = yz - wx
+        data[:, 2, 0] = xz - wy
+        data[:, 2, 1] = yz + wx
+        data[:, 2, 2] = 1.0 - (xx + yy)
+        data[:, 3, 3] = 1.0
+
+        data[:, :3, :3] *= scales._data[:, numpy.newaxis, :] #Rotation times scale scales the columns.
+        data[:, :3, 3] = positions._data
+        return MatrixArray(data)
+
+    ##  Invert all matrices, leaving singular matrices as they are.
+    def _invertData(self):
+        try:
+            return numpy.linalg.inv(self._data)
+        except numpy.linalg.LinAlgError: #At least one is singular. Invert the others one by one.
+            result = self._data.copy()
+            for index, data in enumerate(self._data):
+                try:
+                    result[index] = numpy.linalg.inv(data)
+                except numpy.linalg.LinAlgError:
+                    pass
+            return result
@@ -2,7 +2,6 @@
 # Uranium is released under the terms of the AGPLv3 or higher.
 
 import numpy
-import time
 
 from UM.Math.Float import Float #For fuzzy comparison of edge cases.
 from UM.Math.LineSegment import LineSegment #For line-line intersections for computing polygon intersections.
@@ -76,15 +75,8 @@ class Polygon:
     #   \return A tuple describing the line segment of this Polygon projected on to the infinite line described by normal.
     #           The first element is the minimum value, the second the maximum.
     def project(self, normal):
-        projection_min = numpy.dot(normal, self._points[0])
-
-        projection_max = projection_min
-        for point in self._points:
-            projection = numpy.dot(normal, point)
-            projection_min = min(projection_min, projection)
-            projection_max = max(projection_max, projection)
-
-        return (projection_min, projection_max)
+        projections = numpy.dot(self._points, normal) #All points at once.
+        return (projections.min(), projections.max())
 
     ##  Moves the polygon by a fixed offset.
     #
@@ -358,13 +350,8 @@ class Polygon:
     #   \param other The polygon to perform a Minkowski sum with.
     #   \return \type{Polygon} The Minkowski sum of this polygon with other.
     def getMinkowskiSum(self, other):
-        points = numpy.zeros((len(self._points) * len(other._points), 2))
-        for n in range(0, len(self._points)):
-            for m in range(0, len(other._points)):
-                points[n * len(other._points) + m] = self._points[n] + other._points[m]
-
-                time.sleep(0.00001)
-
+        #Add every point of other to every point of this polygon in one go, in the same order as a nested loop would.
+        points = numpy.add(self._points[:, numpy.newaxis, :], other._points[numpy.newaxis, :, :]).reshape(-1, 2)
         return Polygon(points)
 
     ##  Create a Minkowski hull from this polygon and another polygon.
@@ -28,6 +28,14 @@ class Quaternion(object):
     def getData(self):
         return self._data
 
+    ##  Return a copy of this quaternion that can be modified.
+    #
+    #   This is the way to get a modifiable quaternion from an ImmutableQuaternion.
+    def copy(self):
+        result = Quaternion()
+        result._data = self._data.copy()
+        return result
+
     @property
     def x(self):
         return self._data[0]
@@ -56,12 +64,12 @@ class Quaternion(object):
         self.normalize()
 
     def __mul__(self, other):
-        result = copy.deepcopy(self)
+        result = self.copy()
         result *= other
         return result
 
     def __imul__(self, other):
-        if type(other) is Quaternion:
+        if isinstance(other, Quaternion):
             v1 = Vector(other.x, other.y, other.z)
             v2 = Vector(self.x, self.y, self.z)
 
@@ -80,12 +88,12 @@ class Quaternion(object):
         return self
 
     def __add__(self, other):
-        result = copy.deepcopy(self)
+        result = self.copy()
         result += other
         return result
 
     def __iadd__(self, other):
-        if type(other) is Quaternion:
+        if isinstance(other, Quaternion):
             self._data[0] += other._data[0]
             self._data[1] += other._data[1]
             self._data[2] += other._data[2]
@@ -96,7 +104,7 @@ class Quaternion(object):
         return self
 
     def __truediv__(self, other):
-        result = copy.deepcopy(self)
+        result = self.copy()
         result /= other
         return result
 
@@ -112,12 +120,12 @@ class Quaternion(object):
         return Float.fuzzyCompare(self.x, other.x, 1e-6) and Float.fuzzyCompare(self.y, other.y, 1e-6) and Float.fuzzyCompare(self.z, other.z, 1e-6) and Float.fuzzyCompare(self.w, other.w, 1e-6)
 
     def __neg__(self):
-        q = copy.deepcopy(self)
+        q = self.copy()
         q._data = -q._data
         return q
 
     def getInverse(self):
-        result = copy.deepcopy(self)
+        result = self.copy()
         result.invert()
         return result
 
@@ -10,10 +10,17 @@ from UM.Math.Float import Float
 numpy.seterr(divide="ignore")
 
 
-##  Simple 3D-vector class based on numpy arrays.
+##  Simple 3D-vector class.
 #
 #   This class represents an immutable 3-dimensional vector.
+#
+#   The components are stored as three plain floats, since vectors are
+#   created and combined very often and numpy has a large overhead for arrays
+#   of just three elements. Use getData() to get a numpy array, or VectorArray
+#   to do math on many vectors at once.
 class Vector(object):
+    __slots__ = ("_x", "_y", "_z")
+
     Unit_X = None
     Unit_Y = None
     Unit_Z = None
@@ -22,53 +29,57 @@ class Vector(object):
     #   \param x X coordinate of vector.
     #   \param y Y coordinate of vector.
     #   \param z Z coordinate of vector.
+    #   \param data Sequence of at least three coordinates, used if x, y and z are not all given.
     def __init__(self, x=None, y=None, z=None, data=None):
         if x is not None and y is not None and z is not None:
-            self._data = numpy.array([x, y, z], dtype = numpy.float64)
+            self._x = float(x)
+            self._y = float(y)
+            self._z = float(z)
         elif data is not None:
-            self._data = data.copy()
+            self._x = float(data[0])
+            self._y = float(data[1])
+            self._z = float(data[2])
         else:
-            self._data = numpy.zeros(3, dtype = numpy.float64)
+            self._x = 0.0
+            self._y = 0.0
+            self._z = 0.0
 
     ##  Get numpy array with the data
-    #   \returns numpy array of length 3 holding xyz data.
+    #   \returns A new numpy array of length 3 holding xyz data.
     def getData(self):
-        return self._data.astype(numpy.float64)
+        return numpy.array((self._x, self._y, self._z), dtype = numpy.float64)
 
     ##  Return the x component of this vector
     @property
     def x(self):
-        return numpy.float64(self._data[0])
+        return numpy.float64(self._x)
 
     ##  Return the y component of this vector
     @property
     def y(self):
-        return numpy.float64(self._data[1])
+        return numpy.float64(self._y)
 
     ## Return the z component of this vector
     @property
     def z(self):
-        return numpy.float64(self._data[2])
+        return numpy.float64(self._z)
 
     def set(self, x=None, y=None, z=None):
-        new_x = self._data[0] if x is None else x
-        new_y = self._data[1] if y is None else y
-        new_z = self._data[2] if z is None else z
+        new_x = self._x if x is None else x
+        new_y = self._y if y is None else y
+        new_z = self._z if z is None else z
         return Vector(new_x, new_y, new_z)
 
     ##  Get the angle from this vector to another
     def angleToVector(self, vector):
-        v0 = numpy.array(self._data, dtype = numpy.float64, copy=False)
-        v1 = numpy.array(vector.getData(), dtype = numpy.float64, copy=False)
-        dot = numpy.sum(v0 * v1)
-        dot /= self._normalizeVector(v0) * self._normalizeVector(v1)
+        dot = self._x * vector._x + self._y * vector._y + self._z * vector._z
+        dot /= numpy.float64(self._length() * vector._length())
         return numpy.arccos(numpy.fabs(dot))
-    
+
     def normalized(self):
-        l = self.length()
-        if l !=0:
-            new_data = self._data / l
-            return Vector(data=new_data)
+        l = self._length()
+        if l != 0:
+            return Vector(self._x / l, self._y / l, self._z / l)
         else:
             return self
 
@@ -82,43 +93,35 @@ class Vector(object):
         numpy.sqrt(out, out)
         return out
 
+    def _length(self):
+        return math.sqrt(self._x * self._x + self._y * self._y + self._z * self._z)
+
     def length(self):
-        return numpy.linalg.norm(self._data)
+        return numpy.float64(self._length())
 
     def dot(self, other):
-        return numpy.dot(self._data, other._data)
+        return numpy.float64(self._x * other._x + self._y * other._y + self._z * other._z)
 
     def cross(self, other):
-        result = numpy.cross(self._data, other._data)
-        return Vector(result[0], result[1], result[2])
+        return Vector(self._y * other._z - self._z * other._y,
+                      self._z * other._x - self._x * other._z,
+                      self._x * other._y - self._y * other._x)
 
     def multiply(self, matrix):
-        d = numpy.empty(4, dtype=numpy.float64)
-        d[0] = self._data[0]
-        d[1] = self._data[1]
-        d[2] = self._data[2]
-        d[3] = 1.0
-
-        d = d.dot(matrix.getData())
-
+        m = matrix.getData()
+        d = numpy.array((self._x, self._y, self._z, 1.0), dtype = numpy.float64).dot(m)
         return Vector(d[0], d[1], d[2])
 
     def preMultiply(self, matrix):
-        d = numpy.empty(4, dtype = numpy.float64)
-        d[0] = self._data[0]
-        d[1] = self._data[1]
-        d[2] = self._data[2]
-        d[3] = 1.0
-
-        d = matrix.getData().dot(d)
-
+        m = matrix.getData()
+        d = m.dot(numpy.array((self._x, self._y, self._z, 1.0), dtype = numpy.float64))
         return Vector(d[0], d[1], d[2])
 
     ##  Scale a vector by another vector.
     #
     #   This will do a component-wise multiply of the two vectors.
     def scale(self, other):
-        return Vector(self.x * other.x, self.y * other.y, self.z * other.z)
+        return Vector(self._x * other._x, self._y * other._y, self._z * other._z)
 
     def __eq__(self, other):
         if self is other:
@@ -132,36 +135,46 @@ class Vector(object):
     #   \param epsilon optional tolerance value for the comparision.
     #   \returns True if the two vectors are the same.
     def equals(self, other, epsilon=1e-6):
-        return Float.fuzzyCompare(self.x, other.x, epsilon) and \
-               Float.fuzzyCompare(self.y, other.y, epsilon) and \
-               Float.fuzzyCompare(self.z, other.z, epsilon)
+        return Float.fuzzyCompare(self._x, other.x, epsilon) and \
+               Float.fuzzyCompare(self._y, other.y, epsilon) and \
+               Float.fuzzyCompare(self._z, other.z, epsilon)
+
+    ##  Vectors are immutable, so copies can share the same object.
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __add__(self, other):
         if type(other) is Vector:
-            return Vector(data=self._data + other._data)
+            return Vector(self._x + other._x, self._y + other._y, self._z + other._z)
+        elif isNumber(other):
+            return Vector(self._x + other, self._y + other, self._z + other)
         else:
-            return Vector(data=self._data + other)
+            return Vector(data=self.getData() + other)
 
     def __iadd__(self, other):
         return self + other
 
     def __sub__(self, other):
         if type(other) is Vector:
-            return Vector(data=self._data - other._data)
+            return Vector(self._x - other._x, self._y - other._y, self._z - other._z)
+        elif isNumber(other):
+            return Vector(self._x - other, self._y - other, self._z - other)
         else:
-            return Vector(data=self._data - other)
+            return Vector(data=self.getData() - other)
 
     def __isub__(self, other):
         return self - other
 
     def __mul__(self, other):
         if isNumber(other):
-            new_data = self._data * other
+            return Vector(self._x * other, self._y * other, self._z * other)
         elif type(other) is Vector:
-            new_data = self._data * other._data
+            return Vector(self._x * other._x, self._y * other._y, self._z * other._z)
         else:
             raise NotImplementedError()
-        return Vector(data=new_data)
 
     def __imul__(self, other):
         return self * other
@@ -171,42 +184,40 @@ class Vector(object):
 
     def __truediv__(self, other):
         if isNumber(other):
-            new_data = self._data / other
+            return Vector(_divide(self._x, other), _divide(self._y, other), _divide(self._z, other))
         elif type(other) is Vector:
-            new_data = self._data / other._data
+            return Vector(_divide(self._x, other._x), _divide(self._y, other._y), _divide(self._z, other._z))
         else:
             raise NotImplementedError()
-        return Vector(data=new_data)
 
     def __itruediv__(self, other):
         return self / other
 
     def __rtruediv__(self, other):
         if isNumber(other):
-            new_data = other / self._data
+            return Vector(_divide(other, self._x), _divide(other, self._y), _divide(other, self._z))
         elif type(other) is Vector:
-            new_data = other._data / self._data
+            return Vector(_divide(other._x, self._x), _divide(other._y, self._y), _divide(other._z, self._z))
         else:
             raise NotImplementedError()
-        return Vector(data=new_data)
 
     def __neg__(self):
-        return Vector(data = -1 * self._data)
+        return Vector(-self._x, -self._y, -self._z)
 
     def __repr__(self):
-        return "Vector({0}, {1}, {2})".format(self._data[0], self._data[1], self._data[2])
+        return "Vector({0}, {1}, {2})".format(self._x, self._y, self._z)
 
     def __lt__(self, other):
-        return self._data[0] < other._data[0] and self._data[1] < other._data[1] and self._data[2] < other._data[2]
+        return self._x < other._x and self._y < other._y and self._z < other._z
 
     def __gt__(self, other):
-        return self._data[0] > other._data[0] and self._data[1] > other._data[1] and self._data[2] > other._data[2]
+        return self._x > other._x and self._y > other._y and self._z > other._z
 
     def __le__(self, other):
-        return self._data[0] <= other._data[0] and self._data[1] <= other._data[1] and self._data[2] <= other._data[2]
+        return self._x <= other._x and self._y <= other._y and self._z <= other._z
 
     def __ge__(self, other):
-        return self._data[0] >= other._data[0] and self._data[1] >= other._data[1] and self._data[2] >= other._data[2]
+        return self._x >= other._x and self._y >= other._y and self._z >= other._z
 
     # These fields are filled in below. This is needed to help static analysis tools (read: PyCharm)
     Null = None
@@ -214,8 +225,16 @@ class Vector(object):
     Unit_X = None
     Unit_Z = None
 
+##  Divide two floats the way numpy does, so division by zero gives infinity or NaN instead of an exception.
+def _divide(numerator, denominator):
+    try:
+        return numerator / denominator
+    except ZeroDivisionError:
+        with numpy.errstate(invalid = "ignore"):
+            return numpy.float64(numerator) / numpy.float64(denominator)
+
 def isNumber(value):
-    return type(value) in [float, int, numpy.float32, numpy.float64]
+    return type(value) in (float, int, numpy.float32, numpy.float64)
 
 Vector.Null = Vector()
 Vector.Unit_X = Vector(1, 0, 0)
@@ -0,0 +1,192 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import numpy
+
+from UM.Math.Vector import Vector
+
+
+##  An immutable list of 3D vectors, stored in one contiguous numpy array.
+#
+#   This is the batch counterpart of Vector. Every operation works on all
+#   vectors at once, so operations on many vectors take a single numpy call
+#   instead of one call (and one Vector object) per vector.
+#
+#   Operations that take another VectorArray work element-wise. Where a single
+#   Vector is accepted instead, it is applied to every vector in the array.
+class VectorArray(object):
+    ##  Create a new array of vectors.
+    #
+    #   \param data An Nx3 array-like with the vectors. If None, the array is empty.
+    def __init__(self, data = None):
+        if data is None:
+            self._data = numpy.zeros((0, 3), dtype = numpy.float64)
+        else:
+            self._data = numpy.array(data, dtype = numpy.float64).reshape(-1, 3)
+
+    ##  Create an array from a list of Vector objects.
+    #
+    #   \param vectors \type{list} The vectors to put in the array.
+    @staticmethod
+    def fromVectors(vectors):
+        if not vectors:
+            return VectorArray()
+        return VectorArray(numpy.array([(vector._x, vector._y, vector._z) for vector in vectors]))
+
+    ##  Convert this array to a list of Vector objects.
+    def toVectors(self):
+        return [Vector(data = row) for row in self._data]
+
+    ##  Get numpy array with the data
+    #   \returns A copy of the Nx3 numpy array holding the xyz data.
+    def getData(self):
+        return self._data.copy()
+
+    ##  Return the x components of all vectors.
+    @property
+    def x(self):
+        return self._data[:, 0].copy()
+
+    ##  Return the y components of all vectors.
+    @property
+    def y(self):
+        return self._data[:, 1].copy()
+
+    ##  Return the z components of all vectors.
+    @property
+    def z(self):
+        return self._data[:, 2].copy()
+
+    def __len__(self):
+        return len(self._data)
+
+    ##  Get one vector as Vector, or a slice of the array as VectorArray.
+    def __getitem__(self, index):
+        if isinstance(index, (int, numpy.integer)):
+            return Vector(data = self._data[index])
+        return VectorArray(self._data[index])
+
+    def __iter__(self):
+        for row in self._data:
+            yield Vector(data = row)
+
+    ##  Return the length of every vector.
+    #   \returns A numpy array with N lengths.
+    def length(self):
+        return numpy.sqrt(numpy.einsum("ij,ij->i", self._data, self._data))
+
+    ##  Return an array with all vectors normalized.
+    #
+    #   Vectors with length 0 are left as they are, like Vector.normalized does.
+    def normalized(self):
+        lengths = self.length()
+        lengths[lengths == 0] = 1
+        return VectorArray(self._data / lengths[:, numpy.newaxis])
+
+    ##  Dot product of every vector with another vector.
+    #
+    #   \param other \type{VectorArray} or \type{Vector}
+    #   \returns A numpy array with N dot products.
+    def dot(self, other):
+        return numpy.einsum("ij,ij->i", self._data, _vectorData(other))
+
+    ##  Cross product of every vector with another vector.
+    #
+    #   \param other \type{VectorArray} or \type{Vector}
+    def cross(self, other):
+        return VectorArray(numpy.cross(self._data, _vectorData(other)))
+
+    ##  Transform all vectors as row vectors, like Vector.multiply.
+    #
+    #   \param matrix \type{Matrix} to apply to every vector, or a
+    #   \type{MatrixArray} with one matrix per vector.
+    def multiply(self, matrix):
+        points = self._homogeneous()
+        data = matrix._data
+        if data.ndim == 2:
+            return VectorArray(points.dot(data)[:, :3])
+        return VectorArray(numpy.einsum("ni,nij->nj", points, data)[:, :3])
+
+    ##  Transform all vectors as column vectors, like Vector.preMultiply.
+    #
+    #   This is the regular way to transform points by a transformation matrix.
+    #
+    #   \param matrix \type{Matrix} to apply to every vector, or a
+    #   \type{MatrixArray} with one matrix per vector.
+    def preMultiply(self, matrix):
+        points = self._homogeneous()
+        data = matrix._data
+        if data.ndim == 2:
+            return VectorArray(points.dot(data.T)[:, :3])
+        return VectorArray(numpy.einsum("nij,nj->ni", data, points)[:, :3])
+
+    ##  Component-wise multiply of every vector with another vector.
+    def scale(self, other):
+        return VectorArray(self._data * _vectorData(other))
+
+    ##  Return the component-wise minimum of all vectors.
+    #   \returns \type{Vector} The minimum, or None if the array is empty.
+    def getMinimum(self):
+        if len(self._data) == 0:
+            return None
+        return Vector(data = self._data.min(axis = 0))
+
+    ##  Return the component-wise maximum of all vectors.
+    #   \returns \type{Vector} The maximum, or None if the array is empty.
+    def getMaximum(self):
+        if len(self._data) == 0:
+            return None
+        return Vector(data = self._data.max(axis = 0))
+
+    ## Compares this array to another array.
+    #
+    #   \param epsilon optional tolerance value for the comparision.
+    #   \returns True if the two arrays hold the same vectors.
+    def equals(self, other, epsilon = 1e-6):
+        if self._data.shape != other._data.shape:
+            return False
+        return bool(numpy.all(numpy.abs(self._data - other._data) <= epsilon))
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is not VectorArray:
+            return False
+        return self.equals(other)
+
+    def __add__(self, other):
+        return VectorArray(self._data + _vectorData(other))
+
+    def __sub__(self, other):
+        return VectorArray(self._data - _vectorData(other))
+
+    def __mul__(self, other):
+        return VectorArray(self._data * _vectorData(other))
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __truediv__(self, other):
+        return VectorArray(self._data / _vectorData(other))
+
+    def __neg__(self):
+        return VectorArray(-self._data)
+
+    def __repr__(self):
+        return "VectorArray({0})".format(self._data.tolist())
+
+    ##  Get the vectors with a fourth component of 1, for multiplication with 4x4 matrices.
+    def _homogeneous(self):
+        points = numpy.ones((len(self._data), 4), dtype = numpy.float64)
+        points[:, :3] = self._data
+        return points
+
+##  Get the data of a Vector, VectorArray or number so it can be combined with the data of a VectorArray.
+def _vectorData(value):
+    if type(value) is VectorArray:
+        return value._data
+    if type(value) is Vector:
+        return value.getData()[numpy.newaxis, :]
+    if isinstance(value, numpy.ndarray) and value.ndim == 1: #One number per vector.
+        return value[:, numpy.newaxis]
+    return value
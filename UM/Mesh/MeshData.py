@@ -8,6 +8,7 @@ from UM.Math import NumPyUtil
 
 from enum import Enum
 import threading
+import weakref
 import numpy
 import numpy.linalg
 import scipy.spatial
@@ -51,6 +52,7 @@ class MeshData:
         self._convex_hull = None    # type: scipy.spatial.qhull.ConvexHull
         self._convex_hull_vertices = None
         self._convex_hull_lock = threading.Lock()
+        self._references = weakref.WeakSet() # The scene nodes that use this mesh.
 
     ## Create a new MeshData with specified changes
     #   \return \type{MeshData}
@@ -67,6 +69,42 @@ class MeshData:
         return MeshData(vertices=vertices, normals=normals, indices=indices, colors=colors, uvs=uvs,
                         file_name=file_name, center_position=center_position)
 
+    ##  Mesh data is immutable, so copies can share the same object.
+    #
+    #   This keeps duplicated scene nodes on a single mesh, so the mesh is only
+    #   stored and uploaded to the GPU once and the copies can be drawn together.
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    ##  Register a scene node that uses this mesh.
+    #
+    #   This is done by SceneNode.setMeshData.
+    #   \param node \type{SceneNode} The node that uses this mesh.
+    def addReference(self, node):
+        self._references.add(node)
+
+    ##  Unregister a scene node that no longer uses this mesh.
+    #
+    #   \param node \type{SceneNode} The node that used this mesh.
+    def removeReference(self, node):
+        self._references.discard(node)
+
+    ##  Get the scene nodes that use this mesh.
+    #   \return \type{list} of SceneNode
+    def getReferences(self):
+        return list(self._references)
+
+    ##  Get the number of scene nodes that use this mesh.
+    def getReferenceCount(self):
+        return len(self._references)
+
+    ##  Whether this mesh is shared by more than one scene node.
+    def isShared(self):
+        return len(self._references) > 1
+
     def getHash(self):
         m = hashlib.sha256()
         m.update(self.getVerticesAsByteArray())
@@ -122,6 +160,9 @@ class MeshData:
     def hasUVCoordinates(self):
         return self._uvs is not None
 
+    def getUVCoordinates(self):
+        return self._uvs
+
     def getFileName(self):
         return self._file_name
 
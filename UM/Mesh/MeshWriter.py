@@ -4,6 +4,7 @@
 from UM.PluginObject import PluginObject
 from UM.Scene.Iterator.BreadthFirstIterator import BreadthFirstIterator
 from UM.Scene.SceneNode import SceneNode
+from UM.Scene.SceneSnapshot import SceneNodeSnapshot, SceneSnapshot
 
 ##  Base class for mesh writer objects
 class MeshWriter(PluginObject):
@@ -26,17 +27,44 @@ class MeshWriter(PluginObject):
     def write(self, stream, node):
         raise NotImplementedError("Writer plugin was not correctly implemented, no write was specified")
 
+    ##  Whether this writer can write snapshots of the nodes.
+    #
+    #   Writers that only read what a SceneNodeSnapshot records can override
+    #   this to return True. They are then passed a snapshot of the nodes, so
+    #   the scene can keep changing while they write. Other writers are passed
+    #   the nodes themselves, while the scene is locked for reading.
+    #
+    #   \return \type{bool} False by default.
+    def acceptsSnapshots(self):
+        return False
+
+    ##  Get the decorations of the nodes that this writer uses.
+    #
+    #   If the writer accepts snapshots, only the results of these decorations
+    #   are recorded. Writers that call other decorations should override this.
+    #
+    #   \return \type{tuple} Names of decorations without arguments.
+    def getSnapshotDecorations(self):
+        return SceneSnapshot.DefaultDecorations
+
     ##  Filters a collection of nodes to only include nodes that are actual
     #   meshes.
     #
     #   This does not include auxiliary nodes such as tool handles.
     #
-    #   \param nodes A sequence of nodes.
+    #   \param nodes A sequence of nodes, or of snapshots of nodes.
     #   \return The nodes among those that are actual scene nodes.
     @staticmethod
     def _meshNodes(nodes):
         for root in nodes:
             yield from filter(
-                lambda child: type(child) is SceneNode and child.getMeshData(),
+                lambda child: MeshWriter._nodeType(child) is SceneNode and child.getMeshData(),
                 BreadthFirstIterator(root)
-            )
\ No newline at end of file
+            )
+
+    ##  Get the type of a node, or of the node a snapshot was taken of.
+    @staticmethod
+    def _nodeType(node):
+        if type(node) is SceneNodeSnapshot:
+            return node.getNodeType()
+        return type(node)
\ No newline at end of file
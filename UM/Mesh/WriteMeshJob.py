@@ -1,6 +1,7 @@
 # Copyright (c) 2016 Ultimaker B.V.
 # Uranium is released under the terms of the AGPLv3 or higher.
 
+from UM.Application import Application
 from UM.Job import Job
 
 
@@ -12,14 +13,21 @@ class WriteMeshJob(Job):
     #
     #   \param writer The file writer to use, with the correct MIME type.
     #   \param stream The output stream to write to.
-    #   \param nodes A collection of nodes to write to the stream.
+    #   \param nodes A collection of nodes to write to the stream. If the writer
+    #   accepts snapshots, a snapshot of these nodes is taken, so the scene can
+    #   change while writing. Otherwise the nodes are written while the scene
+    #   is locked for reading. See MeshWriter.acceptsSnapshots().
     #   \param mode Additional information to send to the writer, such as whether to
     #   write in binary format or in ASCII format.
     def __init__(self, writer, stream, nodes, mode):
         super().__init__()
         self._stream = stream
         self._writer = writer
-        self._nodes = nodes
+        self._scene = Application.getInstance().getController().getScene()
+        if writer.acceptsSnapshots():
+            self._nodes = self._scene.createSnapshot(nodes, writer.getSnapshotDecorations()).getRoots()
+        else:
+            self._nodes = nodes
         self._file_name = ""
         self._mode = mode
 
@@ -34,5 +42,9 @@ class WriteMeshJob(Job):
 
     def run(self):
         Job.yieldThread()
-        self.setResult(self._writer.write(self._stream, self._nodes, self._mode))
+        if self._writer.acceptsSnapshots():
+            self.setResult(self._writer.write(self._stream, self._nodes, self._mode))
+        else:
+            with self._scene.getSceneLock().read(): # Operations take the write lock, so the nodes can not change while writing.
+                self.setResult(self._writer.write(self._stream, self._nodes, self._mode))
 
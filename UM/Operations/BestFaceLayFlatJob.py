@@ -0,0 +1,81 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import threading
+
+from UM.Job import Job
+from UM.Signal import Signal, signalemitter
+from UM.Operations.BestFaceLayFlatOperation import BestFaceLayFlatOperation
+from UM.Operations.GroupedOperation import GroupedOperation
+
+
+##  A Job subclass that computes a BestFaceLayFlatOperation for a single node.
+#
+#   The result of this Job is the processed BestFaceLayFlatOperation. The
+#   operation is not pushed onto the operation stack.
+class BestFaceLayFlatJob(Job):
+    def __init__(self, node):
+        super().__init__()
+        self._operation = BestFaceLayFlatOperation(node) #Created here, so the scene is only read from the calling thread.
+
+    def run(self):
+        self._operation.process()
+        self.setResult(self._operation)
+
+
+##  Orients a whole batch of nodes at once.
+#
+#   Every node is solved by its own BestFaceLayFlatJob, so the JobQueue can
+#   process them in parallel. When all jobs are done, the finished signal is
+#   emitted with a single GroupedOperation that applies all new orientations.
+#   That operation is not pushed; the receiver decides what to do with it.
+@signalemitter
+class BestFaceLayFlatBatch:
+    def __init__(self, nodes):
+        super().__init__()
+        self._nodes = list(nodes)
+        self._jobs = []
+        self._remaining = 0
+        self._lock = threading.Lock()
+        self._operation = None
+
+    ##  Start processing all nodes on the JobQueue.
+    def start(self):
+        self._jobs = [BestFaceLayFlatJob(node) for node in self._nodes]
+        self._remaining = len(self._jobs)
+        if not self._jobs:
+            self._operation = GroupedOperation()
+            self.finished.emit(self._operation)
+            return
+
+        for job in self._jobs:
+            job.finished.connect(self._onJobFinished)
+            job.start()
+
+    ##  Check whether all nodes of this batch have been processed.
+    def isFinished(self):
+        return self._operation is not None
+
+    ##  Get the combined operation of this batch.
+    #
+    #   \return \type{GroupedOperation} The operation, or None if the batch has not finished yet.
+    def getOperation(self):
+        return self._operation
+
+    ##  Emitted when all nodes have been processed.
+    #
+    #   \param operation \type{GroupedOperation} The operation that orients all nodes.
+    finished = Signal()
+
+    def _onJobFinished(self, job):
+        with self._lock:
+            self._remaining -= 1
+            if self._remaining > 0:
+                return
+
+        operation = GroupedOperation()
+        for job in self._jobs: #Keep the order of the nodes, not the order in which they finished.
+            if not job.hasError():
+                operation.addOperation(job.getResult())
+        self._operation = operation
+        self.finished.emit(operation)
@@ -0,0 +1,243 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+from . import Operation
+
+from UM.Math.Vector import Vector
+from UM.Math.Quaternion import Quaternion
+from UM.Mesh.MeshData import transformVertices
+
+import math
+import numpy
+import scipy.spatial
+
+##  Operation that lays a mesh flat on the best face of its convex hull.
+#
+#   Where LayFlatOperation only aligns the lowest vertices, this operation
+#   treats every face of the convex hull of the (transformed) mesh as a
+#   candidate bottom face. All candidates are scored in a single vectorized
+#   pass, based on the area that would touch the build plate and on how
+#   stable the object would rest on that face. The best candidate is turned
+#   into an orientation that can be applied, undone and redone.
+#
+#   The computation in process() does not modify the scene, so it is safe to
+#   run it from a Job. See BestFaceLayFlatJob.
+class BestFaceLayFlatOperation(Operation.Operation):
+    ##  Weight of the (normalised) contact area in the score of a face.
+    AreaWeight = 1.0
+
+    ##  Weight of the (normalised) height of the centre of mass above a face
+    #   in the score of a face. Lower centres of mass are more stable.
+    HeightWeight = 0.5
+
+    ##  Relative tolerance used to decide whether hull triangles are coplanar.
+    CoplanarTolerance = 1e-3
+
+    ##  Creates the operation.
+    #
+    #   An optional orientation may be added if the answer of this operation is
+    #   already known. This may occur if two operations are combined.
+    #
+    #   \param node The scene node to apply the operation on.
+    #   \param orientation A pre-calculated result orientation.
+    def __init__(self, node, orientation = None):
+        super().__init__()
+        self._node = node #Node the operation is applied on.
+
+        self._old_orientation = node.getOrientation() #Orientation before laying it flat.
+        parent = node.getParent()
+        self._parent_orientation = parent.getWorldOrientation() if parent else Quaternion() #The faces are found in world space, the orientation is relative to the parent.
+        if orientation:
+            self._new_orientation = orientation #Orientation after laying it flat.
+        else:
+            self._new_orientation = None
+
+        self._score = None #Score of the face that was chosen, if any.
+
+        #Gather the meshes and their world transformations now, so process() never needs to touch the scene.
+        self._meshes = []
+        if not node.callDecoration("isGroup"):
+            if node.getMeshData():
+                self._meshes.append((node.getMeshData(), node.getWorldTransformation()))
+        else:
+            #For groups, get the meshes of all children and process them as a single mesh
+            for child in node.getChildren():
+                if child.getMeshData():
+                    self._meshes.append((child.getMeshData(), child.getWorldTransformation()))
+
+    ##  Get the node this operation is applied on.
+    def getNode(self):
+        return self._node
+
+    ##  Get the score of the face that was chosen by process().
+    #
+    #   \return The score of the best face, or None if no face was found.
+    def getScore(self):
+        return self._score
+
+    ##  Computes the orientation that puts the best face of the hull down.
+    #
+    #   If no suitable face can be found (for instance because the mesh is flat)
+    #   the orientation is left untouched.
+    def process(self):
+        vertices = self._getTransformedHullVertices()
+        if vertices is None or len(vertices) < 4:
+            return
+
+        result = self.findBestFace(vertices)
+        if result is None:
+            return
+        normal, self._score = result
+
+        #The rotation is in world space, so bring it into the space of the parent before applying it to the local orientation.
+        rotation = self._rotationToDown(normal)
+        rotation = self._parent_orientation.getInverse() * rotation * self._parent_orientation
+        self._new_orientation = rotation * self._old_orientation
+
+    ##  Scores all faces of the convex hull around a set of vertices.
+    #
+    #   The hull is triangulated, so coplanar triangles are merged into one
+    #   candidate face first. A face is only considered if the centre of mass of
+    #   the hull projects inside of it; otherwise the object would tip over.
+    #
+    #   \param vertices \type{numpy.ndarray} An Nx3 array of vertices.
+    #   \return A tuple of the outward normal of the best face and its score,
+    #   or None if the vertices do not describe a volume.
+    @classmethod
+    def findBestFace(cls, vertices):
+        vertices = numpy.asarray(vertices, dtype = numpy.float64)
+        try:
+            hull = scipy.spatial.ConvexHull(vertices)
+        except (RuntimeError, ValueError): #Flat or otherwise degenerate input. QhullError is a RuntimeError.
+            return None
+
+        points = hull.points
+        corner_a = points[hull.simplices[:, 0]]
+        corner_b = points[hull.simplices[:, 1]]
+        corner_c = points[hull.simplices[:, 2]]
+        normals = hull.equations[:, :3] #Outward pointing unit normals.
+        offsets = hull.equations[:, 3]
+
+        cross = numpy.cross(corner_b - corner_a, corner_c - corner_a)
+        areas = 0.5 * numpy.linalg.norm(cross, axis = 1)
+
+        #Centre of mass of the solid hull, as the volume-weighted average of the tetrahedra that span it.
+        origin = points[hull.vertices].mean(axis = 0)
+        volumes = numpy.abs(numpy.einsum("ij,ij->i", corner_a - origin, cross)) / 6.0
+        if volumes.sum() <= 0:
+            return None
+        centroids = (origin + corner_a + corner_b + corner_c) / 4.0
+        center_of_mass = (centroids * volumes[:, numpy.newaxis]).sum(axis = 0) / volumes.sum()
+
+        #Merge coplanar triangles into candidate faces.
+        size = max(numpy.ptp(points, axis = 0).max(), 1e-9)
+        keys = numpy.column_stack((normals, offsets / size))
+        keys = numpy.round(keys / cls.CoplanarTolerance).astype(numpy.int64)
+        _, first_index, face_index = numpy.unique(keys, axis = 0, return_index = True, return_inverse = True)
+        face_index = face_index.reshape(-1)
+        face_count = len(first_index)
+
+        #Height of the centre of mass above each triangle's plane, and its projection on that plane.
+        heights = -(normals.dot(center_of_mass) + offsets)
+        projected = center_of_mass - normals * (-heights)[:, numpy.newaxis]
+
+        #Barycentric test of the projected centre of mass against all triangles at once.
+        edge_0 = corner_c - corner_a
+        edge_1 = corner_b - corner_a
+        edge_2 = projected - corner_a
+        dot_00 = numpy.einsum("ij,ij->i", edge_0, edge_0)
+        dot_01 = numpy.einsum("ij,ij->i", edge_0, edge_1)
+        dot_02 = numpy.einsum("ij,ij->i", edge_0, edge_2)
+        dot_11 = numpy.einsum("ij,ij->i", edge_1, edge_1)
+        dot_12 = numpy.einsum("ij,ij->i", edge_1, edge_2)
+        denominator = dot_00 * dot_11 - dot_01 * dot_01
+        denominator[denominator == 0] = numpy.inf #Degenerate triangles never contain anything.
+        u = (dot_11 * dot_02 - dot_01 * dot_12) / denominator
+        v = (dot_00 * dot_12 - dot_01 * dot_02) / denominator
+        epsilon = 1e-9
+        inside = (u >= -epsilon) & (v >= -epsilon) & (u + v <= 1 + epsilon)
+
+        face_areas = numpy.bincount(face_index, weights = areas, minlength = face_count)
+        face_stable = numpy.bincount(face_index, weights = inside, minlength = face_count) > 0
+        face_heights = heights[first_index]
+        face_normals = normals[first_index]
+
+        if not face_stable.any(): #Numerical trouble; rather pick an unstable face than none at all.
+            face_stable[:] = True
+
+        scores = cls.AreaWeight * face_areas / face_areas.max() - cls.HeightWeight * face_heights / max(face_heights.max(), 1e-9)
+        scores[~face_stable] = -numpy.inf
+
+        best = int(numpy.argmax(scores))
+        return face_normals[best], float(scores[best])
+
+    ##  Undoes this lay flat operation.
+    def undo(self):
+        self._node.setOrientation(self._old_orientation) #Restore saved orientation.
+
+    ##  Re-does this lay flat operation.
+    def redo(self):
+        if self._new_orientation: #Only if the orientation was finished calculating.
+            self._node.setOrientation(self._new_orientation)
+
+    ##  Merge this operation with another lay flat operation on the best face.
+    #
+    #   You should ONLY merge this operation with an older operation. It is NOT
+    #   symmetric.
+    #
+    #   \param other The older operation to merge this operation with.
+    #   \return A combination of the two operations, or False if the merge
+    #   failed.
+    def mergeWith(self, other):
+        if type(other) is not BestFaceLayFlatOperation: #Must be the same type of operation.
+            return False
+
+        if other._node != self._node: #Must be on the same node.
+            return False
+
+        if other._new_orientation is None or self._new_orientation is None: #Both must have been valid operations (completed computation).
+            return False
+
+        op = BestFaceLayFlatOperation(self._node, self._new_orientation) #Use the same new orientation as this one.
+        op._old_orientation = other._old_orientation #But use the old orientation of the other one.
+        return op
+
+    ##  Makes a programmer-readable representation of this operation.
+    def __repr__(self):
+        return "BestFaceLayFlatOperation(node = {0})".format(self._node)
+
+    ##  Get the vertices of the convex hulls of all meshes, in world space.
+    def _getTransformedHullVertices(self):
+        transformed_vertices = []
+        for mesh, transformation in self._meshes:
+            vertices = mesh.getVertices()
+            try:
+                if mesh.getConvexHull() is not None: #Meshes with fewer than 4 vertices have no hull.
+                    vertices = mesh.getConvexHullVertices()
+            except (RuntimeError, ValueError): #Flat meshes have no hull either. QhullError is a RuntimeError.
+                pass
+            if vertices is None or len(vertices) == 0:
+                continue
+            transformed_vertices.append(transformVertices(vertices, transformation))
+
+        if not transformed_vertices:
+            return None
+        return numpy.concatenate(transformed_vertices, axis = 0)
+
+    ##  Create a rotation that makes a normal point straight down.
+    #
+    #   \param normal \type{numpy.ndarray} The unit normal to rotate.
+    #   \return \type{Quaternion} The rotation.
+    def _rotationToDown(self, normal):
+        down = numpy.array([0.0, -1.0, 0.0])
+        dot = float(numpy.clip(normal.dot(down), -1.0, 1.0))
+        axis = numpy.cross(normal, down)
+        axis_length = numpy.linalg.norm(axis)
+
+        if axis_length < 1e-9:
+            if dot > 0: #Already facing down.
+                return Quaternion()
+            return Quaternion.fromAngleAxis(math.pi, Vector.Unit_X) #Facing straight up, flip it over.
+
+        axis /= axis_length
+        return Quaternion.fromAngleAxis(math.acos(dot), Vector(axis[0], axis[1], axis[2]))
@@ -3,6 +3,8 @@
 
 from . import Operation
 
+from UM.Scene.SceneNode import SceneNode
+
 ##  An operation that groups several other operations together.
 #
 #   The intent of this operation is to hide an underlying chain of operations
@@ -32,16 +34,20 @@ class GroupedOperation(Operation.Operation):
     ##  Undo all operations in this group.
     #
     #   The operations are undone in reverse order as the order in which they
-    #   were added.
+    #   were added. The changes to the scene are emitted as one batch update.
     def undo(self):
-        for op in reversed(self._children):
-            op.undo()
+        with SceneNode.batchUpdate():
+            for op in reversed(self._children):
+                op.undo()
         self._finalised = True
 
     ##  Redoes all operations in this group.
+    #
+    #   The changes to the scene are emitted as one batch update.
     def redo(self):
-        for op in self._children:
-            op.redo()
+        with SceneNode.batchUpdate():
+            for op in self._children:
+                op.redo()
         self._finalised = True
 
     ##  Merges this operation with another GroupOperation.
@@ -39,6 +39,9 @@ class OperationStack():
     #   - Call redo() on the operation.
     #   - Perform merging of operations.
     #
+    #   Operations are done while holding the write lock of the scene, so they
+    #   wait for threads that read the scene, like mesh writers, to finish.
+    #
     #   \param operation \type{Operation} The operation to push onto the stack.
     def push(self, operation):
         if not self._lock.acquire(False):
@@ -49,7 +52,8 @@ class OperationStack():
                 del self._operations[self._current_index + 1:len(self._operations)]
 
             self._operations.append(operation)
-            operation.redo()
+            with self._getSceneLock():
+                operation.redo()
             self._current_index += 1
 
             self._doMerge()
@@ -64,7 +68,8 @@ class OperationStack():
     def undo(self):
         with self._lock:
             if self._current_index >= 0 and self._current_index < len(self._operations):
-                self._operations[self._current_index].undo()
+                with self._getSceneLock():
+                    self._operations[self._current_index].undo()
                 self._current_index -= 1
                 self.changed.emit()
 
@@ -75,7 +80,8 @@ class OperationStack():
         with self._lock:
             n = self._current_index + 1
             if n >= 0 and n < len(self._operations):
-                self._operations[n].redo()
+                with self._getSceneLock():
+                    self._operations[n].redo()
                 self._current_index += 1
                 self.changed.emit()
 
@@ -105,6 +111,10 @@ class OperationStack():
 
     ## private:
 
+    ##  Get the lock to hold while doing an operation, which is the write lock of the scene.
+    def _getSceneLock(self):
+        return self._controller.getScene().getSceneLock()
+
     ##  Merges two operations at the current position in the stack.
     #
     #   This merges the "most recent" operation with the one before it. The
@@ -175,9 +175,12 @@ class MainWindow(QQuickWindow):
         view = self._app.getController().getActiveView()
 
         renderer.beginRendering()
-        view.beginRendering()
-        renderer.render()
-        view.endRendering()
+        if renderer.needsRendering():
+            view.beginRendering()
+            renderer.render()
+            view.endRendering()
+        else: # Nothing changed, so only compose the output of the last frame again.
+            renderer.render()
         renderer.endRendering()
 
     def _onSceneChanged(self, object):
@@ -49,58 +49,55 @@ class MeshListModel(ListModel):
 
     @pyqtSlot("long",int)
     def moveItem(self, key, new_index):
-        for node in Application.getInstance().getController().getScene().getRoot().getAllChildren():
-            if id(node) == key:
-                # Found moved node.
-                old_index = self.find("key",key)
-                if old_index == new_index: # No change.
-                    return
-
-                old_model_entry = self.getItem(old_index) # Model data of moving node
-                new_model_entry = self.getItem(new_index) # Model data of location node should move to.
-
-                for parent_node in Application.getInstance().getController().getScene().getRoot().getAllChildren():
-                    if id(parent_node) == new_model_entry["parent_key"]:
-                        # Found group the object is moving to.
-                        group_move = False
-                        if id(node.getParent()) != id(parent_node):
-                            group_move = True
-                            # Move to different group.
-                            node.setParent(parent_node)
-                            self.removeItem(old_index) # Remove 'old' (now moved) item
-                            if parent_node not in self._collapsed_nodes and node in self._collapsed_nodes:
-                                self._collapsed_nodes.remove(node)
-                            if parent_node in self._collapsed_nodes and node not in self._collapsed_nodes:
-                                self._collapsed_nodes.append(node)
-                        # Magical move
-                        for node2 in Application.getInstance().getController().getScene().getRoot().getAllChildren():
-                            if id(node2) == new_model_entry["key"]:
-                                # Ensure that items within a group are in the correct order.
-                                children = parent_node.getChildren()
-
-                                if node2 == parent_node:
-                                    a , b = self.find("key",(id(children[0]))), self.find("key",(id(children[-1])))
-                                    children.insert(0, children[-1])
-                                    children.pop()
-
-                                else:
-                                    new_index = children.index(node2)
-                                    if new_index > children.index(node) or (group_move and False):
-                                        new_index += 1
-                                    children.insert(new_index, node)
-                                    old_index = [i for i, child in enumerate(children) if child == node and i != new_index][0]
-                                    del children[old_index]
-                                break
-
-                        else:
-                            # Switch happend to dummy?
-                            pass
-                        self.updateList(node)
-                        break
-                      #  break
-
-                #self.removeItem(old_index)
-                #self.insertItem(new_index,data)
+        node = self._scene.findObject(key)
+        if node is None:
+            return
+
+        # Found moved node.
+        old_index = self.find("key",key)
+        if old_index == new_index: # No change.
+            return
+
+        old_model_entry = self.getItem(old_index) # Model data of moving node
+        new_model_entry = self.getItem(new_index) # Model data of location node should move to.
+
+        parent_node = self._scene.findObject(new_model_entry["parent_key"])
+        if parent_node is None:
+            return
+
+        # Found group the object is moving to.
+        group_move = False
+        if id(node.getParent()) != id(parent_node):
+            group_move = True
+            # Move to different group.
+            node.setParent(parent_node)
+            self.removeItem(old_index) # Remove 'old' (now moved) item
+            if parent_node not in self._collapsed_nodes and node in self._collapsed_nodes:
+                self._collapsed_nodes.remove(node)
+            if parent_node in self._collapsed_nodes and node not in self._collapsed_nodes:
+                self._collapsed_nodes.append(node)
+        # Magical move
+        node2 = self._scene.findObject(new_model_entry["key"])
+        if node2 is not None:
+            # Ensure that items within a group are in the correct order.
+            children = parent_node.getChildren()
+
+            if node2 == parent_node:
+                a , b = self.find("key",(id(children[0]))), self.find("key",(id(children[-1])))
+                children.insert(0, children[-1])
+                children.pop()
+
+            else:
+                new_index = children.index(node2)
+                if new_index > children.index(node) or (group_move and False):
+                    new_index += 1
+                children.insert(new_index, node)
+                old_index = [i for i, child in enumerate(children) if child == node and i != new_index][0]
+                del children[old_index]
+        else:
+            # Switch happend to dummy?
+            pass
+        self.updateList(node)
 
     def updateList(self, trigger_node):
         self.clear()
@@ -154,53 +151,50 @@ class MeshListModel(ListModel):
     # set the visibility of a node (by key)
     @pyqtSlot("long",bool)
     def setVisibility(self, key, visibility):
-        for node in self._scene.getRoot().getAllChildren():
-            if id(node) == key:
-                node.setVisible(visibility)
+        node = self._scene.findObject(key)
+        if node is not None:
+            node.setVisible(visibility)
 
     @pyqtSlot("long",str)
     def setName(self, key, name):
-        for index in range(0,len(self.items)):
-            if self.items[index]["key"] == key:
-                for node in Application.getInstance().getController().getScene().getRoot().getAllChildren():
-                    if id(node) == key:
-                        node.setName(name)
+        if self.find("key", key) == -1:
+            return
+        node = self._scene.findObject(key)
+        if node is not None:
+            node.setName(name)
 
     #Set a single item to be selected, by key
     @pyqtSlot("long")
     def setSelected(self, key):
-        for index in range(0,len(self.items)):
-            if self.items[index]["key"] == key:
-                for node in Application.getInstance().getController().getScene().getRoot().getAllChildren():
-                    if id(node) == key:
-                        if node not in Selection.getAllSelectedObjects(): #node already selected
-                            Selection.add(node)
-                            if node.callDecoration("isGroup"): #Its a group node
-                                for child_node in node.getChildren():
-                                    if child_node not in Selection.getAllSelectedObjects(): #Set all children to parent state (if they arent already)
-                                        Selection.add(child_node)
-                        else:
-                            Selection.remove(node)
-                            if node.callDecoration("isGroup"): #Its a group
-                                for child_node in node.getChildren():
-                                    if child_node in Selection.getAllSelectedObjects():
-                                        Selection.remove(child_node)
+        node = self._scene.findObject(key) if self.find("key", key) != -1 else None
+        if node is not None:
+            if node not in Selection.getAllSelectedObjects(): #node already selected
+                Selection.add(node)
+                if node.callDecoration("isGroup"): #Its a group node
+                    for child_node in node.getChildren():
+                        if child_node not in Selection.getAllSelectedObjects(): #Set all children to parent state (if they arent already)
+                            Selection.add(child_node)
+            else:
+                Selection.remove(node)
+                if node.callDecoration("isGroup"): #Its a group
+                    for child_node in node.getChildren():
+                        if child_node in Selection.getAllSelectedObjects():
+                            Selection.remove(child_node)
 
         all_children_selected = True
         #Check all group nodes to see if all their children are selected (if so, they also need to be selected!)
-        for index in range(0,len(self.items)):
-            if self.items[index]["is_group"]:
-                for node in Application.getInstance().getController().getScene().getRoot().getAllChildren():
-                    if node.hasChildren():
-                        if id(node) == self.items[index]["key"] and id(node) != key:
-                            for index, child_node in enumerate(node.getChildren()):
-                                if not Selection.isSelected(child_node):
-                                    all_children_selected = False #At least one of its children is not selected, dont change state
-                                    break
-                            if all_children_selected:
-                                Selection.add(node)
-                            else:
-                                Selection.remove(node)
+        for item in self.items:
+            if item["is_group"] and item["key"] != key:
+                node = self._scene.findObject(item["key"])
+                if node is not None and node.hasChildren():
+                    for child_node in node.getChildren():
+                        if not Selection.isSelected(child_node):
+                            all_children_selected = False #At least one of its children is not selected, dont change state
+                            break
+                    if all_children_selected:
+                        Selection.add(node)
+                    else:
+                        Selection.remove(node)
         #Force update
         self.updateList(Application.getInstance().getController().getScene().getRoot())
 
@@ -210,39 +204,38 @@ class MeshListModel(ListModel):
             item = self.items[index]
             if int(item["parent_key"]) == int(key) or int(item["key"]) == int(key):
                 self.setProperty(index, "collapsed", not item["collapsed"])
-                for node in Application.getInstance().getController().getScene().getRoot().getAllChildren():
-                    if int(item["key"]) == id(node):
-                        if node not in self._collapsed_nodes:
-                            self._collapsed_nodes.append(node)
-                        else:
-                            self._collapsed_nodes.remove(node)
+                if item["is_dummy"]: #Dummy items have no node.
+                    continue
+                node = self._scene.findObject(int(item["key"]))
+                if node is not None:
+                    if node not in self._collapsed_nodes:
+                        self._collapsed_nodes.append(node)
+                    else:
+                        self._collapsed_nodes.remove(node)
 
     @pyqtSlot("long",QUrl)
     def saveMesh(self,key,file_url):
-        for node in Application.getInstance().getController().getScene().getRoot().getAllChildren():
-            if id(node) == key:
-                Application.getInstance().getMeshFileHandler().write(file_url.toLocalFile(),Application.getInstance().getStorageDevice("LocalFileStorage"),node.getMeshDataTransformed())
+        node = self._scene.findObject(key)
+        if node is not None:
+            Application.getInstance().getMeshFileHandler().write(file_url.toLocalFile(),Application.getInstance().getStorageDevice("LocalFileStorage"),node.getMeshDataTransformed())
 
 
     #Remove mesh by key (triggered by context menu)
     @pyqtSlot("long")
     def removeMesh(self, key):
-        for node in Application.getInstance().getController().getScene().getRoot().getAllChildren():
-            if id(node) == key:
-                op = RemoveSceneNodeOperation(node)
-                op.push()
-                break
+        node = self._scene.findObject(key)
+        if node is not None:
+            op = RemoveSceneNodeOperation(node)
+            op.push()
 
     @pyqtSlot()
     def removeSelected(self):
-        keys_to_be_removed = []
         nodes_to_be_removed = []
         for item in self.items:
             if item["selected"]:
-                keys_to_be_removed.append(item["key"])
-        for node in Application.getInstance().getController().getScene().getRoot().getAllChildren():
-            if id(node) in keys_to_be_removed:
-                nodes_to_be_removed.append(node)
+                node = self._scene.findObject(item["key"])
+                if node is not None:
+                    nodes_to_be_removed.append(node)
 
         if len(nodes_to_be_removed):
             op = RemoveSceneNodesOperation(nodes_to_be_removed)
@@ -3,7 +3,10 @@
 
 from PyQt5.QtGui import QOpenGLFramebufferObject, QOpenGLFramebufferObjectFormat
 
+import numpy
+
 from UM.View.GL.FrameBufferObject import FrameBufferObject
+from UM.View.GL.OpenGL import OpenGL
 
 ##  FrameBufferObject subclass using the PyQt OpenGL implementation.
 class QtFrameBufferObject(FrameBufferObject):
@@ -31,3 +34,14 @@ class QtFrameBufferObject(FrameBufferObject):
             self._contents = self._fbo.toImage()
 
         return self._contents
+
+    def getContentsRegion(self, x, y, width, height):
+        gl = OpenGL.getInstance().getBindingsObject()
+
+        # OpenGL counts rows from the bottom.
+        self._fbo.bind()
+        data = gl.glReadPixels(x, self._fbo.height() - y - height, width, height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
+        self._fbo.release()
+
+        pixels = numpy.array(data, dtype = numpy.uint8).reshape(height, width, 4)
+        return numpy.flipud(pixels)
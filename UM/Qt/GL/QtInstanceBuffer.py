@@ -0,0 +1,100 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import ctypes
+import sys
+
+from PyQt5.QtGui import QOpenGLBuffer
+
+from UM.View.GL.InstanceBuffer import InstanceBuffer
+
+##  The OpenGL functions to draw instances, which are not wrapped by PyQt for OpenGL 2.0.
+#
+#   They are part of OpenGL 3.3 and of the ARB_instanced_arrays extension, and
+#   are resolved from the context.
+class QtInstancedFunctions:
+    def __init__(self, vertex_attrib_divisor, draw_arrays_instanced, draw_elements_instanced):
+        self.glVertexAttribDivisor = vertex_attrib_divisor
+        self.glDrawArraysInstanced = draw_arrays_instanced
+        self.glDrawElementsInstanced = draw_elements_instanced
+
+    ##  Resolve the functions from an OpenGL context.
+    #
+    #   \param context \type{QOpenGLContext} The current context.
+    #   \return \type{QtInstancedFunctions} The functions, or None if the context does not support instanced arrays.
+    @classmethod
+    def resolve(cls, context):
+        if not context.hasExtension(b"GL_ARB_instanced_arrays") and context.format().version() < (3, 3):
+            return None
+
+        function_type = ctypes.WINFUNCTYPE if sys.platform == "win32" else ctypes.CFUNCTYPE
+        functions = []
+        for names, argument_types in (
+            (("glVertexAttribDivisorARB", "glVertexAttribDivisor"), (ctypes.c_uint, ctypes.c_uint)), # index, divisor
+            (("glDrawArraysInstancedARB", "glDrawArraysInstanced"), (ctypes.c_uint, ctypes.c_int, ctypes.c_int, ctypes.c_int)), # mode, first, count, instance count
+            (("glDrawElementsInstancedARB", "glDrawElementsInstanced"), (ctypes.c_uint, ctypes.c_int, ctypes.c_uint, ctypes.c_void_p, ctypes.c_int)) # mode, count, type, indices, instance count
+        ):
+            for name in names:
+                address = context.getProcAddress(name.encode())
+                if address is not None and int(address) != 0:
+                    functions.append(function_type(None, *argument_types)(int(address)))
+                    break
+            else:
+                return None
+
+        return cls(*functions)
+
+##  InstanceBuffer subclass using the PyQt OpenGL implementation.
+class QtInstanceBuffer(InstanceBuffer):
+    ##  \param functions \type{QtInstancedFunctions} The functions to draw instances with.
+    def __init__(self, functions):
+        super().__init__()
+
+        self._functions = functions
+        self._stride = 0
+        self._attribute_locations = []
+        self._attribute_names = []
+
+        self._buffer = QOpenGLBuffer(QOpenGLBuffer.VertexBuffer)
+        self._buffer.setUsagePattern(QOpenGLBuffer.StreamDraw)
+        self._buffer.create()
+
+    def setData(self, data):
+        self._stride = data.shape[1] * data.itemsize
+
+        self._buffer.bind()
+        self._buffer.allocate(data, data.nbytes)
+        self._buffer.release()
+
+    def enableAttribute(self, shader, name, type, offset):
+        location = shader.getAttributeLocation(name)
+        if location == -1:
+            return
+
+        self._buffer.bind()
+        shader.enableAttribute(name, type, offset, self._stride)
+        self._buffer.release()
+
+        for column in range(4 if type == "matrix4f" else 1):
+            self._functions.glVertexAttribDivisor(location + column, 1)
+            self._attribute_locations.append(location + column)
+        self._attribute_names.append(name)
+
+    def disableAttributes(self, shader):
+        # The divisors are not reset by disabling the attributes, so drawing without instances would read them per instance.
+        for location in self._attribute_locations:
+            self._functions.glVertexAttribDivisor(location, 0)
+        for name in self._attribute_names:
+            shader.disableAttribute(name)
+
+        self._attribute_locations = []
+        self._attribute_names = []
+
+    def drawArrays(self, mode, first, count, instance_count):
+        self._functions.glDrawArraysInstanced(mode, first, count, instance_count)
+
+    def drawElements(self, mode, count, type, instance_count):
+        self._functions.glDrawElementsInstanced(mode, count, type, None, instance_count)
+
+    def destroy(self):
+        self._buffer.destroy()
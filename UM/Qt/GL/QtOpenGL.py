@@ -3,16 +3,21 @@
 
 import sys
 
-from PyQt5.QtGui import QOpenGLVersionProfile, QOpenGLContext, QOpenGLFramebufferObject, QOpenGLBuffer
+from PyQt5.QtGui import QOpenGLVersionProfile, QOpenGLContext, QOpenGLFramebufferObject, QOpenGLBuffer, QOpenGLVertexArrayObject, QOpenGLTimerQuery
 from PyQt5.QtWidgets import QMessageBox
 
 from UM.Logger import Logger
 
+from UM.View.GL.BufferManager import BufferManager
 from UM.View.GL.OpenGL import OpenGL
+from UM.View.GL.VertexLayout import VertexLayout
 
 from . import QtFrameBufferObject
+from . import QtInstanceBuffer
 from . import QtTexture
 from . import QtShaderProgram
+from . import QtTimerQuery
+from . import QtVertexArrayObject
 
 ##  OpenGL subclass providing the PyQt OpenGL implementation.
 class QtOpenGL(OpenGL):
@@ -37,6 +42,26 @@ class QtOpenGL(OpenGL):
 
         self._gl.initializeOpenGLFunctions()
 
+        self._buffer_manager = BufferManager()
+
+        # Vertex Array Objects are not part of OpenGL 2.0, but most drivers support them through an extension.
+        vertex_array = QOpenGLVertexArrayObject()
+        self._vertex_array_objects_supported = vertex_array.create()
+        vertex_array.destroy()
+        if not self._vertex_array_objects_supported:
+            Logger.log("w", "No vertex array object support, setting up vertex attributes for every draw.")
+
+        # Drawing instances needs OpenGL 3.3 or the ARB_instanced_arrays extension.
+        self._instanced_functions = QtInstanceBuffer.QtInstancedFunctions.resolve(QOpenGLContext.currentContext())
+        self._instance_buffer = None
+        if not self._instanced_functions:
+            Logger.log("w", "No instanced array support, drawing every copy of a mesh separately.")
+
+        # Timer queries need OpenGL 3.3 or an extension. They are only used for statistics.
+        timer_query = QOpenGLTimerQuery()
+        self._timer_queries_supported = timer_query.create()
+        timer_query.destroy()
+
         self._gpu_vendor = OpenGL.Vendor.Other
         vendor_string = self._gl.glGetString(self._gl.GL_VENDOR)
         if vendor_string is None:
@@ -93,64 +118,72 @@ class QtOpenGL(OpenGL):
         shader.load(file_name)
         return shader
 
+    ##  Overrides OpenGL::getBufferManager()
+    def getBufferManager(self):
+        return self._buffer_manager
+
+    ##  Overrides OpenGL::createVertexBuffer()
     def createVertexBuffer(self, mesh, **kwargs):
-        if not kwargs.get("force_recreate", False) and hasattr(mesh, OpenGL.VertexBufferProperty):
-            return getattr(mesh, OpenGL.VertexBufferProperty)
+        return self._buffer_manager.getBuffer(mesh, "vertex", self._createVertexBuffer, kwargs.get("force_recreate", False))
 
-        buffer = QOpenGLBuffer(QOpenGLBuffer.VertexBuffer)
-        buffer.create()
-        buffer.bind()
+    ##  Overrides OpenGL::createIndexBuffer()
+    def createIndexBuffer(self, mesh, **kwargs):
+        if not mesh.hasIndices():
+            return None
 
-        buffer_size = mesh.getVertexCount() * 3 * 4 # Vertex count * number of components * sizeof(float32)
-        if mesh.hasNormals():
-            buffer_size += mesh.getVertexCount() * 3 * 4 # Vertex count * number of components * sizeof(float32)
-        if mesh.hasColors():
-            buffer_size += mesh.getVertexCount() * 4 * 4 # Vertex count * number of components * sizeof(float32)
-        if mesh.hasUVCoordinates():
-            buffer_size += mesh.getVertexCount() * 2 * 4 # Vertex count * number of components * sizeof(float32)
-
-        buffer.allocate(buffer_size)
-
-        offset = 0
-        vertices = mesh.getVerticesAsByteArray()
-        if vertices is not None:
-            buffer.write(0, vertices, len(vertices))
-            offset += len(vertices)
-
-        if mesh.hasNormals():
-            normals = mesh.getNormalsAsByteArray()
-            buffer.write(offset, normals, len(normals))
-            offset += len(normals)
-
-        if mesh.hasColors():
-            colors = mesh.getColorsAsByteArray()
-            buffer.write(offset, colors, len(colors))
-            offset += len(colors)
-
-        if mesh.hasUVCoordinates():
-            uvs = mesh.getUVCoordinatesAsByteArray()
-            buffer.write(offset, uvs, len(uvs))
-            offset += len(uvs)
+        return self._buffer_manager.getBuffer(mesh, "index", self._createIndexBuffer, kwargs.get("force_recreate", False))
 
-        buffer.release()
+    ##  Overrides OpenGL::createVertexArrayObject()
+    def createVertexArrayObject(self, mesh, shader, **kwargs):
+        if not self._vertex_array_objects_supported:
+            return None
 
-        setattr(mesh, OpenGL.VertexBufferProperty, buffer)
-        return buffer
+        vertex_buffer = self.createVertexBuffer(mesh)
+        index_buffer = self.createIndexBuffer(mesh)
+        create_function = lambda mesh: (QtVertexArrayObject.QtVertexArrayObject(vertex_buffer, index_buffer, VertexLayout.fromMesh(mesh), shader), 0)
+        buffer_type = self._buffer_manager.getOwnedBufferType(shader, "vertex_array") # The VAOs are destroyed with the shader.
 
-    def createIndexBuffer(self, mesh, **kwargs):
-        if not mesh.hasIndices():
+        vertex_array = self._buffer_manager.getBuffer(mesh, buffer_type, create_function, kwargs.get("force_recreate", False))
+        if vertex_array.getVertexBuffer() is not vertex_buffer or vertex_array.getIndexBuffer() is not index_buffer:
+            # The buffers were evicted and created again after the VAO was created.
+            vertex_array = self._buffer_manager.getBuffer(mesh, buffer_type, create_function, True)
+        return vertex_array
+
+    ##  Overrides OpenGL::getInstanceBuffer()
+    def getInstanceBuffer(self):
+        if not self._instanced_functions:
             return None
 
-        if not kwargs.get("force_recreate", False) and hasattr(mesh, OpenGL.IndexBufferProperty):
-            return getattr(mesh, OpenGL.IndexBufferProperty)
+        if not self._instance_buffer:
+            self._instance_buffer = QtInstanceBuffer.QtInstanceBuffer(self._instanced_functions)
+        return self._instance_buffer
 
-        buffer = QOpenGLBuffer(QOpenGLBuffer.IndexBuffer)
+    ##  Overrides OpenGL::createTimerQuery()
+    def createTimerQuery(self):
+        if not self._timer_queries_supported:
+            return None
+
+        return QtTimerQuery.QtTimerQuery()
+
+    ##  Create a vertex buffer with the interleaved vertex data of a mesh.
+    #
+    #   \sa VertexLayout
+    def _createVertexBuffer(self, mesh):
+        data = VertexLayout.fromMesh(mesh).createData(mesh)
+
+        buffer = QOpenGLBuffer(QOpenGLBuffer.VertexBuffer)
         buffer.create()
         buffer.bind()
+        buffer.allocate(data, data.nbytes)
+        buffer.release()
+        return buffer, data.nbytes
 
+    def _createIndexBuffer(self, mesh):
         data = mesh.getIndicesAsByteArray()
+
+        buffer = QOpenGLBuffer(QOpenGLBuffer.IndexBuffer)
+        buffer.create()
+        buffer.bind()
         buffer.allocate(data, len(data))
         buffer.release()
-
-        setattr(mesh, OpenGL.IndexBufferProperty, buffer)
-        return buffer
+        return buffer, len(data)
@@ -9,6 +9,8 @@ from UM.Math.Vector import Vector
 from UM.Math.Matrix import Matrix
 from UM.Math.Color import Color
 
+import numpy
+
 from UM.View.GL.OpenGL import OpenGL
 from UM.View.GL.ShaderProgram import ShaderProgram
 
@@ -20,6 +22,7 @@ class QtShaderProgram(ShaderProgram):
         self._shader_program = None
         self._uniform_indices = {}
         self._attribute_indices = {}
+        self._attribute_columns = {}
         self._uniform_values = {}
         self._bound = False
         self._textures = {}
@@ -43,6 +46,10 @@ class QtShaderProgram(ShaderProgram):
             Logger.log("e", "No shader sources loaded")
             return
 
+        # Some drivers need attribute 0 to be read from a buffer, which is not
+        # the case for matrix attributes set with setAttributeValue().
+        self._shader_program.bindAttributeLocation("a_vertex", 0)
+
         if not self._shader_program.link():
             Logger.log("e", "Shader failed to link: %s", self._shader_program.log())
 
@@ -76,13 +83,17 @@ class QtShaderProgram(ShaderProgram):
 
         self.bind()
 
-        if name not in self._attribute_indices:
-            self._attribute_indices[name] = self._shader_program.attributeLocation(name)
-
-        attribute = self._attribute_indices[name]
+        attribute = self.getAttributeLocation(name)
         if attribute == -1:
             return
 
+        if type == "matrix4f": # A matrix takes an attribute location per column.
+            self._attribute_columns[name] = 4
+            for column in range(4):
+                self._shader_program.setAttributeBuffer(attribute + column, 0x1406, offset + column * 16, 4, stride) #GL_FLOAT
+                self._shader_program.enableAttributeArray(attribute + column)
+            return
+
         if type is "int":
             self._shader_program.setAttributeBuffer(attribute, 0x1404, offset, 1, stride) #GL_INT
         elif type is "float":
@@ -104,7 +115,41 @@ class QtShaderProgram(ShaderProgram):
         if name not in self._attribute_indices:
             return
 
-        self._shader_program.disableAttributeArray(self._attribute_indices[name])
+        attribute = self._attribute_indices[name]
+        if attribute == -1:
+            return
+
+        for column in range(self._attribute_columns.get(name, 1)):
+            self._shader_program.disableAttributeArray(attribute + column)
+
+    ##  Overrides ShaderProgram::setAttributeValue()
+    def setAttributeValue(self, name, value):
+        if not self._shader_program:
+            return
+
+        attribute = self.getAttributeLocation(name)
+        if attribute == -1:
+            return
+
+        if type(value) is numpy.ndarray and value.shape == (4, 4): # A row-major matrix, set column by column.
+            for column in range(4):
+                self._shader_program.setAttributeValue(attribute + column, QVector4D(*value[:, column].tolist()))
+        else:
+            self._shader_program.setAttributeValue(attribute, value)
+
+    ##  Get the location of an attribute in the linked shader program.
+    #
+    #   \param name The name of the attribute.
+    #   \return The location of the first column of the attribute, or -1 if
+    #   the shader does not use the attribute.
+    def getAttributeLocation(self, name):
+        if not self._shader_program:
+            return -1
+
+        if name not in self._attribute_indices:
+            self._attribute_indices[name] = self._shader_program.attributeLocation(name)
+
+        return self._attribute_indices[name]
 
     def bind(self):
         if not self._shader_program or not self._shader_program.isLinked():
@@ -141,8 +186,10 @@ class QtShaderProgram(ShaderProgram):
     def _setUniformValueDirect(self, uniform, value):
         if type(value) is Vector:
             self._shader_program.setUniformValue(uniform, QVector3D(value.x, value.y, value.z))
-        elif type(value) is Matrix:
+        elif isinstance(value, Matrix):
             self._shader_program.setUniformValue(uniform, self._matrixToQMatrix4x4(value))
+        elif type(value) is numpy.ndarray and value.shape == (4, 4): # A row-major matrix, as computed for many items at once.
+            self._shader_program.setUniformValue(uniform, QMatrix4x4(value.ravel().tolist()))
         elif type(value) is Color:
             self._shader_program.setUniformValue(uniform, QColor(value.r * 255, value.g * 255, value.b * 255, value.a * 255))
         elif type(value) is list and len(value) is 2:
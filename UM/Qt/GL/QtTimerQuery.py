@@ -0,0 +1,29 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+from PyQt5.QtGui import QOpenGLTimerQuery
+
+from UM.View.GL.TimerQuery import TimerQuery
+
+##  TimerQuery subclass using the PyQt OpenGL implementation.
+class QtTimerQuery(TimerQuery):
+    def __init__(self):
+        super().__init__()
+
+        self._query = QOpenGLTimerQuery()
+        self._query.create()
+
+    def begin(self):
+        self._query.begin()
+
+    def end(self):
+        self._query.end()
+
+    def isResultAvailable(self):
+        return self._query.isResultAvailable()
+
+    def getResult(self):
+        return self._query.waitForResult() / 1e9
+
+    def destroy(self):
+        self._query.destroy()
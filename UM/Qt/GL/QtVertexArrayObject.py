@@ -0,0 +1,50 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+from PyQt5.QtGui import QOpenGLVertexArrayObject
+
+from UM.View.GL.VertexArrayObject import VertexArrayObject
+
+##  VertexArrayObject subclass using the PyQt OpenGL implementation.
+class QtVertexArrayObject(VertexArrayObject):
+    ##  Create a VAO that draws from a vertex buffer with a shader.
+    #
+    #   \param vertex_buffer The vertex buffer with the data of the mesh.
+    #   \param index_buffer The index buffer of the mesh, or None if the mesh has no indices.
+    #   \param layout \type{VertexLayout} The layout of the data in the vertex buffer.
+    #   \param shader \type{ShaderProgram} The shader to set up the attributes of.
+    def __init__(self, vertex_buffer, index_buffer, layout, shader):
+        super().__init__()
+
+        self._vertex_buffer = vertex_buffer
+        self._index_buffer = index_buffer
+
+        self._vao = QOpenGLVertexArrayObject()
+        self._vao.create()
+
+        self._vao.bind()
+        vertex_buffer.bind()
+        if index_buffer is not None:
+            index_buffer.bind()
+        layout.enableAttributes(shader)
+        self._vao.release()
+
+        # Only release the buffers after the VAO, so the VAO keeps the index buffer bound.
+        vertex_buffer.release()
+        if index_buffer is not None:
+            index_buffer.release()
+
+    def getVertexBuffer(self):
+        return self._vertex_buffer
+
+    def getIndexBuffer(self):
+        return self._index_buffer
+
+    def bind(self):
+        self._vao.bind()
+
+    def release(self):
+        self._vao.release()
+
+    def destroy(self):
+        self._vao.destroy()
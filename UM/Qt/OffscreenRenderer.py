@@ -0,0 +1,170 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+from contextlib import contextmanager
+
+from PyQt5.QtGui import QGuiApplication, QOffscreenSurface, QOpenGLContext, QSurfaceFormat
+
+from UM.Resources import Resources
+from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
+from UM.View.GL.OpenGL import OpenGL
+from UM.View.RenderPass import RenderPass
+from UM.Qt.GL.QtOpenGL import QtOpenGL
+from UM.Qt.QtRenderer import QtRenderer
+
+
+##  A renderer that renders a scene to an image instead of a window.
+#
+#   This uses its own OpenGL context with an offscreen surface, so it needs
+#   no window and no application, only a QGuiApplication. The scene is drawn
+#   with the same batches and render passes as in a window, into the frame
+#   buffer object of a single render pass, which is then read back.
+#
+#   On machines without a GPU, this works with a software OpenGL
+#   implementation such as Mesa's llvmpipe. For example, set
+#   QT_QPA_PLATFORM=offscreen and LIBGL_ALWAYS_SOFTWARE=1, or run under Xvfb.
+#
+#   The OpenGL instance of the renderer is only set as the OpenGL singleton
+#   while rendering, so it can be used next to the renderer of a window.
+#
+#   Nodes can only render themselves if the context shares its resources with
+#   the context of the window, since they may use shaders that were created
+#   for the window. QtApplication enables this with Qt.AA_ShareOpenGLContexts.
+#   Otherwise, all nodes are rendered with the default shader.
+class OffscreenRenderer(QtRenderer):
+    ##  Create an offscreen renderer.
+    #
+    #   \param scene \type{Scene} The scene to render.
+    #   \param width The width of the rendered images, in pixels.
+    #   \param height The height of the rendered images, in pixels.
+    def __init__(self, scene, width = 512, height = 512):
+        if QGuiApplication.instance() is None:
+            raise RuntimeError("A QGuiApplication is needed to render offscreen")
+
+        surface_format = QSurfaceFormat()
+        surface_format.setVersion(2, 0)
+        surface_format.setDepthBufferSize(24)
+
+        self._context = QOpenGLContext()
+        share_context = QOpenGLContext.globalShareContext()
+        if share_context is not None:
+            surface_format = share_context.format()
+            self._context.setShareContext(share_context)
+        self._context.setFormat(surface_format)
+        if not self._context.create():
+            raise RuntimeError("Could not create an OpenGL context to render offscreen")
+
+        self._surface = QOffscreenSurface()
+        self._surface.setFormat(self._context.format())
+        self._surface.create()
+
+        super().__init__(scene = scene)
+
+        self._shares_resources = self._context.shareContext() is not None
+        self._opengl = None
+        self._render_pass = None
+        self._camera = None
+
+        self.setViewportSize(width, height)
+        self.setWindowSize(width, height)
+
+    ##  Overridden from QtRenderer.
+    #
+    #   \return \type{Camera} The camera passed to renderImage(), or the active camera of the scene.
+    def getActiveCamera(self):
+        if self._camera is not None:
+            return self._camera
+        return self._scene.getActiveCamera()
+
+    ##  Render the scene to an image.
+    #
+    #   All visible nodes of the scene are rendered, as the nodes render
+    #   themselves or with the default shader. If the context of the renderer
+    #   does not share resources with the window, all nodes are rendered with
+    #   the default shader.
+    #
+    #   \param camera \type{Camera} The camera to render from. By default, the active camera of the scene is used.
+    #   \return A numpy array of unsigned bytes with shape (height, width, 4),
+    #   containing the RGBA values of the pixels. The top row is first. Pixels
+    #   without any objects are transparent.
+    def renderImage(self, camera = None):
+        self._camera = camera
+        try:
+            with self._makeCurrent():
+                self.invalidate() # The scene may have changed without signals.
+                self.beginRendering()
+
+                for node in DepthFirstIterator(self._scene.getRoot(), prune = lambda node: not node.isVisible()):
+                    if not self._shares_resources or not node.render(self):
+                        if node.getMeshData():
+                            self.queueNode(node)
+
+                self.render()
+                image = self._render_pass.getOutputRegion(0, 0, self._viewport_width, self._viewport_height)
+                self.endRendering()
+        finally:
+            self._camera = None
+
+        return image
+
+    ##  Free the OpenGL resources of the renderer.
+    #
+    #   The renderer can not be used afterwards.
+    def destroy(self):
+        if self._opengl is not None:
+            with self._makeCurrent():
+                self._opengl.getBufferManager().clear()
+            self._opengl = None
+
+        self._context.doneCurrent()
+        self._surface.destroy()
+
+    ##  Overridden from QtRenderer, to only create the pass that renders the scene.
+    def _initialize(self):
+        self._gl = self._opengl.getBindingsObject()
+        self._default_material = self._opengl.createShaderProgram(Resources.getPath(Resources.Shaders, "default.shader"))
+
+        self._render_pass = OffscreenRenderPass(self, self._viewport_width, self._viewport_height)
+        self.addRenderPass(self._render_pass)
+
+        self._initialized = True
+        self.initialized.emit()
+
+    ##  Make the context of this renderer current and its OpenGL instance the singleton.
+    #
+    #   Afterwards, the previous context and OpenGL instance are restored.
+    @contextmanager
+    def _makeCurrent(self):
+        previous_context = QOpenGLContext.currentContext()
+        previous_surface = previous_context.surface() if previous_context else None
+        previous_opengl = OpenGL.getInstance()
+
+        self._context.makeCurrent(self._surface)
+        if self._opengl is None:
+            self._opengl = QtOpenGL()
+        OpenGL.setInstance(self._opengl)
+        try:
+            yield
+        finally:
+            OpenGL.setInstance(previous_opengl)
+            if previous_context is not None:
+                previous_context.makeCurrent(previous_surface)
+            else:
+                self._context.doneCurrent()
+
+
+##  Renders the batches of an offscreen renderer into its frame buffer object.
+class OffscreenRenderPass(RenderPass):
+    def __init__(self, renderer, width, height):
+        super().__init__("offscreen", width, height, 0)
+
+        self._renderer = renderer
+
+    def render(self):
+        self.bind()
+
+        camera = self._renderer.getActiveCamera()
+        for batch in self._renderer.getBatches():
+            batch.render(camera)
+
+        self.release()
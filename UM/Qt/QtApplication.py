@@ -55,6 +55,9 @@ class QtApplication(QApplication, Application):
             QCoreApplication.addLibraryPath(plugin_path)
 
         os.environ["QSG_RENDER_LOOP"] = "basic"
+        # Share the shaders and buffers of the window with other OpenGL contexts, such as that of an OffscreenRenderer.
+        # This has to be set before the application is created.
+        QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
         super().__init__(sys.argv, **kwargs)
 
         self._plugins_loaded = False #Used to determine when it's safe to use the plug-ins.
@@ -20,12 +20,15 @@ from UM.View.DefaultPass import DefaultPass
 from UM.View.SelectionPass import SelectionPass
 from UM.View.GL.OpenGL import OpenGL
 from UM.View.RenderBatch import RenderBatch
+from UM.View.RenderStatistics import RenderStatistics
 from UM.Qt.GL.QtOpenGL import QtOpenGL
 
 from UM.Signal import Signal, signalemitter
 
 import numpy
 import copy
+import time
+from collections import deque
 from ctypes import c_void_p
 
 vertexBufferProperty = "__qtgl2_vertex_buffer"
@@ -34,11 +37,20 @@ indexBufferProperty = "__qtgl2_index_buffer"
 ##  A Renderer implementation using PyQt's OpenGL implementation to render.
 @signalemitter
 class QtRenderer(Renderer):
-    def __init__(self):
+    ##  Create a renderer.
+    #
+    #   \param scene \type{Scene} The scene to render. By default, this is the
+    #   scene of the application. A renderer for another scene does not need an
+    #   application, but is not notified of changes to the active view or tool.
+    def __init__(self, scene = None):
         super().__init__()
 
-        self._controller = Application.getInstance().getController()
-        self._scene = self._controller.getScene()
+        if scene is None:
+            self._controller = Application.getInstance().getController()
+            self._scene = self._controller.getScene()
+        else:
+            self._controller = None
+            self._scene = scene
 
         self._vertex_buffer_cache = {}
         self._index_buffer_cache = {}
@@ -53,21 +65,73 @@ class QtRenderer(Renderer):
         self._window_height = 0
 
         self._batches = []
+        self._state_batches = {} # The batches of this frame, by render state.
+        self._queued_nodes = [] # Nodes that were queued but not yet put in a batch, as (node, kwargs) tuples.
+
+        self._statistics = RenderStatistics() # The statistics of the frame that is being rendered.
+        self._last_statistics = RenderStatistics()
+
+        # Detailed statistics and timings are only recorded when enabled.
+        self._record_statistics = False
+        self._statistics_history = deque(maxlen = self.StatisticsHistorySize)
+        self._frame_start_time = 0.0
+        self._frame_start_uploads = (0, 0) # The total number of buffer uploads and bytes uploaded at the start of the frame.
+        self._recording_statistics = None # The statistics of the frame that is being rendered, if it is recorded.
+        self._free_timer_queries = []
+        self._pending_timer_queries = [] # Timer queries of which the result is not yet available, as (statistics, pass name, query) tuples.
+        self._unused_timer_queries = [] # Timer queries to destroy when the context is current again.
 
         self._quad_buffer = None
 
         self._camera = None
 
+        # Rendering is skipped for frames in which nothing changed.
+        self._invalidated = True # Whether something changed since the last rendered frame.
+        self._render_frame = True # Whether the current frame is rendered, or the last one is reused.
+        self._camera_state = None # The active camera and its transformation for the last rendered frame.
+
+        self._scene.sceneChanged.connect(self._onRenderStateChanged)
+        Selection.selectionChanged.connect(self._onRenderStateChanged)
+        if self._controller:
+            self._controller.activeViewChanged.connect(self._onRenderStateChanged)
+            self._controller.activeToolChanged.connect(self._onRenderStateChanged)
+
     initialized = Signal()
 
+    ##  The number of frames for which statistics are kept.
+    StatisticsHistorySize = 300
+
+    ##  Mark the rendered frame as out of date, so the next frame is rendered again.
+    #
+    #   Changes to the scene, the selection, the active camera, view or tool
+    #   and the viewport do this automatically. Anything else that changes what
+    #   is rendered, such as view specific settings, should call this.
+    def invalidate(self):
+        self._invalidated = True
+
+    ##  Check whether the current frame needs to be rendered.
+    #
+    #   This is known after beginRendering(). If nothing changed since the last
+    #   rendered frame, nodes do not need to be queued and render() reuses the
+    #   output of the render passes of the last frame.
+    def needsRendering(self):
+        return self._render_frame
+
     ##  Get an integer multiplier that can be used to correct for screen DPI.
     def getPixelMultiplier(self):
         # Standard assumption for screen pixel density is 96 DPI. We use that as baseline to get
         # a multiplication factor we can use for screens > 96 DPI.
         return round(Application.getInstance().primaryScreen().physicalDotsPerInch() / 96.0)
 
+    ##  Get the camera to render from.
+    #
+    #   \return \type{Camera} The active camera of the scene.
+    def getActiveCamera(self):
+        return self._scene.getActiveCamera()
+
     ##  Get the list of render batches.
     def getBatches(self):
+        self._buildBatches()
         return self._batches
 
     ##  Overridden from Renderer.
@@ -76,10 +140,17 @@ class QtRenderer(Renderer):
     def addRenderPass(self, render_pass):
         super().addRenderPass(render_pass)
         render_pass.setSize(self._viewport_width, self._viewport_height)
+        self.invalidate()
+
+    ##  Overridden from Renderer.
+    def removeRenderPass(self, render_pass):
+        super().removeRenderPass(render_pass)
+        self.invalidate()
 
     ##  Set background color used when rendering.
     def setBackgroundColor(self, color):
         self._background_color = color
+        self.invalidate()
 
     def getViewportWidth(self):
         return self._viewport_width
@@ -98,6 +169,8 @@ class QtRenderer(Renderer):
         for render_pass in self._render_passes:
             render_pass.setSize(width, height)
 
+        self.invalidate()
+
     ##  Set the window size.
     def setWindowSize(self, width, height):
         self._window_width = width
@@ -114,13 +187,136 @@ class QtRenderer(Renderer):
         if not self._initialized:
             self._initialize()
 
+        OpenGL.getInstance().getBufferManager().nextFrame()
+
+        for query in self._unused_timer_queries:
+            query.destroy()
+        self._unused_timer_queries.clear()
+
+        if self._record_statistics:
+            self._collectTimerQueries()
+            self._recording_statistics = self._statistics
+            self._frame_start_time = time.perf_counter()
+            buffer_statistics = OpenGL.getInstance().getBufferManager().getStatistics()
+            self._frame_start_uploads = (buffer_statistics["uploads"], buffer_statistics["upload_bytes"])
+
+        camera = self.getActiveCamera()
+        camera_state = (camera, camera.getWorldTransformation()) if camera else None
+        self._render_frame = self._invalidated or camera_state != self._camera_state
+        if self._render_frame:
+            self._invalidated = False
+            self._camera_state = camera_state
+
         self._gl.glViewport(0, 0, self._viewport_width, self._viewport_height)
         self._gl.glClearColor(self._background_color.redF(), self._background_color.greenF(), self._background_color.blueF(), self._background_color.alphaF())
         self._gl.glClear(self._gl.GL_COLOR_BUFFER_BIT | self._gl.GL_DEPTH_BUFFER_BIT)
         self._gl.glClearColor(0.0, 0.0, 0.0, 0.0)
 
     ##  Overrides Renderer::queueNode()
+    #
+    #   The node is put in a batch when the batches are needed, after nodes
+    #   outside the view of the active camera have been culled.
     def queueNode(self, node, **kwargs):
+        self._queued_nodes.append((node, kwargs))
+
+    ##  Get the statistics of the last frame that was rendered.
+    #
+    #   \return \type{RenderStatistics}
+    def getStatistics(self):
+        return self._last_statistics
+
+    ##  Set whether detailed statistics are recorded for every frame.
+    #
+    #   This records the draw calls, triangles, shader binds and buffer uploads
+    #   of every frame, the CPU time spent on every render pass and, if timer
+    #   queries are supported, the GPU time. When disabled, recording costs
+    #   nothing.
+    #
+    #   \param enabled \type{bool} Whether to record the statistics.
+    def setStatisticsEnabled(self, enabled):
+        self._record_statistics = enabled
+        if not enabled:
+            # The context may not be current here, so the queries are destroyed when the next frame begins.
+            self._unused_timer_queries.extend(query for statistics, name, query in self._pending_timer_queries)
+            self._unused_timer_queries.extend(self._free_timer_queries)
+            self._pending_timer_queries.clear()
+            self._free_timer_queries.clear()
+
+    ##  Overrides Renderer::getRecordingStatistics()
+    def getRecordingStatistics(self):
+        return self._recording_statistics
+
+    ##  Check whether detailed statistics are recorded for every frame.
+    def isStatisticsEnabled(self):
+        return self._record_statistics
+
+    ##  Get the statistics of the last recorded frames.
+    #
+    #   At most StatisticsHistorySize frames are kept. The GPU times of the
+    #   last few frames may still be missing, since they are only available
+    #   once the GPU finished rendering those frames.
+    #
+    #   \return \type{list} of RenderStatistics, from oldest to newest.
+    def getStatisticsHistory(self):
+        return list(self._statistics_history)
+
+    ##  Remove the statistics of all recorded frames.
+    def clearStatisticsHistory(self):
+        self._statistics_history.clear()
+
+    ##  Put the queued nodes that are inside the view in batches.
+    def _buildBatches(self):
+        if not self._queued_nodes:
+            return
+
+        queued_nodes = self._queued_nodes
+        self._queued_nodes = []
+
+        visible = self._cullNodes(queued_nodes)
+        for (node, kwargs), node_visible in zip(queued_nodes, visible):
+            if node_visible:
+                self._addToBatch(node, kwargs)
+
+        self._statistics.queued_nodes += len(queued_nodes)
+        self._statistics.culled_nodes += len(queued_nodes) - int(numpy.count_nonzero(visible))
+        self._statistics.batches = len(self._batches)
+
+    ##  Check which queued nodes are inside the view frustum of the active camera.
+    #
+    #   The bounding boxes of all nodes are tested in one go. Nodes that are
+    #   rendered with another mesh than their own or that have no valid bounding
+    #   box are never culled, since their bounding box says nothing about what
+    #   is drawn.
+    #
+    #   \param queued_nodes A list of (node, kwargs) tuples, as passed to queueNode.
+    #   \return A numpy array with a boolean for every node, True if it should be rendered.
+    def _cullNodes(self, queued_nodes):
+        visible = numpy.ones(len(queued_nodes), dtype = numpy.bool_)
+        camera = self.getActiveCamera()
+        if camera is None:
+            return visible
+
+        indices = []
+        minimums = []
+        maximums = []
+        for index, (node, kwargs) in enumerate(queued_nodes):
+            if "mesh" in kwargs and kwargs["mesh"] is not node.getMeshData():
+                continue
+            box = node.getBoundingBox()
+            if box is None or not box.isValid():
+                continue
+            indices.append(index)
+            minimum = box.minimum
+            maximum = box.maximum
+            minimums.append((minimum.x, minimum.y, minimum.z))
+            maximums.append((maximum.x, maximum.y, maximum.z))
+
+        if indices:
+            visible[indices] = camera.getViewFrustum().intersectsBoxes(minimums, maximums)
+        return visible
+
+    ##  Add a queued node to the batch for its render state.
+    def _addToBatch(self, node, kwargs):
         type = kwargs.pop("type", RenderBatch.RenderType.Solid)
         if kwargs.pop("transparent", False):
             type = RenderBatch.RenderType.Transparent
@@ -128,22 +324,57 @@ class QtRenderer(Renderer):
             type = RenderBatch.RenderType.Overlay
 
         shader = kwargs.pop("shader", self._default_material)
-        batch = RenderBatch(shader, type = type, **kwargs)
-
-        batch.addItem(node.getWorldTransformation(), kwargs.get("mesh", node.getMeshData()), kwargs.pop("uniforms", None))
-
-        self._batches.append(batch)
+        mesh = kwargs.pop("mesh", node.getMeshData())
+        uniforms = kwargs.pop("uniforms", None)
+
+        # All nodes with the same render state go in one batch, so every state is only set up once
+        # per frame. Nodes in the batch that share a mesh are drawn as instances of that mesh.
+        try:
+            key = (shader, type, frozenset(kwargs.items()))
+            batch = self._state_batches.get(key)
+        except TypeError: # Some state can not be compared, so render this node by itself.
+            key = None
+            batch = None
+
+        if batch is None:
+            batch = RenderBatch(shader, type = type, statistics = self._recording_statistics, **kwargs)
+            self._batches.append(batch)
+            if key is not None:
+                self._state_batches[key] = batch
+
+        batch.addItem(node.getWorldTransformation(), mesh, uniforms)
 
     ##  Overrides Renderer::render()
+    #
+    #   If nothing changed since the last rendered frame, only the render passes
+    #   of which the output can not be reused are rendered.
     def render(self):
+        self._buildBatches()
         self._batches.sort()
 
         for render_pass in self.getRenderPasses():
-            render_pass.render()
+            if self._render_frame or not render_pass.canReuseOutput():
+                if self._record_statistics:
+                    self._renderTimed(render_pass)
+                else:
+                    render_pass.render()
 
     ##  Overrides Renderer::endRendering()
     def endRendering(self):
+        self._queued_nodes.clear()
         self._batches.clear()
+        self._state_batches.clear()
+
+        if self._recording_statistics is not None:
+            self._recording_statistics = None
+            self._statistics.frame_time = time.perf_counter() - self._frame_start_time
+            buffer_statistics = OpenGL.getInstance().getBufferManager().getStatistics()
+            self._statistics.buffer_uploads = buffer_statistics["uploads"] - self._frame_start_uploads[0]
+            self._statistics.upload_bytes = buffer_statistics["upload_bytes"] - self._frame_start_uploads[1]
+            self._statistics_history.append(self._statistics)
+
+        self._last_statistics = self._statistics
+        self._statistics = RenderStatistics()
 
     ##  Render a full screen quad.
     #
@@ -165,6 +396,38 @@ class QtRenderer(Renderer):
         shader.disableAttribute("a_uvs")
         self._quad_buffer.release()
 
+    ##  Render a pass and record the time spent on it.
+    def _renderTimed(self, render_pass):
+        if self._free_timer_queries:
+            query = self._free_timer_queries.pop()
+        else:
+            query = OpenGL.getInstance().createTimerQuery()
+
+        start_time = time.perf_counter()
+        if query is not None:
+            query.begin()
+
+        render_pass.render()
+
+        if query is not None:
+            query.end()
+            self._pending_timer_queries.append((self._statistics, render_pass.getName(), query))
+        self._statistics.pass_times[render_pass.getName()] = time.perf_counter() - start_time
+
+    ##  Add the results of the timer queries that finished to the statistics of their frames.
+    def _collectTimerQueries(self):
+        pending = []
+        for statistics, name, query in self._pending_timer_queries:
+            if query.isResultAvailable():
+                statistics.pass_gpu_times[name] = query.getResult()
+                self._free_timer_queries.append(query)
+            else:
+                pending.append((statistics, name, query))
+        self._pending_timer_queries = pending
+
+    def _onRenderStateChanged(self, *args):
+        self.invalidate()
+
     def _initialize(self):
         OpenGL.setInstance(QtOpenGL())
         self._gl = OpenGL.getInstance().getBindingsObject()
@@ -0,0 +1,143 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+from contextlib import contextmanager
+import threading
+
+
+##  A lock that can be held by many readers at once, or by one writer.
+#
+#   Waiting writers have priority over new readers, so a steady stream of
+#   readers can not keep a writer waiting forever. Both kinds of lock can be
+#   acquired again by the thread that holds them, and the thread that holds the
+#   write lock may also acquire the read lock. A thread that holds only the
+#   read lock can not acquire the write lock, since two threads doing so would
+#   wait for each other forever.
+#
+#   The acquire() and release() functions and the with statement take the
+#   write lock, so this lock can be used where a threading.Lock was used.
+#
+#       with lock.read():
+#           ... # Other readers may run at the same time.
+#       with lock.write():
+#           ... # Nobody else holds the lock.
+class ReadWriteLock:
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = {} # Number of times every reading thread acquired the read lock, by thread identifier.
+        self._writer = None # Identifier of the thread that holds the write lock.
+        self._write_count = 0 # Number of times the writer acquired the write lock.
+        self._waiting_writers = 0
+
+    ##  Acquire the lock for reading.
+    #
+    #   \param blocking If False, return immediately if the lock can not be acquired.
+    #   \param timeout The maximum number of seconds to wait, or -1 to wait forever.
+    #   \return True if the lock was acquired, False if not.
+    def acquireRead(self, blocking = True, timeout = -1):
+        thread = threading.get_ident()
+        with self._condition:
+            if thread in self._readers:
+                self._readers[thread] += 1
+                return True
+            if self._writer == thread:
+                self._readers[thread] = 1
+                return True
+
+            if not self._wait(lambda: self._writer is None and self._waiting_writers == 0, blocking, timeout):
+                return False
+            self._readers[thread] = 1
+            return True
+
+    ##  Release the lock after reading.
+    #
+    #   \exception RuntimeError The current thread does not hold the read lock.
+    def releaseRead(self):
+        thread = threading.get_ident()
+        with self._condition:
+            if thread not in self._readers:
+                raise RuntimeError("Cannot release a read lock that is not held by this thread.")
+            self._readers[thread] -= 1
+            if self._readers[thread] == 0:
+                del self._readers[thread]
+                if not self._readers:
+                    self._condition.notify_all()
+
+    ##  Acquire the lock for writing.
+    #
+    #   \param blocking If False, return immediately if the lock can not be acquired.
+    #   \param timeout The maximum number of seconds to wait, or -1 to wait forever.
+    #   \return True if the lock was acquired, False if not.
+    #   \exception RuntimeError The current thread holds only the read lock.
+    def acquireWrite(self, blocking = True, timeout = -1):
+        thread = threading.get_ident()
+        with self._condition:
+            if self._writer == thread:
+                self._write_count += 1
+                return True
+            if thread in self._readers:
+                raise RuntimeError("Cannot acquire the write lock while holding the read lock.")
+
+            self._waiting_writers += 1
+            try:
+                acquired = self._wait(lambda: self._writer is None and not self._readers, blocking, timeout)
+            finally:
+                self._waiting_writers -= 1
+            if not acquired:
+                self._condition.notify_all() # Readers that waited for this writer may continue.
+                return False
+            self._writer = thread
+            self._write_count = 1
+            return True
+
+    ##  Release the lock after writing.
+    #
+    #   \exception RuntimeError The current thread does not hold the write lock.
+    def releaseWrite(self):
+        with self._condition:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("Cannot release a write lock that is not held by this thread.")
+            self._write_count -= 1
+            if self._write_count == 0:
+                self._writer = None
+                self._condition.notify_all()
+
+    ##  Context manager that holds the read lock.
+    @contextmanager
+    def read(self):
+        self.acquireRead()
+        try:
+            yield
+        finally:
+            self.releaseRead()
+
+    ##  Context manager that holds the write lock.
+    @contextmanager
+    def write(self):
+        self.acquireWrite()
+        try:
+            yield
+        finally:
+            self.releaseWrite()
+
+    ##  Acquire the write lock, like threading.Lock.acquire.
+    def acquire(self, blocking = True, timeout = -1):
+        return self.acquireWrite(blocking, timeout)
+
+    ##  Release the write lock, like threading.Lock.release.
+    def release(self):
+        self.releaseWrite()
+
+    def __enter__(self):
+        self.acquireWrite()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.releaseWrite()
+
+    ##  private:
+    #   Wait until a condition holds. The condition lock must be held.
+    def _wait(self, predicate, blocking, timeout):
+        if not blocking:
+            return predicate()
+        return self._condition.wait_for(predicate, None if timeout < 0 else timeout)
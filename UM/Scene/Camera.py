@@ -3,6 +3,7 @@
 
 from . import SceneNode
 
+from UM.Math.Frustum import Frustum
 from UM.Math.Matrix import Matrix
 from UM.Math.Ray import Ray
 from UM.Math.Vector import Vector
@@ -65,6 +66,13 @@ class Camera(SceneNode.SceneNode):
     def setPerspective(self, pers):
         self._perspective = pers
 
+    ##  Get the volume of the world that can be seen by this camera.
+    #
+    #   \return \type{Frustum}
+    def getViewFrustum(self):
+        view_projection = self.getProjectionMatrix().multiply(self.getWorldTransformation().getInverse())
+        return Frustum.fromMatrix(view_projection)
+
     ##  Get a ray from the camera into the world.
     #
     #   This will create a ray from the camera's origin, passing through (x, y)
@@ -3,14 +3,21 @@
 
 from . import Iterator
 
+from collections import deque
 
+
+##  Iterates over a node and its descendants level by level.
 class BreadthFirstIterator(Iterator.Iterator):
-    def __init__(self, scene_node):
-        super(BreadthFirstIterator, self).__init__(scene_node) # Call super to make multiple inheritence work.
-    
-    def _fillStack(self):
-        if self._scene_node is not None:
-            self._node_stack.append(self._scene_node)
-            for node in self._node_stack: # Loop through list, add children to back of list
-                self._node_stack.extend(node.getChildren())
+    def __init__(self, scene_node, filter = None, prune = None):
+        super(BreadthFirstIterator, self).__init__(scene_node, filter = filter, prune = prune) # Call super to make multiple inheritence work.
 
+    def _iterate(self):
+        if self._scene_node is None:
+            return
+        queue = deque((self._scene_node, ))
+        while queue:
+            node = queue.popleft()
+            if self._isPruned(node):
+                continue
+            yield node
+            queue.extend(node.getChildren())
@@ -4,10 +4,20 @@
 from . import Iterator
 
 
+##  Iterates over a node and its descendants in depth-first pre-order.
+#
+#   Every node is followed by its complete subtree before its next sibling.
 class DepthFirstIterator(Iterator.Iterator):
-    def __init__(self, scene_node):
-        super(DepthFirstIterator, self).__init__(scene_node) # Call super to make multiple inheritence work.
-    
-    def _fillStack(self):
-        self._node_stack.append(self._scene_node)
-        self._node_stack.extend(self._scene_node.getAllChildren())
+    def __init__(self, scene_node, filter = None, prune = None):
+        super(DepthFirstIterator, self).__init__(scene_node, filter = filter, prune = prune) # Call super to make multiple inheritence work.
+
+    def _iterate(self):
+        if self._scene_node is None:
+            return
+        stack = [self._scene_node]
+        while stack:
+            node = stack.pop()
+            if self._isPruned(node):
+                continue
+            yield node
+            stack.extend(reversed(node.getChildren()))
@@ -3,16 +3,53 @@
 
 
 ##    Abstract iterator class.
+#
+#   Subclasses implement _iterate() as a generator that visits the nodes in a
+#   certain order. Nodes are visited lazily: no list of all nodes is made, and
+#   a loop that stops early does not visit the rest of the tree.
+#
+#   The nodes can be narrowed down in two ways:
+#   - filter is called for every visited node. Nodes for which it returns
+#     False are not returned, but their children are still visited.
+#   - prune is called for every node that is about to be visited. If it
+#     returns True, that node and all its descendants are skipped without
+#     visiting them, for example to skip hidden branches of the scene.
+#
+#       for node in DepthFirstIterator(root, filter = lambda node: node.getMeshData(), prune = lambda node: not node.isVisible()):
 class Iterator(object):
-    def __init__(self, scene_node):
+    ##  Create an iterator over a node and its descendants.
+    #
+    #   \param scene_node The node to start at.
+    #   \param filter Optional function that gets a node and returns whether to return it.
+    #   \param prune Optional function that gets a node and returns whether to skip it and its descendants.
+    def __init__(self, scene_node, filter = None, prune = None):
         super(Iterator, self).__init__() # Call super to make multiple inheritence work.
         self._scene_node = scene_node
-        self._node_stack = [] 
+        self._filter = filter
+        self._prune = prune
+        self._node_stack = []
+
+    ##  Generator that visits the nodes in the order of this iterator, skipping pruned subtrees.
+    #
+    #   By default, this visits the list of nodes filled by _fillStack, for
+    #   subclasses that make a list of all nodes in advance. Pruning then only
+    #   skips the pruned nodes themselves.
+    def _iterate(self):
+        self._node_stack = []
         self._fillStack()
-    
+        for node in self._node_stack:
+            if not self._isPruned(node):
+                yield node
+
     ##   Fills the list of nodes by a certain order. The strategy to do this is to be defined by the child.
     def _fillStack(self):
         raise NotImplementedError("Iterator is not correctly implemented. Requires a _fill_stack implementation.")
-    
+
+    ##  Check whether a node and its descendants should be skipped.
+    def _isPruned(self, node):
+        return self._prune is not None and self._prune(node)
+
     def __iter__(self):
-        return iter(self._node_stack)
\ No newline at end of file
+        if self._filter is None:
+            return self._iterate()
+        return filter(self._filter, self._iterate())
@@ -86,6 +86,6 @@ class PointCloudNode(SceneNode.SceneNode):
         colors = numpy.resize(data,(mesh_data.getVertexCount(), 4))
         colors = colors.astype(numpy.float32)
         colors /= 255
-        self._mesh_data = mesh_data.set(colors=colors)
+        self._replaceMeshData(mesh_data.set(colors=colors))
         self._resetAABB()
         self.meshDataChanged.emit(self)
@@ -2,11 +2,13 @@
 # Uranium is released under the terms of the AGPLv3 or higher.
 
 from UM.Scene.SceneNode import SceneNode
+from UM.Scene.SceneSnapshot import SceneSnapshot
 from UM.Scene.Camera import Camera
 from UM.Signal import Signal, signalemitter
 from UM.Scene.Iterator.BreadthFirstIterator import BreadthFirstIterator
+from UM.ReadWriteLock import ReadWriteLock
 
-import threading
+import weakref
 
 
 ##  Container object for the scene graph.
@@ -17,17 +19,24 @@ class Scene():
     def __init__(self):
         super().__init__() # Call super to make multiple inheritance work.
 
+        self._node_index = weakref.WeakValueDictionary() # The nodes in the scene, by id().
+        self._indexed_children = weakref.WeakKeyDictionary() # The ids of the children of every node when it was last indexed.
+
         self._root = SceneNode(name= "Root")
         self._root.setCalculateBoundingBox(False)
         self._connectSignalsRoot()
         self._active_camera = None
 
-        self._lock = threading.Lock()
+        self._lock = ReadWriteLock()
 
     def _connectSignalsRoot(self):
-        self._root.transformationChanged.connect(self.sceneChanged)
-        self._root.childrenChanged.connect(self.sceneChanged)
-        self._root.meshDataChanged.connect(self.sceneChanged)
+        self._root.transformationChanged.connect(self._onRootChanged)
+        self._root.childrenChanged.connect(self._onRootChanged)
+        self._root.meshDataChanged.connect(self._onRootChanged)
+        self._root.visibilityChanged.connect(self._onRootChanged)
+        self._root.batchUpdateFinished.connect(self._onBatchUpdateFinished)
+        self._root.childrenChanged.connect(self._onChildrenChanged)
+        self._rebuildNodeIndex()
 
     ##  Acquire the global scene lock.
     #
@@ -48,9 +57,29 @@ class Scene():
     #   Use this lock to prevent any read or write actions on the scene from other threads,
     #   assuming those threads also properly acquire the lock. Most notably, this
     #   prevents the rendering thread from rendering the scene while it is changing.
+    #
+    #   The lock is a \type{ReadWriteLock}. Using it like a regular lock takes
+    #   the write lock. Code that only reads the scene should use read() so that
+    #   it does not block other readers, or better, work on a snapshot.
+    #   \sa createSnapshot
     def getSceneLock(self):
         return self._lock
 
+    ##  Take an immutable snapshot of the scene, or of part of it.
+    #
+    #   Background jobs should take a snapshot when they are started and read
+    #   that, instead of holding the scene lock for as long as they run.
+    #
+    #   \param nodes \type{list} The nodes to take a snapshot of, including all
+    #   their descendants. If None, a snapshot of the whole scene is taken.
+    #   \param decorations \type{tuple} Names of decorations to record for every node.
+    #   \return \type{SceneSnapshot}
+    def createSnapshot(self, nodes = None, decorations = SceneSnapshot.DefaultDecorations):
+        if nodes is None:
+            nodes = [self._root]
+        with self._lock.read():
+            return SceneSnapshot(nodes, decorations)
+
     ##  Get the root node of the scene.
     def getRoot(self):
         return self._root
@@ -68,12 +97,7 @@ class Scene():
         return self._active_camera
 
     def getAllCameras(self):
-        cameras = []
-        for node in BreadthFirstIterator(self._root):
-            if type(node) is Camera:
-                cameras.append(node)
-
-        return cameras
+        return list(BreadthFirstIterator(self._root, filter = lambda node: type(node) is Camera))
 
     ##  Set the camera that should be used for rendering.
     #   \param name The name of the camera to use.
@@ -86,19 +110,81 @@ class Scene():
     #   \param object The object that triggered the change.
     sceneChanged = Signal()
 
+    ##  Context manager that groups many changes to the scene into one notification.
+    #
+    #   The change signals of scene nodes are postponed until the end of the
+    #   block, and then emitted once per node. sceneChanged is emitted only
+    #   once for the whole block, followed by batchUpdateFinished with a
+    #   summary of the changes.
+    #
+    #       with scene.batchUpdate():
+    #           for node in nodes:
+    #               node.translate(offset)
+    #
+    #   \sa SceneNode.batchUpdate
+    def batchUpdate(self):
+        return SceneNode.batchUpdate()
+
+    ##  Signal. Emitted at the end of a batch update that changed the scene.
+    #   \param changes \type{dict} For every changed node, the set of names of
+    #   the signals it emitted, like "transformationChanged".
+    batchUpdateFinished = Signal()
+
     ##  Find an object by id.
     #
+    #   The scene keeps an index of its nodes by id, which is kept up to date
+    #   through the childrenChanged signal of the root, so this does not need
+    #   to search through the scene.
+    #
     #   \param object_id The id of the object to search for, as returned by the python id() method.
     #
     #   \return The object if found, or None if not.
     def findObject(self, object_id):
-        for node in BreadthFirstIterator(self._root):
-            if id(node) == object_id:
-                return node
+        node = self._node_index.get(object_id)
+        if node is not None and self._isInScene(node):
+            return node
         return None
 
     ## private:
-    def _findCamera(self, name):
+    def _onRootChanged(self, node):
+        if not SceneNode.isEmittingBatchChanges(): # Emitted once at the end of the batch update instead.
+            self.sceneChanged.emit(node)
+
+    ##  Add the nodes that were added to the scene to the node index.
+    #
+    #   Every child that was not a child of the node when it was last indexed
+    #   is indexed with all its descendants, since they may have changed while
+    #   it was not in the scene. Removed nodes are left in the index until they
+    #   are deleted, since findObject checks whether a node is still in the
+    #   scene anyway.
+    def _onChildrenChanged(self, node):
+        indexed_children = self._indexed_children.get(node, ())
+        for child in node.getChildren():
+            if id(child) not in indexed_children or self._node_index.get(id(child)) is not child:
+                for descendant in BreadthFirstIterator(child):
+                    self._indexNode(descendant)
+        self._indexNode(node)
+
+    def _rebuildNodeIndex(self):
+        self._node_index.clear()
+        self._indexed_children.clear()
         for node in BreadthFirstIterator(self._root):
-            if type(node) is Camera and node.getName() == name:
+            self._indexNode(node)
+
+    def _indexNode(self, node):
+        self._node_index[id(node)] = node
+        self._indexed_children[node] = frozenset(id(child) for child in node.getChildren())
+
+    def _isInScene(self, node):
+        while node.getParent() is not None:
+            node = node.getParent()
+        return node is self._root
+
+    def _onBatchUpdateFinished(self, changes):
+        self.sceneChanged.emit(self._root)
+        self.batchUpdateFinished.emit(changes)
+
+    def _findCamera(self, name):
+        for node in BreadthFirstIterator(self._root, filter = lambda node: type(node) is Camera):
+            if node.getName() == name:
                 return node
@@ -2,8 +2,10 @@
 # Uranium is released under the terms of the AGPLv3 or higher.
 
 from UM.Math.Matrix import Matrix
+from UM.Math.ImmutableMatrix import ImmutableMatrix
 from UM.Math.Vector import Vector
 from UM.Math.Quaternion import Quaternion
+from UM.Math.ImmutableQuaternion import ImmutableQuaternion
 from UM.Math.AxisAlignedBox import AxisAlignedBox
 
 from UM.Signal import Signal, signalemitter
@@ -11,6 +13,9 @@ from UM.Mesh.MeshBuilder import MeshBuilder
 from UM.Logger import Logger
 
 from copy import deepcopy
+from collections import OrderedDict
+from contextlib import contextmanager
+import threading
 
 ##  A scene node object.
 #
@@ -28,6 +33,10 @@ class SceneNode():
         Parent = 2
         World = 3
 
+    # State of the batch updates of the current thread: the nesting depth, the
+    # postponed changes and whether they are being emitted.
+    _batch = threading.local()
+
     ##  Construct a scene node.
     #   \param parent The parent of this node (if any). Only a root node should have None as a parent.
     #   \param kwargs Keyword arguments.
@@ -41,22 +50,28 @@ class SceneNode():
         self._mesh_data = None
 
         # Local transformation (from parent to local)
-        self._transformation = Matrix()
+        # Transformations and orientations are immutable, so they can be returned without copying them.
+        self._transformation = ImmutableMatrix()
 
         # Convenience "components" of the transformation
+        # These are only decomposed from the transformation when they are requested, see _updateLocalComponents.
         self._position = Vector()
         self._scale = Vector(1.0, 1.0, 1.0)
         self._shear = Vector(0.0, 0.0, 0.0)
         self._mirror = Vector(1.0, 1.0, 1.0)
-        self._orientation = Quaternion()
+        self._orientation = ImmutableQuaternion()
+        self._local_components_dirty = False
 
         # World transformation (from root to local)
-        self._world_transformation = Matrix()
+        # This is only computed when it is requested, see _updateWorldTransformation.
+        self._world_transformation = ImmutableMatrix()
+        self._world_transformation_dirty = False
 
         # Convenience "components" of the world_transformation
         self._derived_position = Vector()
-        self._derived_orientation = Quaternion()
+        self._derived_orientation = ImmutableQuaternion()
         self._derived_scale = Vector()
+        self._world_components_dirty = False
 
         self._parent = parent
         self._enabled = True  # Can this SceneNode be modified in any way?
@@ -65,14 +80,17 @@ class SceneNode():
         self._calculate_aabb = True  # Should the AxisAlignedBounxingBox be re-calculated?
         self._aabb = None  # The AxisAligned bounding box.
         self._original_aabb = None  # The AxisAligned bounding box, without transformations.
+        self._mesh_aabb = None  # The extents of the own mesh, in world space. Cached separately from the children.
+        self._mesh_original_aabb = None  # The extents of the own mesh, without transformations.
         self._bounding_box_mesh = None
 
         self._visible = kwargs.get("visible", True)
         self._name = kwargs.get("name", "")
         self._decorators = []
+        self._decorations = {} # The bound decoration of every decoration name, see _updateDecorations.
 
         ## Signals
-        self.boundingBoxChanged.connect(self.calculateBoundingBoxMesh)
+        self.boundingBoxChanged.connect(self._onBoundingBoxChanged)
         self.parentChanged.connect(self._onParentChanged)
 
         if parent:
@@ -100,7 +118,7 @@ class SceneNode():
         if self._mesh_data:
             m = Matrix()
             m.setByTranslation(-center)
-            self._mesh_data = self._mesh_data.getTransformed(m).set(center_position=center)
+            self._replaceMeshData(self._mesh_data.getTransformed(m).set(center_position=center))
         for child in self._children:
             child.setCenterPosition(center)
 
@@ -110,11 +128,16 @@ class SceneNode():
         return self._parent
 
     def getMirror(self):
+        self._updateLocalComponents()
         return self._mirror
 
     ##  Get the MeshData of the bounding box
+    #
+    #   The mesh is only calculated when it is requested after the bounding box changed.
     #   \returns \type{MeshData} Bounding box mesh.
     def getBoundingBoxMesh(self):
+        if self._bounding_box_mesh is None:
+            self.calculateBoundingBoxMesh()
         return self._bounding_box_mesh
 
     ##  (re)Calculate the bounding box mesh.
@@ -163,6 +186,13 @@ class SceneNode():
 
             self._bounding_box_mesh = bounding_box_mesh.build()
 
+    ##  Handler for the boundingBoxChanged signal
+    #
+    #   Calculating the bounding box mesh needs the world transformation, so it
+    #   is postponed until someone asks for it.
+    def _onBoundingBoxChanged(self):
+        self._bounding_box_mesh = None
+
     ##  Handler for the ParentChanged signal
     #   \param node Node from which this event was triggered.
     def _onParentChanged(self, node):
@@ -178,7 +208,8 @@ class SceneNode():
     def addDecorator(self, decorator):
         decorator.setNode(self)
         self._decorators.append(decorator)
-        self.decoratorsChanged.emit(self)
+        self._updateDecorations()
+        self._emitChange("decoratorsChanged", self)
 
     ##  Get all SceneNodeDecorators that decorate this SceneNode.
     #   \return list of all SceneNodeDecorators.
@@ -195,7 +226,8 @@ class SceneNode():
     ##  Remove all decorators
     def removeDecorators(self):
         self._decorators = []
-        self.decoratorsChanged.emit(self)
+        self._updateDecorations()
+        self._emitChange("decoratorsChanged", self)
 
     ##  Remove decorator by type.
     #   \param dec_type type of the decorator to remove.
@@ -203,7 +235,8 @@ class SceneNode():
         for decorator in self._decorators:
             if type(decorator) == dec_type:
                 self._decorators.remove(decorator)
-                self.decoratorsChanged.emit(self)
+                self._updateDecorations()
+                self._emitChange("decoratorsChanged", self)
                 break
 
     ##  Call a decoration of this SceneNode.
@@ -212,21 +245,19 @@ class SceneNode():
     #   \param *args
     #   \param **kwargs
     def callDecoration(self, function, *args, **kwargs):
-        for decorator in self._decorators:
-            if hasattr(decorator, function):
-                try:
-                    return getattr(decorator, function)(*args, **kwargs)
-                except Exception as e:
-                    Logger.log("e", "Exception calling decoration %s: %s", str(function), str(e))
-                    return None
+        decoration = self._decorations.get(function)
+        if decoration is None:
+            return None
+        try:
+            return decoration(*args, **kwargs)
+        except Exception as e:
+            Logger.log("e", "Exception calling decoration %s: %s", str(function), str(e))
+            return None
 
     ##  Does this SceneNode have a certain Decoration (as defined by a Decorator)
     #   \param \type{string} function the function to check for.
     def hasDecoration(self, function):
-        for decorator in self._decorators:
-            if hasattr(decorator, function):
-                return True
-        return False
+        return function in self._decorations
 
     def getName(self):
         return self._name
@@ -263,7 +294,15 @@ class SceneNode():
 
     ##  Set the visibility of this SceneNode.
     def setVisible(self, visible):
+        if visible == self._visible:
+            return
+
         self._visible = visible
+        self._emitChange("visibilityChanged", self)
+
+    ##  \brief Emitted whenever the visibility of this object or any child object changes.
+    #   \param object The object that triggered the change.
+    visibilityChanged = Signal()
 
     ##  \brief Get the (original) mesh data from the scene node/object.
     #   \returns MeshData
@@ -278,15 +317,28 @@ class SceneNode():
     ##  \brief Set the mesh of this node/object
     #   \param mesh_data MeshData object
     def setMeshData(self, mesh_data):
-        self._mesh_data = mesh_data
+        self._replaceMeshData(mesh_data)
         self._resetAABB()
-        self.meshDataChanged.emit(self)
+        self._emitChange("meshDataChanged", self)
+
+    ##  Replace the mesh data without emitting a change.
+    #
+    #   This moves the reference of this node from the old mesh to the new one,
+    #   so meshes know which nodes share them.
+    def _replaceMeshData(self, mesh_data):
+        if self._mesh_data is not None:
+            self._mesh_data.removeReference(self)
+        self._mesh_data = mesh_data
+        if self._mesh_data is not None:
+            self._mesh_data.addReference(self)
+        self._mesh_aabb = None
+        self._mesh_original_aabb = None
 
     ##  Emitted whenever the attached mesh data object changes.
     meshDataChanged = Signal()
 
     def _onMeshDataChanged(self):
-        self.meshDataChanged.emit(self)
+        self._emitChange("meshDataChanged", self)
 
     ##  \brief Add a child to this node and set it's parent as this node.
     #   \params scene_node SceneNode to add.
@@ -295,15 +347,16 @@ class SceneNode():
             scene_node.transformationChanged.connect(self.transformationChanged)
             scene_node.childrenChanged.connect(self.childrenChanged)
             scene_node.meshDataChanged.connect(self.meshDataChanged)
+            scene_node.visibilityChanged.connect(self.visibilityChanged)
 
             self._children.append(scene_node)
             self._resetAABB()
-            self.childrenChanged.emit(self)
+            self._emitChange("childrenChanged", self)
 
             if not scene_node._parent is self:
                 scene_node._parent = self
                 scene_node._transformChanged()
-                scene_node.parentChanged.emit(self)
+                scene_node._emitChange("parentChanged", self)
 
     ##  \brief remove a single child
     #   \param child Scene node that needs to be removed.
@@ -314,14 +367,15 @@ class SceneNode():
         child.transformationChanged.disconnect(self.transformationChanged)
         child.childrenChanged.disconnect(self.childrenChanged)
         child.meshDataChanged.disconnect(self.meshDataChanged)
+        child.visibilityChanged.disconnect(self.visibilityChanged)
 
         self._children.remove(child)
         child._parent = None
         child._transformChanged()
-        child.parentChanged.emit(self)
+        child._emitChange("parentChanged", self)
 
         self._resetAABB()
-        self.childrenChanged.emit(self)
+        self._emitChange("childrenChanged", self)
 
     ##  \brief Removes all children and its children's children.
     def removeAllChildren(self):
@@ -329,7 +383,7 @@ class SceneNode():
             child.removeAllChildren()
             self.removeChild(child)
 
-        self.childrenChanged.emit(self)
+        self._emitChange("childrenChanged", self)
 
     ##  \brief Get the list of direct children
     #   \returns List of children
@@ -353,31 +407,34 @@ class SceneNode():
     childrenChanged = Signal()
 
     ##  \brief Computes and returns the transformation from world to local space.
-    #   \returns 4x4 transformation matrix
+    #   \returns \type{ImmutableMatrix} 4x4 transformation matrix. Use copy() to get a matrix that can be modified.
     def getWorldTransformation(self):
-        if self._world_transformation is None:
-            self._updateTransformation()
-
-        return deepcopy(self._world_transformation)
+        self._updateWorldTransformation()
+        return self._world_transformation
 
     ##  \brief Returns the local transformation with respect to its parent. (from parent to local)
-    #   \retuns transformation 4x4 (homogenous) matrix
+    #   \retuns \type{ImmutableMatrix} transformation 4x4 (homogenous) matrix. Use copy() to get a matrix that can be modified.
     def getLocalTransformation(self):
-        if self._transformation is None:
-            self._updateTransformation()
-
-        return deepcopy(self._transformation)
+        return self._transformation
 
+    ##  Set the local transformation.
+    #
+    #   \param transformation \type{Matrix} The new transformation. Later changes to this matrix do not affect the node.
     def setTransformation(self, transformation):
-        self._transformation = transformation
+        self._transformation = ImmutableMatrix.fromMatrix(transformation)
         self._transformChanged()
 
     ##  Get the local orientation value.
+    #   \returns \type{ImmutableQuaternion} Use copy() to get a quaternion that can be modified.
     def getOrientation(self):
-        return deepcopy(self._orientation)
+        self._updateLocalComponents()
+        return self._orientation
 
+    ##  Get the orientation relative to the world.
+    #   \returns \type{ImmutableQuaternion} Use copy() to get a quaternion that can be modified.
     def getWorldOrientation(self):
-        return deepcopy(self._derived_orientation)
+        self._updateWorldComponents()
+        return self._derived_orientation
 
     ##  \brief Rotate the scene object (and thus its children) by given amount
     #
@@ -389,13 +446,15 @@ class SceneNode():
 
         orientation_matrix = rotation.toMatrix()
         if transform_space == SceneNode.TransformSpace.Local:
-            self._transformation.multiply(orientation_matrix)
+            self._transformation = ImmutableMatrix.fromMatrix(self._transformation.multiply(orientation_matrix, copy = True))
         elif transform_space == SceneNode.TransformSpace.Parent:
-            self._transformation.preMultiply(orientation_matrix)
+            self._transformation = ImmutableMatrix.fromMatrix(self._transformation.preMultiply(orientation_matrix, copy = True))
         elif transform_space == SceneNode.TransformSpace.World:
-            self._transformation.multiply(self._world_transformation.getInverse())
-            self._transformation.multiply(orientation_matrix)
-            self._transformation.multiply(self._world_transformation)
+            self._updateWorldTransformation()
+            transformation = self._transformation.multiply(self._world_transformation.getInverse(), copy = True)
+            transformation.multiply(orientation_matrix)
+            transformation.multiply(self._world_transformation)
+            self._transformation = ImmutableMatrix.fromMatrix(transformation)
 
         self._transformChanged()
 
@@ -404,9 +463,10 @@ class SceneNode():
     #   \param orientation \type{Quaternion} The new orientation of this scene node.
     #   \param transform_space The space relative to which to rotate. Can be Local or World from SceneNode::TransformSpace.
     def setOrientation(self, orientation, transform_space = TransformSpace.Local):
-        if not self._enabled or orientation == self._orientation:
+        if not self._enabled or orientation == self.getOrientation():
             return
 
+        self._updateLocalComponents()
         new_transform_matrix = Matrix()
         if transform_space == SceneNode.TransformSpace.Local:
             orientation_matrix = orientation.toMatrix()
@@ -418,14 +478,16 @@ class SceneNode():
         euler_angles = orientation_matrix.getEuler()
 
         new_transform_matrix.compose(scale = self._scale, angles = euler_angles, translate = self._position, shear = self._shear)
-        self._transformation = new_transform_matrix
+        self._transformation = ImmutableMatrix.fromMatrix(new_transform_matrix)
         self._transformChanged()
 
     ##  Get the local scaling value.
     def getScale(self):
+        self._updateLocalComponents()
         return self._scale
 
     def getWorldScale(self):
+        self._updateWorldComponents()
         return self._derived_scale
 
     ##  Scale the scene object (and thus its children) by given amount
@@ -439,13 +501,15 @@ class SceneNode():
         scale_matrix = Matrix()
         scale_matrix.setByScaleVector(scale)
         if transform_space == SceneNode.TransformSpace.Local:
-            self._transformation.multiply(scale_matrix)
+            self._transformation = ImmutableMatrix.fromMatrix(self._transformation.multiply(scale_matrix, copy = True))
         elif transform_space == SceneNode.TransformSpace.Parent:
-            self._transformation.preMultiply(scale_matrix)
+            self._transformation = ImmutableMatrix.fromMatrix(self._transformation.preMultiply(scale_matrix, copy = True))
         elif transform_space == SceneNode.TransformSpace.World:
-            self._transformation.multiply(self._world_transformation.getInverse())
-            self._transformation.multiply(scale_matrix)
-            self._transformation.multiply(self._world_transformation)
+            self._updateWorldTransformation()
+            transformation = self._transformation.multiply(self._world_transformation.getInverse(), copy = True)
+            transformation.multiply(scale_matrix)
+            transformation.multiply(self._world_transformation)
+            self._transformation = ImmutableMatrix.fromMatrix(transformation)
 
         self._transformChanged()
 
@@ -454,7 +518,7 @@ class SceneNode():
     #   \param scale \type{Vector} The new scale value of the scene node.
     #   \param transform_space The space relative to which to rotate. Can be Local or World from SceneNode::TransformSpace.
     def setScale(self, scale, transform_space = TransformSpace.Local):
-        if not self._enabled or scale == self._scale:
+        if not self._enabled or scale == self.getScale():
             return
         if transform_space == SceneNode.TransformSpace.Local:
             self.scale(scale / self._scale, SceneNode.TransformSpace.Local)
@@ -467,10 +531,12 @@ class SceneNode():
 
     ##  Get the local position.
     def getPosition(self):
+        self._updateLocalComponents()
         return self._position
 
     ##  Get the position of this scene node relative to the world.
     def getWorldPosition(self):
+        self._updateWorldComponents()
         return self._derived_position
 
     ##  Translate the scene object (and thus its children) by given amount.
@@ -483,13 +549,15 @@ class SceneNode():
         translation_matrix = Matrix()
         translation_matrix.setByTranslation(translation)
         if transform_space == SceneNode.TransformSpace.Local:
-            self._transformation.multiply(translation_matrix)
+            self._transformation = ImmutableMatrix.fromMatrix(self._transformation.multiply(translation_matrix, copy = True))
         elif transform_space == SceneNode.TransformSpace.Parent:
-            self._transformation.preMultiply(translation_matrix)
+            self._transformation = ImmutableMatrix.fromMatrix(self._transformation.preMultiply(translation_matrix, copy = True))
         elif transform_space == SceneNode.TransformSpace.World:
-            self._transformation.multiply(self._world_transformation.getInverse())
-            self._transformation.multiply(translation_matrix)
-            self._transformation.multiply(self._world_transformation)
+            self._updateWorldTransformation()
+            transformation = self._transformation.multiply(self._world_transformation.getInverse(), copy = True)
+            transformation.multiply(translation_matrix)
+            transformation.multiply(self._world_transformation)
+            self._transformation = ImmutableMatrix.fromMatrix(transformation)
         self._transformChanged()
 
     ##  Set the local position value.
@@ -497,7 +565,7 @@ class SceneNode():
     #   \param position The new position value of the SceneNode.
     #   \param transform_space The space relative to which to rotate. Can be Local or World from SceneNode::TransformSpace.
     def setPosition(self, position, transform_space = TransformSpace.Local):
-        if not self._enabled or position == self._position:
+        if not self._enabled or position == self.getPosition():
             return
         if transform_space == SceneNode.TransformSpace.Local:
             self.translate(position - self._position, SceneNode.TransformSpace.Parent)
@@ -505,9 +573,13 @@ class SceneNode():
             if self.getWorldPosition() == position:
                 return
             print("translating", position - self._derived_position)
-            self.translate(position - self._derived_position, SceneNode.TransformSpace.World)
+            self.translate(position - self.getWorldPosition(), SceneNode.TransformSpace.World)
 
     ##  Signal. Emitted whenever the transformation of this object or any child object changes.
+    #
+    #   It is emitted once for the node of which the transformation was
+    #   changed, not for the descendants that moved along with it.
+    #
     #   \param object The object that caused the change.
     transformationChanged = Signal()
 
@@ -593,66 +665,214 @@ class SceneNode():
     boundingBoxChanged = Signal()
 
     def getShear(self):
+        self._updateLocalComponents()
         return self._shear
 
+    ##  Context manager that postpones the change signals of all scene nodes.
+    #
+    #   Inside the block, the change signals of all scene nodes changed by the
+    #   current thread are collected instead of emitted. At the end of the
+    #   block, every signal is emitted once per node, with the arguments of the
+    #   last time it was raised. After that, batchUpdateFinished is emitted on
+    #   the root of every tree with changes.
+    #
+    #   Batch updates can be nested. The signals are emitted at the end of the
+    #   outermost block.
+    #   \sa Scene.batchUpdate
+    @staticmethod
+    @contextmanager
+    def batchUpdate():
+        batch = SceneNode._batch
+        depth = getattr(batch, "depth", 0)
+        if depth == 0:
+            batch.changes = OrderedDict()
+        batch.depth = depth + 1
+        try:
+            yield
+        finally:
+            batch.depth = depth
+            if depth == 0:
+                changes = batch.changes
+                batch.changes = None
+                SceneNode._emitBatchChanges(changes)
+
+    ##  Check whether the signals postponed by a batch update are being emitted by the current thread.
+    @staticmethod
+    def isEmittingBatchChanges():
+        return getattr(SceneNode._batch, "emitting", False)
+
+    ##  Signal. Emitted on the root of a tree after a batch update changed nodes in that tree.
+    #   \param changes \type{dict} For every changed node, the set of names of the signals it emitted.
+    batchUpdateFinished = Signal()
+
     ##  private:
+    ##  Emit one of the change signals of this node, or collect it if the current thread is in a batch update.
+    #
+    #   \param signal_name The name of the signal.
+    #   \param args The arguments to emit the signal with.
+    def _emitChange(self, signal_name, *args):
+        changes = getattr(SceneNode._batch, "changes", None)
+        if changes is None:
+            getattr(self, signal_name).emit(*args)
+        else:
+            changes[(self, signal_name)] = args
+
+    ##  Rebuild the table of decorations after the decorators changed.
+    #
+    #   This maps the name of every method of every decorator to the bound
+    #   method, so callDecoration and hasDecoration do not need to search all
+    #   decorators. If several decorators have a method with the same name, the
+    #   one that was added first is used.
+    def _updateDecorations(self):
+        decorations = {}
+        for decorator in reversed(self._decorators):
+            decorator_type = type(decorator)
+            for name in dir(decorator_type):
+                if name.startswith("__") or not callable(getattr(decorator_type, name, None)):
+                    continue
+                decorations[name] = getattr(decorator, name)
+        self._decorations = decorations
+
+    ##  Emit the signals collected by a batch update.
+    #
+    #   \param changes \type{OrderedDict} The arguments of every signal, by node and signal name.
+    @staticmethod
+    def _emitBatchChanges(changes):
+        if not changes:
+            return
+
+        SceneNode._batch.emitting = True
+        try:
+            for (node, signal_name), args in changes.items():
+                getattr(node, signal_name).emit(*args)
+        finally:
+            SceneNode._batch.emitting = False
+
+        change_sets = OrderedDict() # The changes of every tree, by root.
+        for node, signal_name in changes:
+            root = node
+            while root._parent:
+                root = root._parent
+            change_sets.setdefault(root, OrderedDict()).setdefault(node, set()).add(signal_name)
+        for root, change_set in change_sets.items():
+            root.batchUpdateFinished.emit(change_set)
+
+    ##  Called when the local transformation of this node changed.
+    #
+    #   Only this node emits transformationChanged, not the descendants that
+    #   move along with it.
     def _transformChanged(self):
-        self._updateTransformation()
+        self._local_components_dirty = True
+        self._worldTransformChanged()
         self._resetAABB()
-        self.transformationChanged.emit(self)
+        self._emitChange("transformationChanged", self)
+
+    ##  Called when the world transformation of this node changed, either
+    #   because its own transformation or that of one of its ancestors changed.
+    #
+    #   This only marks the node and its descendants as out of date. The world
+    #   transformation and the decomposed components are computed again when
+    #   they are requested, so many changes in a row cost only one update.
+    #   A node is only brought up to date after its parent, so the descendants
+    #   of a node that is already out of date are out of date as well, and the
+    #   walk down the tree stops there.
+    #
+    #   The bounding boxes in the subtree are out of date as well. Only the
+    #   node that moved emits boundingBoxChanged, see _resetAABB.
+    def _worldTransformChanged(self):
+        self._world_transformation_dirty = True
+        self._world_components_dirty = True
+        self._mesh_aabb = None
+        self._aabb = None
+        self._original_aabb = None
+        self._bounding_box_mesh = None
 
         for child in self._children:
-            child._transformChanged()
+            if not child._world_transformation_dirty:
+                child._worldTransformChanged()
+
+    ##  Decompose the local transformation into position, scale, shear, mirror and orientation, if it changed.
+    def _updateLocalComponents(self):
+        if not self._local_components_dirty:
+            return
+        self._local_components_dirty = False
 
-    def _updateTransformation(self):
         scale, shear, euler_angles, translation, mirror = self._transformation.decompose()
         self._position = translation
         self._scale = scale
         self._shear = shear
         self._mirror = mirror
-        orientation = Quaternion()
         euler_angle_matrix = Matrix()
         euler_angle_matrix.setByEuler(euler_angles.x, euler_angles.y, euler_angles.z)
-        orientation.setByMatrix(euler_angle_matrix)
-        self._orientation = orientation
+        self._orientation = ImmutableQuaternion.fromQuaternion(Quaternion.fromMatrix(euler_angle_matrix))
+
+    ##  Compute the world transformation from the parent's world transformation, if it changed.
+    def _updateWorldTransformation(self):
+        if not self._world_transformation_dirty:
+            return
+        self._world_transformation_dirty = False
+
         if self._parent:
-            self._world_transformation = self._parent.getWorldTransformation().multiply(self._transformation, copy = True)
+            self._parent._updateWorldTransformation()
+            self._world_transformation = ImmutableMatrix.fromMatrix(self._parent._world_transformation.multiply(self._transformation, copy = True))
         else:
             self._world_transformation = self._transformation
 
+    ##  Decompose the world transformation into position, scale and orientation, if it changed.
+    def _updateWorldComponents(self):
+        if not self._world_components_dirty:
+            return
+        self._world_components_dirty = False
+
+        self._updateWorldTransformation()
         world_scale, world_shear, world_euler_angles, world_translation, world_mirror = self._world_transformation.decompose()
         self._derived_position = world_translation
         self._derived_scale = world_scale
 
         world_euler_angle_matrix = Matrix()
         world_euler_angle_matrix.setByEuler(world_euler_angles.x, world_euler_angles.y, world_euler_angles.z)
-        self._derived_orientation.setByMatrix(world_euler_angle_matrix)
+        self._derived_orientation = ImmutableQuaternion.fromQuaternion(Quaternion.fromMatrix(world_euler_angle_matrix))
 
+    ##  Mark the bounding box of this node and of its ancestors as out of date.
+    #
+    #   boundingBoxChanged is emitted for all of them, whether or not their
+    #   bounding box was computed. It goes through _emitChange, so during a
+    #   batch update every node emits it only once for the whole batch.
     def _resetAABB(self):
         if not self._calculate_aabb:
             return
         self._aabb = None
-        if self.getParent():
-            self.getParent()._resetAABB()
-        self.boundingBoxChanged.emit()
+        self._original_aabb = None
+        if self._parent:
+            self._parent._resetAABB()
+        self._emitChange("boundingBoxChanged")
 
+    ##  Merge the extents of the own mesh with the bounding boxes of the children.
+    #
+    #   The extents of the mesh are cached until the mesh or the world
+    #   transformation changes, and children that did not change still have
+    #   their bounding box, so only the changed path through the tree is
+    #   computed again.
     def _calculateAABB(self):
-        aabb = None
-        original_aabb = None
         if self._mesh_data:
-            aabb = self._mesh_data.getExtents(self.getWorldTransformation())
-            original_aabb = self._mesh_data.getExtents()
+            if self._mesh_aabb is None:
+                self._mesh_aabb = self._mesh_data.getExtents(self.getWorldTransformation())
+            if self._mesh_original_aabb is None:
+                self._mesh_original_aabb = self._mesh_data.getExtents()
+            aabb = self._mesh_aabb
+            original_aabb = self._mesh_original_aabb
         else: # If there is no mesh_data, use a boundingbox that encompasses the local (0,0,0)
             position = self.getWorldPosition()
             aabb = AxisAlignedBox(minimum = position, maximum = position)
-            original_aabb = AxisAlignedBox(minimum = position, maximum = position)
+            original_aabb = aabb
 
-        for child in self._children:
+        if self._children:
+            boxes = [child.getBoundingBox() for child in self._children]
+            original_boxes = [child.getOriginalBoundingBox() for child in self._children]
             if aabb is None:
-                aabb = child.getBoundingBox()
-                original_aabb = child.getOriginalBoundingBox()
-            else:
-                aabb = aabb + child.getBoundingBox()
-                original_aabb = original_aabb + child.getOriginalBoundingBox()
+                aabb, boxes = boxes[0], boxes[1:]
+                original_aabb, original_boxes = original_boxes[0], original_boxes[1:]
+            aabb = aabb.combine(boxes)
+            original_aabb = original_aabb.combine(original_boxes)
         self._aabb = aabb
         self._original_aabb = original_aabb
@@ -0,0 +1,160 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+
+##  An immutable copy of the state of some scene nodes.
+#
+#   A snapshot records the subtrees of a list of nodes as they were when the
+#   snapshot was taken, so a background job can read it without holding the
+#   scene lock while the scene keeps changing. This is cheap, since the
+#   transformations and the mesh data of scene nodes are immutable objects that
+#   are referenced instead of copied.
+#
+#   The parents of the nodes the snapshot was taken of are recorded too, up to
+#   the root of the scene, so code that looks at the parent of a node, such as
+#   to find out whether it is in a group, can also do that for those nodes.
+#   These parents only have the recorded nodes as children.
+#
+#   Use Scene.createSnapshot() to take a snapshot while holding the read lock.
+class SceneSnapshot:
+    ##  The decorations that are recorded when no others are given.
+    #
+    #   Besides whether a node is a group, this records the setting stack of
+    #   the node, for writers that save per-object settings. The stack itself
+    #   is referenced, not copied.
+    DefaultDecorations = ("isGroup", "getStack")
+
+    ##  Take a snapshot of the subtrees of a list of nodes.
+    #
+    #   \param nodes \type{list} The nodes to take a snapshot of, including all their descendants.
+    #   \param decorations \type{tuple} Names of decorations without arguments
+    #   to call on every node and record the results of.
+    def __init__(self, nodes, decorations = DefaultDecorations):
+        self._nodes = {} # The snapshot of every node, by node.
+        self._ancestors = {} # The snapshot of every parent of a root that is not in the snapshot itself, by node.
+        self._roots = tuple(self._recordRoot(node, decorations) for node in nodes)
+
+    ##  Get the snapshots of the nodes the snapshot was taken of.
+    def getRoots(self):
+        return self._roots
+
+    ##  Get the snapshots of all nodes in the snapshot.
+    def getNodes(self):
+        return list(self._nodes.values())
+
+    ##  Get the snapshot of a node.
+    #
+    #   \param node \type{SceneNode} The node as it is in the scene.
+    #   \return \type{SceneNodeSnapshot} The state of the node when the
+    #   snapshot was taken, or None if the node was not in the snapshot.
+    def getSnapshotOf(self, node):
+        return self._nodes.get(node)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    ##  private:
+    def _recordRoot(self, node, decorations):
+        parent = self._recordAncestor(node.getParent(), decorations)
+        snapshot = self._record(node, parent, decorations)
+        if parent is not None and self._ancestors.get(parent.getNode()) is parent:
+            parent._children += (snapshot, )
+        return snapshot
+
+    def _recordAncestor(self, node, decorations):
+        if node is None:
+            return None
+        if node in self._nodes:
+            return self._nodes[node]
+        if node not in self._ancestors:
+            parent = self._recordAncestor(node.getParent(), decorations)
+            self._ancestors[node] = SceneNodeSnapshot(node, parent, decorations)
+        return self._ancestors[node]
+
+    def _record(self, node, parent, decorations):
+        snapshot = SceneNodeSnapshot(node, parent, decorations)
+        self._nodes[node] = snapshot
+        snapshot._children = tuple(self._record(child, snapshot, decorations) for child in node.getChildren())
+        return snapshot
+
+
+##  The state of a single scene node in a SceneSnapshot.
+#
+#   This has the same functions as SceneNode for reading the state of the node,
+#   so it can be passed to code that only reads nodes, such as mesh writers.
+class SceneNodeSnapshot:
+    __slots__ = ("_node", "_node_type", "_name", "_visible", "_transformation", "_world_transformation", "_mesh_data", "_decorations", "_parent", "_children")
+
+    def __init__(self, node, parent, decorations):
+        self._node = node
+        self._node_type = type(node)
+        self._name = node.getName()
+        self._visible = node.isVisible()
+        self._transformation = node.getLocalTransformation()
+        self._world_transformation = node.getWorldTransformation()
+        self._mesh_data = node.getMeshData()
+        self._decorations = {decoration: node.callDecoration(decoration) for decoration in decorations}
+        self._parent = parent
+        self._children = ()
+
+    ##  Get the node in the scene that this is a snapshot of.
+    #
+    #   The node may have changed since the snapshot was taken.
+    def getNode(self):
+        return self._node
+
+    ##  Get the type of the node, such as SceneNode or Camera.
+    def getNodeType(self):
+        return self._node_type
+
+    def getName(self):
+        return self._name
+
+    def isVisible(self):
+        return self._visible
+
+    ##  \returns \type{ImmutableMatrix}
+    def getLocalTransformation(self):
+        return self._transformation
+
+    ##  \returns \type{ImmutableMatrix}
+    def getWorldTransformation(self):
+        return self._world_transformation
+
+    def getWorldPosition(self):
+        return self._world_transformation.getTranslation()
+
+    def getMeshData(self):
+        return self._mesh_data
+
+    ##  Get the snapshot of the parent, or None if the node had no parent.
+    def getParent(self):
+        return self._parent
+
+    def getChildren(self):
+        return self._children
+
+    def hasChildren(self):
+        return len(self._children) > 0
+
+    def getAllChildren(self):
+        children = []
+        for child in self._children:
+            children.append(child)
+            children.extend(child.getAllChildren())
+        return children
+
+    def getDepth(self):
+        if self._parent is None:
+            return 0
+        return self._parent.getDepth() + 1
+
+    ##  Get the result of a decoration when the snapshot was taken.
+    #
+    #   Only the decorations that were given when taking the snapshot are
+    #   recorded. Like SceneNode.callDecoration, None is returned for others.
+    def callDecoration(self, function):
+        return self._decorations.get(function)
+
+    def __repr__(self):
+        return "SceneNodeSnapshot({0})".format(self._name)
@@ -14,6 +14,12 @@ class DefaultPass(RenderPass):
 
         self._renderer = Application.getInstance().getRenderer()
 
+    ##  Overridden from RenderPass.
+    #
+    #   Only the scene is rendered, so the output stays valid until it changes.
+    def canReuseOutput(self):
+        return True
+
     def render(self):
         self.bind()
 
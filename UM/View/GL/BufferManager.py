@@ -0,0 +1,211 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+from collections import OrderedDict, deque
+import itertools
+import weakref
+
+from UM.Logger import Logger
+
+
+##  Keeps track of the GPU buffers that are created for meshes.
+#
+#   Buffers are cached by mesh identity and type, so every mesh is only
+#   uploaded once. The manager keeps count of the memory used by the buffers
+#   and when that goes over the budget, the buffers that were drawn least
+#   recently are destroyed. They are created again if the mesh is drawn later.
+#   Buffers used in the current frame are never evicted, so the budget may be
+#   exceeded when a single frame needs more memory.
+#
+#   When a mesh is garbage collected, its buffers are destroyed at the start of
+#   the next frame. Garbage collection can happen on any thread, while buffers
+#   can only be destroyed on the thread that renders. Buffers that also depend
+#   on another object, such as vertex array objects that depend on a shader,
+#   can use a buffer type of that object, see getOwnedBufferType(). Those are
+#   destroyed in the same way when the object is garbage collected.
+#
+#   All functions except getStatistics() should be called from the thread that
+#   renders. Buffer objects should have a destroy() function that frees their
+#   GPU memory.
+class BufferManager:
+    ##  The default memory budget, in bytes.
+    DefaultBudget = 512 * 1024 * 1024
+
+    ##  Create a buffer manager.
+    #
+    #   \param budget The number of bytes the buffers may use before the least
+    #   recently used ones are evicted.
+    def __init__(self, budget = DefaultBudget):
+        self._budget = budget
+
+        self._entries = OrderedDict() # (mesh id, buffer type) -> _BufferEntry, from least to most recently used.
+        self._buffer_types = set()
+        self._tracked_meshes = weakref.WeakSet() # Meshes with a finalizer that reports when they are deleted.
+        self._deleted_meshes = deque() # Ids of meshes that were garbage collected. Appended to from any thread.
+        self._owner_serials = weakref.WeakKeyDictionary() # The serial of every object that owns buffer types.
+        self._next_serials = itertools.count(1)
+        self._owned_buffer_types = {} # The buffer types of every object that owns buffer types, by serial.
+        self._deleted_owners = deque() # Serials of owners that were garbage collected. Appended to from any thread.
+
+        self._frame = 0
+        self._memory_usage = 0
+        self._upload_count = 0
+        self._upload_bytes = 0
+        self._eviction_count = 0
+
+    ##  Get the cached buffer for a mesh, creating it if needed.
+    #
+    #   \param mesh The mesh to get the buffer for.
+    #   \param buffer_type A key that identifies the kind of buffer, such as "vertex" or "index".
+    #   \param create_function A function that creates the buffer for a mesh,
+    #   returning a tuple of the buffer and its size in bytes.
+    #   \param force_recreate If True, a new buffer is created even if one is cached.
+    #   \return The buffer.
+    def getBuffer(self, mesh, buffer_type, create_function, force_recreate = False):
+        key = (id(mesh), buffer_type)
+        entry = self._entries.get(key)
+        if entry is not None:
+            # The id of a deleted mesh may have been reused before its buffers were released.
+            if not force_recreate and entry.mesh() is mesh:
+                entry.frame = self._frame
+                self._entries.move_to_end(key)
+                return entry.buffer
+            self._destroy(self._removeEntry(key))
+
+        buffer, size = create_function(mesh)
+
+        self._entries[key] = _BufferEntry(mesh, buffer, size, self._frame)
+        self._buffer_types.add(buffer_type)
+        self._memory_usage += size
+        self._upload_count += 1
+        self._upload_bytes += size
+        if mesh not in self._tracked_meshes:
+            self._tracked_meshes.add(mesh)
+            weakref.finalize(mesh, self._deleted_meshes.append, id(mesh))
+
+        self._evict()
+        return buffer
+
+    ##  Get a buffer type for buffers that also depend on another object.
+    #
+    #   The buffer type is unique to the object for as long as it lives, unlike
+    #   its id, which can be reused. When the object is garbage collected, all
+    #   buffers of the type are destroyed at the start of the next frame.
+    #
+    #   \param owner The object the buffers depend on, such as a shader.
+    #   \param name The kind of buffer, such as "vertex_array".
+    #   \return A buffer type to pass to getBuffer().
+    def getOwnedBufferType(self, owner, name):
+        serial = self._owner_serials.get(owner)
+        if serial is None:
+            serial = next(self._next_serials)
+            self._owner_serials[owner] = serial
+            weakref.finalize(owner, self._deleted_owners.append, serial)
+
+        buffer_type = (name, serial)
+        self._owned_buffer_types.setdefault(serial, set()).add(buffer_type)
+        return buffer_type
+
+    ##  Destroy all buffers of a mesh.
+    def releaseBuffers(self, mesh):
+        for buffer_type in self._buffer_types:
+            key = (id(mesh), buffer_type)
+            if key in self._entries and self._entries[key].mesh() is mesh:
+                self._destroy(self._removeEntry(key))
+
+    ##  Destroy all buffers.
+    def clear(self):
+        for key in list(self._entries.keys()):
+            self._destroy(self._removeEntry(key))
+
+    ##  Destroy all buffers of a type, for all meshes.
+    def releaseBufferType(self, buffer_type):
+        for key in [key for key in self._entries if key[1] == buffer_type]:
+            self._destroy(self._removeEntry(key))
+        self._buffer_types.discard(buffer_type)
+
+    ##  Start a new frame.
+    #
+    #   This destroys the buffers of meshes and of owners of buffer types that
+    #   were garbage collected. It should be called by the renderer at the
+    #   start of every frame.
+    def nextFrame(self):
+        self._frame += 1
+
+        while self._deleted_owners:
+            serial = self._deleted_owners.popleft()
+            for buffer_type in self._owned_buffer_types.pop(serial, ()):
+                self.releaseBufferType(buffer_type)
+
+        while self._deleted_meshes:
+            mesh_id = self._deleted_meshes.popleft()
+            for buffer_type in self._buffer_types:
+                key = (mesh_id, buffer_type)
+                if key in self._entries and self._entries[key].mesh() is None:
+                    self._destroy(self._removeEntry(key))
+
+    ##  Get the number of bytes the buffers may use.
+    def getBudget(self):
+        return self._budget
+
+    ##  Set the number of bytes the buffers may use.
+    #
+    #   When this is less than the current use, buffers are evicted right away.
+    def setBudget(self, budget):
+        self._budget = budget
+        self._evict()
+
+    ##  Get the number of bytes used by the buffers.
+    def getMemoryUsage(self):
+        return self._memory_usage
+
+    ##  Get statistics of the managed buffers.
+    #
+    #   \return A dict with the number of buffers ("buffers"), the bytes they
+    #   use ("memory_usage") and the budget ("budget"). It also has the total
+    #   number of buffers uploaded ("uploads"), the total number of bytes
+    #   uploaded ("upload_bytes") and the total number of buffers evicted
+    #   ("evictions").
+    def getStatistics(self):
+        return {
+            "buffers": len(self._entries),
+            "memory_usage": self._memory_usage,
+            "budget": self._budget,
+            "uploads": self._upload_count,
+            "upload_bytes": self._upload_bytes,
+            "evictions": self._eviction_count
+        }
+
+    ##  private:
+
+    #   Destroy buffers that were not used in this frame, least recently used
+    #   first, until the memory use is within budget.
+    def _evict(self):
+        while self._memory_usage > self._budget and self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.frame == self._frame:
+                break # All other buffers were used in this frame too.
+            self._destroy(self._removeEntry(key))
+            self._eviction_count += 1
+
+    def _removeEntry(self, key):
+        entry = self._entries.pop(key)
+        self._memory_usage -= entry.size
+        return entry.buffer
+
+    def _destroy(self, buffer):
+        try:
+            buffer.destroy()
+        except Exception as e:
+            Logger.log("w", "Failed to destroy buffer: %s", e)
+
+
+##  A buffer in the cache of the BufferManager.
+class _BufferEntry:
+    __slots__ = ("mesh", "buffer", "size", "frame")
+
+    def __init__(self, mesh, buffer, size, frame):
+        self.mesh = weakref.ref(mesh)
+        self.buffer = buffer
+        self.size = size
+        self.frame = frame # The frame in which the buffer was last used.
@@ -24,3 +24,14 @@ class FrameBufferObject:
     ##  Get the contents of the FBO as an image data object.
     def getContents(self):
         raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Get the pixel data of a region of the FBO.
+    #
+    #   \param x The column of the left of the region.
+    #   \param y The row of the top of the region, counted from the top.
+    #   \param width The width of the region.
+    #   \param height The height of the region.
+    #   \return A numpy array of unsigned bytes with shape (height, width, 4),
+    #   containing the RGBA values of the pixels. The top row is first.
+    def getContentsRegion(self, x, y, width, height):
+        raise NotImplementedError("Should be reimplemented by subclasses")
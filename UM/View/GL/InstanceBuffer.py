@@ -0,0 +1,55 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+##  An interface for a buffer with the data of every instance of a mesh.
+#
+#   The attributes of a shader that read from this buffer advance once per
+#   instance instead of once per vertex, so all instances of a mesh can be
+#   drawn with a single draw call. The buffer is filled with a row of data for
+#   every instance, such as its model matrix, right before drawing.
+class InstanceBuffer:
+    def __init__(self):
+        pass
+
+    ##  Replace the contents of the buffer.
+    #
+    #   \param data A two-dimensional numpy array of 32 bit floats, with a row per instance.
+    def setData(self, data):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Set up an attribute of a shader to read from the buffer, once per instance.
+    #
+    #   \param shader \type{ShaderProgram} The shader to set up the attribute of. It must be bound.
+    #   \param name The name of the attribute.
+    #   \param type The type of the attribute, like for ShaderProgram.enableAttribute().
+    #   \param offset The offset of the attribute in a row, in bytes.
+    def enableAttribute(self, shader, name, type, offset):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Disable all attributes that were enabled with enableAttribute().
+    #
+    #   \param shader \type{ShaderProgram} The shader the attributes were enabled for.
+    def disableAttributes(self, shader):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Draw instances of the vertices in the bound vertex buffer.
+    #
+    #   \param mode The OpenGL primitive mode.
+    #   \param first The first vertex to draw.
+    #   \param count The number of vertices to draw.
+    #   \param instance_count The number of instances to draw.
+    def drawArrays(self, mode, first, count, instance_count):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Draw instances of the elements in the bound index buffer.
+    #
+    #   \param mode The OpenGL primitive mode.
+    #   \param count The number of indices to draw, starting at the first.
+    #   \param type The OpenGL type of the indices.
+    #   \param instance_count The number of instances to draw.
+    def drawElements(self, mode, count, type, instance_count):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Free the buffer. It should not be used afterwards.
+    def destroy(self):
+        raise NotImplementedError("Should be reimplemented by subclasses")
@@ -9,9 +9,6 @@
 #   handling. The implementation-defined subclass must be set as singleton instance as soon
 #   as possible so that any calls to getInstance() return a proper object.
 class OpenGL:
-    VertexBufferProperty = "__vertex_buffer"
-    IndexBufferProperty = "__index_buffer"
-
     ##  Different OpenGL chipset vendors.
     class Vendor:
         NVidia = 1
@@ -72,14 +69,25 @@ class OpenGL:
     def createShaderProgram(self, file_name):
         raise NotImplementedError("Should be implemented by subclasses")
 
+    ##  Get the manager of the buffers created for meshes.
+    #
+    #   \return \type{BufferManager}
+    def getBufferManager(self):
+        raise NotImplementedError("Should be implemented by subclasses")
+
     ##  Create a Vertex buffer for a mesh.
     #
     #   This will create a vertex buffer object that is filled with the
-    #   vertex data of the mesh.
+    #   vertex data of the mesh, interleaved as described by VertexLayout.
     #
-    #   By default, the associated vertex buffer should be cached using a
-    #   custom property on the mesh. This should use the VertexBufferProperty
-    #   property name.
+    #   \note The attributes used to be stored one after the other, all
+    #   vertices first, then all normals and so on. Code that sets up
+    #   attributes with offsets into that layout should use
+    #   VertexLayout.fromMesh(mesh).enableAttributes(shader) instead, which
+    #   uses the interleaved offsets and stride.
+    #
+    #   By default, the vertex buffer should be cached by the buffer manager,
+    #   which also accounts for the memory it uses.
     #
     #   \param mesh The mesh to create a vertex buffer for.
     #   \param kwargs Keyword arguments.
@@ -93,9 +101,8 @@ class OpenGL:
     #   This will create an index buffer object that is filled with the
     #   index data of the mesh.
     #
-    #   By default, the associated index buffer should be cached using a
-    #   custom property on the mesh. This should use the IndexBufferProperty
-    #   property name.
+    #   By default, the index buffer should be cached by the buffer manager,
+    #   which also accounts for the memory it uses.
     #
     #   \param mesh The mesh to create an index buffer for.
     #   \param kwargs Keyword arguments.
@@ -104,6 +111,41 @@ class OpenGL:
     def createIndexBuffer(self, mesh, **kwargs):
         raise NotImplementedError("Should be implemented by subclasses")
 
+    ##  Create a Vertex Array Object to draw a mesh with a shader.
+    #
+    #   The VAO binds the vertex and index buffers of the mesh and sets up the
+    #   attributes of the shader to read from the vertex buffer. Like the
+    #   buffers, it should be cached by the buffer manager, per mesh and shader.
+    #
+    #   \param mesh The mesh to create a VAO for.
+    #   \param shader The shader to set up the attributes of.
+    #   \param kwargs Keyword arguments.
+    #                 Possible values:
+    #                 - force_recreate: Ignore the cached value if set and always create a new VAO.
+    #   \return An implementation-specific VertexArrayObject subclass, or None
+    #   if VAOs are not supported. In that case, the buffers should be bound and
+    #   the attributes set up for every draw.
+    def createVertexArrayObject(self, mesh, shader, **kwargs):
+        return None
+
+    ##  Get the buffer to draw instances of a mesh with.
+    #
+    #   The buffer is shared, and filled with the data of the instances right
+    #   before each draw.
+    #
+    #   \return An implementation-specific InstanceBuffer subclass, or None if
+    #   instanced arrays are not supported. In that case, every instance should
+    #   be drawn separately.
+    def getInstanceBuffer(self):
+        return None
+
+    ##  Create a timer query, to measure the time the GPU spends on rendering.
+    #
+    #   \return An implementation-specific TimerQuery subclass, or None if timer
+    #   queries are not supported.
+    def createTimerQuery(self):
+        return None
+
     ##  Get the singleton instance.
     #
     #   \return The singleton instance.
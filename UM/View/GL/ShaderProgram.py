@@ -3,6 +3,7 @@
 
 import configparser
 import ast
+from collections import OrderedDict
 
 ##  Raised when an error occurs during loading of the shader file.
 class InvalidShaderProgramError(Exception):
@@ -16,9 +17,17 @@ class InvalidShaderProgramError(Exception):
 #   for the different shader program stages, in addition to defaults that should
 #   be used for uniform values and uniform and attribute bindings.
 class ShaderProgram:
+    ##  The bindings of the matrices that differ per rendered item.
+    #
+    #   Attributes bound to these are read per instance, so a shader that
+    #   declares its model matrices as attributes can draw all items that share
+    #   a mesh with one draw call.
+    InstanceBindings = ("model_matrix", "normal_matrix", "model_view_matrix", "model_view_projection_matrix")
+
     def __init__(self):
         self._bindings = {}
         self._attribute_bindings = {}
+        self._instance_attributes = OrderedDict()
 
     ##  Load a shader program file.
     #
@@ -83,7 +92,8 @@ class ShaderProgram:
     #   is not currently bound, the next call to bind() will update the uniform values.
     #
     #   \param name The name of the uniform variable.
-    #   \param value The value to set the variable to.
+    #   \param value The value to set the variable to. Matrices can also be
+    #   given as a 4x4 numpy array in row-major order.
     #   \param kwargs Keyword arguments.
     #                 Possible keywords:
     #                 - cache: False when the value should not be cached for later calls to bind().
@@ -108,6 +118,17 @@ class ShaderProgram:
     def enableAttribute(self, name, type, offset, stride = 0):
         raise NotImplementedError("Should be reimplemented by subclasses")
 
+    ##  Set the value of an attribute that is not read from a buffer.
+    #
+    #   This is used for attributes that are the same for every vertex drawn,
+    #   like the model matrix of an item when it is not drawn as an instance.
+    #
+    #   \param name The name of the attribute.
+    #   \param value The value of the attribute. Matrices are given as a 4x4
+    #   numpy array in row-major order.
+    def setAttributeValue(self, name, value):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
     ##  Disable a vertex attribute so it is no longer used.
     #
     #   \param name The name of the attribute to use.
@@ -161,7 +182,9 @@ class ShaderProgram:
     #   Attribute bindings are similar to uniform value bindings, except they specify what
     #   what attribute name binds to which attribute in the shader.
     #
-    #   TODO: Actually use these bindings. However, that kind of depends on a more freeform
+    #   Attributes bound to one of the InstanceBindings are read per instance.
+    #
+    #   TODO: Actually use the other bindings. However, that kind of depends on a more freeform
     #   MeshData object as freeform bindings are rather useless when we only have 5 supported
     #   attributes.
     #
@@ -169,6 +192,8 @@ class ShaderProgram:
     #   \param value The name to bind to this attribute.
     def addAttributeBinding(self, key, value):
         self._attribute_bindings[key] = value
+        if value in self.InstanceBindings:
+            self._instance_attributes[key] = value
 
     ##  Remove an attribute binding.
     #
@@ -177,4 +202,16 @@ class ShaderProgram:
         if key not in self._attribute_bindings:
             return
 
-        self._attribute_bindings.remove(key)
+        del self._attribute_bindings[key]
+        self._instance_attributes.pop(key, None)
+
+    ##  Get the attributes that are bound to the matrices of the rendered items.
+    #
+    #   The shader reads these matrices as 4x4 matrix attributes instead of
+    #   uniforms, one per instance.
+    #
+    #   \return An OrderedDict of binding names, by attribute name.
+    #
+    #   \sa InstanceBindings
+    def getInstanceAttributes(self):
+        return self._instance_attributes
@@ -0,0 +1,36 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+##  An interface for OpenGL timer queries.
+#
+#   A timer query measures the time the GPU spends on the commands issued
+#   between begin() and end(). The result only becomes available once the GPU
+#   has finished those commands, which is usually a few frames later. Timer
+#   queries can not be nested.
+class TimerQuery:
+    def __init__(self):
+        pass
+
+    ##  Start measuring.
+    def begin(self):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Stop measuring.
+    def end(self):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Check whether the result of the last measurement is available.
+    def isResultAvailable(self):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Get the result of the last measurement.
+    #
+    #   This waits for the result if it is not available yet.
+    #
+    #   \return The measured time, in seconds.
+    def getResult(self):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Free the query. The context it was created in must be current.
+    def destroy(self):
+        raise NotImplementedError("Should be reimplemented by subclasses")
@@ -0,0 +1,32 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+##  An interface for OpenGL Vertex Array Objects.
+#
+#   A Vertex Array Object stores the buffers and shader attributes that are
+#   used to draw a mesh, so drawing the mesh only needs to bind the Vertex
+#   Array Object instead of binding every buffer and setting up every
+#   attribute. It is only valid for the shader it was created for.
+class VertexArrayObject:
+    def __init__(self):
+        pass
+
+    ##  Get the vertex buffer that the attributes read from.
+    def getVertexBuffer(self):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Get the index buffer that is bound, or None if the mesh has no indices.
+    def getIndexBuffer(self):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Bind the VAO, so its buffers and attributes are used to draw.
+    def bind(self):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Release the VAO.
+    def release(self):
+        raise NotImplementedError("Should be reimplemented by subclasses")
+
+    ##  Free the VAO. It should not be used afterwards.
+    def destroy(self):
+        raise NotImplementedError("Should be reimplemented by subclasses")
@@ -0,0 +1,107 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import numpy
+
+
+##  Describes how the data of a mesh is stored in a vertex buffer.
+#
+#   The attributes of every vertex are interleaved: the position, normal, color
+#   and UV coordinates of a vertex are stored next to each other. Only the
+#   attributes the mesh has are stored. The data is built with a single
+#   structured numpy array, so each attribute is copied only once.
+#
+#   Meshes with the same attributes share a layout, see fromMesh().
+class VertexLayout:
+    ##  The attributes that can be stored, in order.
+    #
+    #   Each attribute is a tuple of its field name in the data, the name of
+    #   the shader attribute, the shader attribute type and the number of
+    #   components.
+    Attributes = (
+        ("vertex", "a_vertex", "vector3f", 3),
+        ("normal", "a_normal", "vector3f", 3),
+        ("color", "a_color", "vector4f", 4),
+        ("uv", "a_uvs", "vector2f", 2)
+    )
+
+    ##  Create a layout.
+    #
+    #   \param has_normals Whether the normals are stored.
+    #   \param has_colors Whether the colors are stored.
+    #   \param has_uvs Whether the UV coordinates are stored.
+    def __init__(self, has_normals = False, has_colors = False, has_uvs = False):
+        present = {"vertex": True, "normal": has_normals, "color": has_colors, "uv": has_uvs}
+        self._attributes = [attribute for attribute in self.Attributes if present[attribute[0]]]
+        self._dtype = numpy.dtype([(field, numpy.float32, (components, )) for field, _, _, components in self._attributes])
+
+    ##  Get the layout for the data of a mesh.
+    #
+    #   \param mesh \type{MeshData} The mesh to get the layout for.
+    #   \return \type{VertexLayout} A layout that is shared by all meshes with the same attributes.
+    @classmethod
+    def fromMesh(cls, mesh):
+        key = (mesh.hasNormals(), mesh.hasColors(), mesh.hasUVCoordinates())
+        layout = cls._layouts.get(key)
+        if layout is None:
+            layout = cls(*key)
+            cls._layouts[key] = layout
+        return layout
+
+    ##  Get the numpy data type of a single vertex.
+    def getDtype(self):
+        return self._dtype
+
+    ##  Get the number of bytes between the starts of two vertices.
+    def getStride(self):
+        return self._dtype.itemsize
+
+    ##  Get the offset of an attribute in a vertex.
+    #
+    #   \param field The field name of the attribute, such as "normal".
+    #   \return The offset in bytes, or None if the attribute is not stored.
+    def getOffset(self, field):
+        if field not in self._dtype.fields:
+            return None
+        return self._dtype.fields[field][1]
+
+    ##  Get the names of the shader attributes that are stored.
+    def getAttributeNames(self):
+        return [name for _, name, _, _ in self._attributes]
+
+    ##  Create the interleaved data of a mesh.
+    #
+    #   \param mesh \type{MeshData} A mesh with the attributes of this layout.
+    #   \return A structured numpy array with one element per vertex.
+    def createData(self, mesh):
+        data = numpy.empty(mesh.getVertexCount(), dtype = self._dtype)
+        if len(data) == 0:
+            return data
+
+        data["vertex"] = mesh.getVertices()
+        if "normal" in self._dtype.fields:
+            data["normal"] = mesh.getNormals()
+        if "color" in self._dtype.fields:
+            data["color"] = mesh.getColors()
+        if "uv" in self._dtype.fields:
+            data["uv"] = mesh.getUVCoordinates()
+        return data
+
+    ##  Set up the attributes of a shader to read from a bound buffer with this layout.
+    #
+    #   \param shader \type{ShaderProgram} The shader to set up.
+    def enableAttributes(self, shader):
+        stride = self.getStride()
+        for field, name, attribute_type, _ in self._attributes:
+            shader.enableAttribute(name, attribute_type, self.getOffset(field), stride)
+
+    ##  Disable the attributes that were enabled by enableAttributes().
+    def disableAttributes(self, shader):
+        for name in self.getAttributeNames():
+            shader.disableAttribute(name)
+
+    def __repr__(self):
+        return "VertexLayout({0})".format(", ".join(self._dtype.names))
+
+    ## private:
+    _layouts = {}
@@ -1,16 +1,18 @@
 # Copyright (c) 2015 Ultimaker B.V.
 # Uranium is released under the terms of the AGPLv3 or higher.
 
-import copy
+
+from collections import OrderedDict
+
+import numpy
 
 from UM.Logger import Logger
 
 from UM.Math.Vector import Vector
+from UM.Math.MatrixArray import MatrixArray
 
 from UM.View.GL.OpenGL import OpenGL
-
-vertexBufferProperty = "__gl_vertex_buffer"
-indexBufferProperty = "__gl_index_buffer"
+from UM.View.GL.VertexLayout import VertexLayout
 
 
 ##  The RenderBatch class represent a batch of objects that should be rendered.
@@ -20,6 +22,15 @@ indexBufferProperty = "__gl_index_buffer"
 #   individual objects. This means that for example the ShaderProgram used is
 #   only bound once, at the start of rendering. There are a few values, like
 #   the model-view-projection matrix that are updated for each object.
+#
+#   Items that share a mesh are drawn as instances of that mesh. The vertex and
+#   index buffers of the mesh are bound and its attributes set up once, after
+#   which only the per-instance matrices change between draws. When Vertex
+#   Array Objects are supported, this only binds the cached VAO of the mesh. The matrices of
+#   all items are computed at once at the start of rendering, so drawing an
+#   item only uploads them. If the shader reads the matrices as attributes
+#   (see ShaderProgram.InstanceBindings) and instanced arrays are supported,
+#   all items that share a mesh are drawn with a single draw call.
 class RenderBatch():
     ##  The type of render batch.
     #
@@ -62,6 +73,7 @@ class RenderBatch():
     #                                         This can be used to do additional alterations to the state that can not be done otherwise.
     #                                         The callback is passed the OpenGL bindings object as first and only parameter.
     #                 - state_teardown_callback: A callback similar to state_setup_callback, but called after everything was rendered, to handle cleaning up state changes made in state_setup_callback.
+    #                 - statistics: The RenderStatistics to add the draw calls, triangles and shader binds of this batch to. Defaults to None, which records nothing.
     def __init__(self, shader, **kwargs):
         self._shader = shader
         self._render_type = kwargs.get("type", self.RenderType.Solid)
@@ -74,12 +86,22 @@ class RenderBatch():
             self._blend_mode = self.BlendMode.NoBlending if self._render_type == self.RenderType.Solid else self.BlendMode.Normal
         self._state_setup_callback = kwargs.get("state_setup_callback", None)
         self._state_teardown_callback = kwargs.get("state_teardown_callback", None)
+        self._statistics = kwargs.get("statistics", None)
         self._items = []
+        self._instances = OrderedDict() # The items to render, grouped by mesh.
 
         self._view_matrix = None
         self._projection_matrix = None
         self._view_projection_matrix = None
 
+        # The matrices of the items, in the order in which the items are rendered.
+        self._model_matrices = None
+        self._model_view_matrices = None
+        self._model_view_projection_matrices = None
+        self._normal_matrices = None
+
+        self._draw_calls = 0
+
         self._gl = OpenGL.getInstance().getBindingsObject()
 
     ##  The RenderType for this batch.
@@ -146,7 +168,16 @@ class RenderBatch():
             Logger.log("w", "Tried to add an item to batch without mesh")
             return
 
-        self._items.append({ "transformation": transformation, "mesh": mesh, "uniforms": uniforms})
+        item = { "transformation": transformation, "mesh": mesh, "uniforms": uniforms}
+        self._items.append(item)
+        self._instances.setdefault(mesh, []).append(item)
+
+    ##  The items to render, grouped by the mesh they share.
+    #
+    #   \return An OrderedDict of lists of items, by mesh.
+    @property
+    def instances(self):
+        return self._instances
 
     ##  Render the batch.
     #
@@ -192,79 +223,168 @@ class RenderBatch():
             light_0_position = camera.getWorldPosition() + Vector(0, 50, 0)
         )
 
-        for item in self._items:
-            self._renderItem(item)
+        self._updateItemMatrices()
+
+        self._draw_calls = 0
+        start = 0
+        for mesh, items in self._instances.items():
+            self._renderInstances(mesh, items, start)
+            start += len(items)
 
         if self._state_teardown_callback:
             self._state_teardown_callback(self._gl)
 
         self._shader.release()
 
-    def _renderItem(self, item):
-        transformation = item["transformation"]
-        mesh = item["mesh"]
+        if self._statistics is not None:
+            self._statistics.shader_binds += 1
+            self._statistics.draw_calls += self._draw_calls
+            self._statistics.triangles += sum(self._getTriangleCount(mesh) * len(items) for mesh, items in self._instances.items())
 
-        normal_matrix = None
-        if mesh.hasNormals():
-            normal_matrix = copy.deepcopy(transformation)
-            normal_matrix.setRow(3, [0, 0, 0, 1])
-            normal_matrix.setColumn(3, [0, 0, 0, 1])
-            normal_matrix = normal_matrix.getInverse().getTransposed()
+    ##  Compute the matrices of all items for the current camera.
+    #
+    #   This is done for all items at once, in the order in which they are
+    #   rendered, so rendering an item only needs to upload its matrices.
+    def _updateItemMatrices(self):
+        transformations = MatrixArray.fromMatrices([item["transformation"] for items in self._instances.values() for item in items])
+        self._model_matrices = transformations.getData()
+        self._model_view_matrices = transformations.preMultiply(self._view_matrix, copy = True).getData()
+        self._model_view_projection_matrices = transformations.preMultiply(self._view_projection_matrix, copy = True).getData()
+
+        # The normal matrix is the inverse transpose of the transformation without translation.
+        normal_matrices = self._model_matrices.copy()
+        normal_matrices[:, 3, :] = (0, 0, 0, 1)
+        normal_matrices[:, :, 3] = (0, 0, 0, 1)
+        self._normal_matrices = MatrixArray(normal_matrices).getInverse().getTransposed().getData()
+
+    ##  Render all items that share a mesh.
+    #
+    #   When the shader reads the matrices of the items as attributes and
+    #   instanced arrays are supported, the items are drawn with one draw call.
+    #   Otherwise every item is drawn separately.
+    #
+    #   \param mesh The mesh shared by the items.
+    #   \param items The items to render with the mesh.
+    #   \param start The index of the matrices of the first item.
+    def _renderInstances(self, mesh, items, start):
+        vertex_array = OpenGL.getInstance().createVertexArrayObject(mesh, self._shader)
+        if vertex_array is not None:
+            vertex_array.bind()
+        else:
+            vertex_buffer = OpenGL.getInstance().createVertexBuffer(mesh)
+            vertex_buffer.bind()
 
-        model_view_matrix = copy.deepcopy(transformation).preMultiply(self._view_matrix)
-        model_view_projection_matrix = copy.deepcopy(transformation).preMultiply(self._view_projection_matrix)
+            index_buffer = OpenGL.getInstance().createIndexBuffer(mesh)
+            if index_buffer is not None:
+                index_buffer.bind()
 
-        self._shader.updateBindings(
-            model_matrix = transformation,
-            normal_matrix = normal_matrix,
-            model_view_matrix = model_view_matrix,
-            model_view_projection_matrix = model_view_projection_matrix
-        )
+            layout = VertexLayout.fromMesh(mesh)
+            layout.enableAttributes(self._shader)
 
-        if item["uniforms"] is not None:
-            self._shader.updateBindings(**item["uniforms"])
+        instance_attributes = self._shader.getInstanceAttributes()
+        instance_buffer = None
+        if instance_attributes and len(items) > 1 and all(item["uniforms"] is None for item in items):
+            instance_buffer = OpenGL.getInstance().getInstanceBuffer()
 
-        vertex_buffer = OpenGL.getInstance().createVertexBuffer(mesh)
-        vertex_buffer.bind()
+        if instance_buffer is not None:
+            self._drawInstances(mesh, instance_buffer, instance_attributes, start, len(items))
+        else:
+            matrices = self._getItemMatrices(mesh)
+            for index, item in enumerate(items, start):
+                self._shader.updateBindings(**{binding: item_matrices[index] if item_matrices is not None else None for binding, item_matrices in matrices.items()})
+                for name, binding in instance_attributes.items():
+                    if matrices[binding] is not None:
+                        self._shader.setAttributeValue(name, matrices[binding][index])
+
+                if item["uniforms"] is not None:
+                    self._shader.updateBindings(**item["uniforms"])
 
-        index_buffer = OpenGL.getInstance().createIndexBuffer(mesh)
-        if index_buffer is not None:
-            index_buffer.bind()
+                self._draw(mesh)
+
+        if vertex_array is not None:
+            vertex_array.release()
+        else:
+            layout.disableAttributes(self._shader)
+            vertex_buffer.release()
 
-        self._shader.enableAttribute("a_vertex", "vector3f", 0)
-        offset = mesh.getVertexCount() * 3 * 4
+            if index_buffer is not None:
+                index_buffer.release()
 
-        if mesh.hasNormals():
-            self._shader.enableAttribute("a_normal", "vector3f", offset)
-            offset += mesh.getVertexCount() * 3 * 4
+    ##  Draw items that share a mesh with one draw call.
+    #
+    #   The matrices of the items are uploaded to the instance buffer, a row of
+    #   column-major matrices per item, and read by the instance attributes of
+    #   the shader.
+    #
+    #   \param mesh The mesh shared by the items, of which the buffers are bound.
+    #   \param instance_buffer \type{InstanceBuffer} The buffer to upload the matrices to.
+    #   \param instance_attributes The binding names of the instance attributes, by attribute name.
+    #   \param start The index of the matrices of the first item.
+    #   \param count The number of items.
+    def _drawInstances(self, mesh, instance_buffer, instance_attributes, start, count):
+        matrices = self._getItemMatrices(mesh)
+        columns = []
+        for binding in instance_attributes.values():
+            item_matrices = matrices[binding] if matrices[binding] is not None else self._model_matrices
+            columns.append(item_matrices[start:start + count].transpose(0, 2, 1).reshape(count, 16))
+        instance_buffer.setData(numpy.ascontiguousarray(numpy.concatenate(columns, axis = 1), dtype = numpy.float32))
+
+        for column, name in enumerate(instance_attributes):
+            instance_buffer.enableAttribute(self._shader, name, "matrix4f", column * 64) # 16 floats per matrix.
+
+        self._draw(mesh, instance_buffer, count)
+
+        instance_buffer.disableAttributes(self._shader)
+
+    ##  Get the matrices of all items, by binding name.
+    #
+    #   \param mesh The mesh to draw with the matrices. Normal matrices are only used for meshes with normals.
+    def _getItemMatrices(self, mesh):
+        return {
+            "model_matrix": self._model_matrices,
+            "normal_matrix": self._normal_matrices if mesh.hasNormals() else None,
+            "model_view_matrix": self._model_view_matrices,
+            "model_view_projection_matrix": self._model_view_projection_matrices
+        }
+
+    ##  Get the number of triangles drawn for a mesh.
+    def _getTriangleCount(self, mesh):
+        if self._render_mode != self.RenderMode.Triangles:
+            return 0
 
-        if mesh.hasColors():
-            self._shader.enableAttribute("a_color", "vector4f", offset)
-            offset += mesh.getVertexCount() * 4 * 4
+        if mesh.hasIndices():
+            if self._render_range is None:
+                return mesh.getFaceCount()
+            return (self._render_range[1] - self._render_range[0]) // 3
+        return mesh.getVertexCount() // 3
 
-        if mesh.hasUVCoordinates():
-            self._shader.enableAttribute("a_uvs", "vector2f", offset)
-            offset += mesh.getVertexCount() * 2 * 4
+    ##  Draw a mesh of which the buffers are bound.
+    #
+    #   \param mesh The mesh to draw.
+    #   \param instance_buffer \type{InstanceBuffer} The buffer with the instance attributes, if drawing instances.
+    #   \param instance_count The number of instances to draw.
+    def _draw(self, mesh, instance_buffer = None, instance_count = 1):
+        self._draw_calls += 1
 
         if mesh.hasIndices():
             if self._render_range is None:
                 if self._render_mode == self.RenderMode.Triangles:
-                    self._gl.glDrawElements(self._render_mode, mesh.getFaceCount() * 3 , self._gl.GL_UNSIGNED_INT, None)
+                    count = mesh.getFaceCount() * 3
+                else:
+                    count = mesh.getFaceCount()
+
+                if instance_buffer is not None:
+                    instance_buffer.drawElements(self._render_mode, count, self._gl.GL_UNSIGNED_INT, instance_count)
                 else:
-                    self._gl.glDrawElements(self._render_mode, mesh.getFaceCount(), self._gl.GL_UNSIGNED_INT, None)
+                    self._gl.glDrawElements(self._render_mode, count, self._gl.GL_UNSIGNED_INT, None)
             else:
-                if self._render_mode == self.RenderMode.Triangles:
-                    self._gl.glDrawRangeElements(self._render_mode, self._render_range[0], self._render_range[1], self._render_range[1] - self._render_range[0], self._gl.GL_UNSIGNED_INT, None)
+                count = self._render_range[1] - self._render_range[0]
+                if instance_buffer is not None:
+                    instance_buffer.drawElements(self._render_mode, count, self._gl.GL_UNSIGNED_INT, instance_count)
                 else:
-                    self._gl.glDrawRangeElements(self._render_mode, self._render_range[0], self._render_range[1], self._render_range[1] - self._render_range[0], self._gl.GL_UNSIGNED_INT, None)
+                    self._gl.glDrawRangeElements(self._render_mode, self._render_range[0], self._render_range[1], count, self._gl.GL_UNSIGNED_INT, None)
         else:
-            self._gl.glDrawArrays(self._render_mode, 0, mesh.getVertexCount())
-
-        self._shader.disableAttribute("a_vertex")
-        self._shader.disableAttribute("a_normal")
-        self._shader.disableAttribute("a_color")
-        self._shader.disableAttribute("a_uvs")
-        vertex_buffer.release()
-
-        if index_buffer is not None:
-            index_buffer.release()
+            if instance_buffer is not None:
+                instance_buffer.drawArrays(self._render_mode, 0, mesh.getVertexCount(), instance_count)
+            else:
+                self._gl.glDrawArrays(self._render_mode, 0, mesh.getVertexCount())
@@ -12,10 +12,10 @@ from UM.View.GL.OpenGL import OpenGL
 #   step in the rendering process.
 #
 #   \note While the render pass could technically support render to
-#   texture without using Framebuffer Objects, the PyQt bindings object
-#   lacks support for any function like glReadPixels. Therefore, the
-#   Qt OpenGL initialization code checks for FBO support and aborts the
-#   program if no support is found.
+#   texture without using Framebuffer Objects, the output of render passes
+#   is read back from their Framebuffer Object. Therefore, the Qt OpenGL
+#   initialization code checks for FBO support and aborts the program if
+#   no support is found.
 class RenderPass:
     ##  The maximum priority of a render pass. Priority should always be
     #   less than this.
@@ -71,7 +71,10 @@ class RenderPass:
     #
     #   \note It is very important to call release() after a call to
     #   bind(), once done with rendering.
-    def bind(self):
+    #
+    #   \param clear Whether to clear the contents. Other passes that draw on
+    #   top of the output of this pass can bind it without clearing.
+    def bind(self, clear = True):
         if self._fbo:
             self._fbo.bind()
 
@@ -79,7 +82,8 @@ class RenderPass:
             self._gl.glColorMask(self._gl.GL_TRUE, self._gl.GL_TRUE,self._gl.GL_TRUE, self._gl.GL_TRUE)
             self._gl.glDepthMask(self._gl.GL_TRUE)
 
-            self._gl.glClear(self._gl.GL_COLOR_BUFFER_BIT | self._gl.GL_DEPTH_BUFFER_BIT)
+            if clear:
+                self._gl.glClear(self._gl.GL_COLOR_BUFFER_BIT | self._gl.GL_DEPTH_BUFFER_BIT)
 
     ##  Release the render pass.
     #
@@ -100,6 +104,19 @@ class RenderPass:
     def render(self):
         raise NotImplementedError("Should be implemented by subclasses")
 
+    ##  Check whether the output of this render pass can be reused when nothing changed.
+    #
+    #   The renderer skips rendering these passes for frames in which nothing
+    #   changed, since their render target still has the output of the last
+    #   frame. Only passes that render nothing but the scene to their own frame
+    #   buffer object should return True. Passes that render to the window, or
+    #   that depend on anything besides the scene, the selection and the
+    #   camera, must be rendered every frame.
+    #
+    #   \return \type{bool} False by default.
+    def canReuseOutput(self):
+        return False
+
     ##  Get the texture ID of this render pass so it can be reused by other passes.
     #
     #   \return \type{int} The OpenGL texture ID used by this pass.
@@ -115,6 +132,20 @@ class RenderPass:
     def getOutput(self):
         return self._fbo.getContents()
 
+    ##  Get the pixel data of a region of the output of this render pass.
+    #
+    #   This only reads back the pixels in the region, which is much cheaper
+    #   than getOutput() when only a few pixels are needed.
+    #
+    #   \param x The column of the left of the region.
+    #   \param y The row of the top of the region, counted from the top.
+    #   \param width The width of the region.
+    #   \param height The height of the region.
+    #   \return A numpy array of unsigned bytes with shape (height, width, 4),
+    #   containing the RGBA values of the pixels. The top row is first.
+    def getOutputRegion(self, x, y, width, height):
+        return self._fbo.getContentsRegion(x, y, width, height)
+
     ## private:
 
     def _updateRenderStorage(self):
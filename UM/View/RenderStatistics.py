@@ -0,0 +1,32 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+from collections import OrderedDict
+
+
+##  Counts of the work done by the renderer for a frame.
+#
+#   The counts of nodes and batches are always kept. The other counts and the
+#   timings are only recorded when the renderer records statistics, see
+#   QtRenderer.setStatisticsEnabled(). While a frame is recorded, its
+#   statistics are available through Renderer.getRecordingStatistics(), and
+#   passed to the render batches of that renderer so they can add to them.
+class RenderStatistics:
+    def __init__(self):
+        self.queued_nodes = 0 # Number of nodes queued for rendering.
+        self.culled_nodes = 0 # Number of queued nodes that were not rendered because they were outside the view.
+        self.batches = 0 # Number of render batches the rendered nodes were put in.
+
+        self.draw_calls = 0 # Number of draw calls made by render batches.
+        self.triangles = 0 # Number of triangles submitted by render batches.
+        self.shader_binds = 0 # Number of times a render batch bound its shader.
+        self.buffer_uploads = 0 # Number of buffers uploaded to the GPU.
+        self.upload_bytes = 0 # Number of bytes uploaded to the GPU.
+
+        self.frame_time = 0.0 # CPU time spent on the frame, in seconds.
+        self.pass_times = OrderedDict() # CPU time spent on every render pass, by name, in seconds.
+        self.pass_gpu_times = {} # GPU time spent on every render pass, by name, in seconds. Filled in a few frames later, when available.
+
+    def __repr__(self):
+        return "RenderStatistics(queued_nodes = {0}, culled_nodes = {1}, batches = {2}, draw_calls = {3}, triangles = {4}, frame_time = {5:.3f}ms)".format(
+            self.queued_nodes, self.culled_nodes, self.batches, self.draw_calls, self.triangles, self.frame_time * 1000)
@@ -35,7 +35,9 @@ class Renderer():
     #   \param kwargs Keyword arguments.
     #                 Most of these are passed to the RenderBatch constructor directly. See RenderBatch for all available options.
     #                 In addition, the parameter "shader" is available, which determines the shader to render with. When not specified,
-    #                 it defaults to a simple vertex color shader.
+    #                 it defaults to a simple vertex color shader. The parameters "mesh" and "uniforms" set the mesh to render
+    #                 instead of the mesh of the node and additional uniform values for this node only.
+    #                 Nodes queued with the same parameters may be rendered together in a single batch.
     def queueNode(self, node, **kwargs):
         raise NotImplementedError()
 
@@ -47,6 +49,15 @@ class Renderer():
     def endRendering(self):
         raise NotImplementedError()
 
+    ##  Get the statistics of the frame that is being rendered, if they are recorded.
+    #
+    #   Render passes that create their own render batches should pass these
+    #   to them, so the work of the batches is counted for this renderer.
+    #
+    #   \return \type{RenderStatistics} The statistics, or None if they are not recorded.
+    def getRecordingStatistics(self):
+        return None
+
     ##  Add a render pass that should be rendered.
     #
     #   \param render_pass The render pass to add.
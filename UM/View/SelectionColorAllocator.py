@@ -0,0 +1,107 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import heapq
+
+from UM.Math.Color import Color
+
+
+##  Assigns unique colors to objects, so they can be identified in a selection buffer.
+#
+#   Every object gets a code of 24 bits, which is stored in the red, green and
+#   blue channels of its color. Codes are handed out in order, starting at 1,
+#   so 0 stays free for the background. The code of an object is kept until it
+#   is freed, after which the code is reused by the next object. The smallest
+#   free code is always used first, so the same objects in the same order
+#   always get the same colors.
+#
+#   Decoding a color uses a list indexed by code, so it takes constant time.
+class SelectionColorAllocator:
+    ##  The largest code that fits in a color.
+    MaximumCode = 0xffffff
+
+    ##  Create an allocator.
+    #
+    #   \param reserved_codes Codes that are never handed out, such as the
+    #   codes of colors that are used for other purposes.
+    def __init__(self, reserved_codes = ()):
+        self._reserved_codes = set(reserved_codes)
+        self._codes = {} # The code of every object, by object id.
+        self._ids = [None] # The object id of every code, by code. Code 0 is never used.
+        self._free_codes = [] # A heap of the codes below the next code that were freed.
+        self._next_code = 1
+
+    ##  Get the code of an object, allocating one if it does not have one yet.
+    #
+    #   \param object_id The id of the object.
+    #   \return The code of the object.
+    def allocate(self, object_id):
+        code = self._codes.get(object_id)
+        if code is not None:
+            return code
+
+        if self._free_codes:
+            code = heapq.heappop(self._free_codes)
+        else:
+            while self._next_code in self._reserved_codes:
+                self._ids.append(None)
+                self._next_code += 1
+            if self._next_code > self.MaximumCode:
+                raise OverflowError("All selection colors are in use")
+            code = self._next_code
+            self._ids.append(None)
+            self._next_code += 1
+
+        self._codes[object_id] = code
+        self._ids[code] = object_id
+        return code
+
+    ##  Free the code of an object, so it can be used for another object.
+    #
+    #   \param object_id The id of the object.
+    def free(self, object_id):
+        code = self._codes.pop(object_id, None)
+        if code is None:
+            return
+
+        self._ids[code] = None
+        heapq.heappush(self._free_codes, code)
+
+    ##  Get the code of an object.
+    #
+    #   \return The code, or None if the object has no code.
+    def getCode(self, object_id):
+        return self._codes.get(object_id)
+
+    ##  Get the object with a code.
+    #
+    #   \return The id of the object, or None if no object has the code.
+    def getId(self, code):
+        if 0 <= code < len(self._ids):
+            return self._ids[code]
+        return None
+
+    ##  Get the ids of all objects that have a code.
+    def getIds(self):
+        return list(self._codes.keys())
+
+    def __len__(self):
+        return len(self._codes)
+
+    ##  Get the color that encodes a code.
+    #
+    #   \param code The code to encode.
+    #   \param alpha The alpha value of the color, from 0 to 255.
+    #   \return \type{Color}
+    @staticmethod
+    def codeToColor(code, alpha = 255):
+        return Color((code >> 16) & 0xff, (code >> 8) & 0xff, code & 0xff, alpha)
+
+    ##  Get the code encoded in the red, green and blue values of a color.
+    #
+    #   \param r The red value, from 0 to 255.
+    #   \param g The green value, from 0 to 255.
+    #   \param b The blue value, from 0 to 255.
+    @staticmethod
+    def colorToCode(r, g, b):
+        return (int(r) << 16) | (int(g) << 8) | int(b)
@@ -1,19 +1,16 @@
 # Copyright (c) 2015 Ultimaker B.V.
 # Uranium is released under the terms of the AGPLv3 or higher.
 
-import random
-
 from UM.Resources import Resources
 from UM.Application import Application
 
-from UM.Math.Color import Color
-
 from UM.Scene.Selection import Selection
 from UM.Scene.ToolHandle import ToolHandle
 from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
 
 from UM.View.RenderPass import RenderPass
 from UM.View.RenderBatch import RenderBatch
+from UM.View.SelectionColorAllocator import SelectionColorAllocator
 from UM.View.GL.OpenGL import OpenGL
 
 
@@ -34,36 +31,68 @@ class SelectionPass(RenderPass):
 
         self._renderer = Application.getInstance().getRenderer()
 
-        self._selection_map = {}
+        # The tool handle axes by the code of their color. The disabled color is rendered as either 0x7f7f7f or 0x808080.
+        self._tool_handle_codes = {
+            0x7f7f7f: ToolHandle.NoAxis,
+            self._colorToCode(ToolHandle.DisabledColor): ToolHandle.NoAxis,
+            self._colorToCode(ToolHandle.XAxisColor): ToolHandle.XAxis,
+            self._colorToCode(ToolHandle.YAxisColor): ToolHandle.YAxis,
+            self._colorToCode(ToolHandle.ZAxisColor): ToolHandle.ZAxis,
+            self._colorToCode(ToolHandle.AllAxisColor): ToolHandle.AllAxis
+        }
+        self._color_allocator = SelectionColorAllocator(reserved_codes = self._tool_handle_codes.keys())
         self._output = None
 
+        self._invalidated = True # Whether the scene changed since the selection buffer was rendered.
+        self._rendered_state = None # The camera, its matrices and the size of the pass when the selection buffer was rendered.
+
+        self._scene.sceneChanged.connect(self._onSceneChanged)
+        Selection.selectionChanged.connect(self._onSceneChanged)
+
+    ##  Mark the selection buffer as outdated, so it is rendered again in the next frame.
+    def invalidate(self):
+        self._invalidated = True
+
+    ##  Overridden from RenderPass.
+    #
+    #   The selection buffer only depends on the scene, the selection and the camera.
+    def canReuseOutput(self):
+        return True
+
     ##  Perform the actual rendering.
+    #
+    #   The selection buffer is only rendered again when the scene, the
+    #   selection or the camera changed since it was last rendered. Otherwise
+    #   the previous contents are still correct.
     def render(self):
-        self._selection_map = {
-            self._dropAlpha(ToolHandle.DisabledColor): ToolHandle.NoAxis,
-            self._dropAlpha(ToolHandle.XAxisColor): ToolHandle.XAxis,
-            self._dropAlpha(ToolHandle.YAxisColor): ToolHandle.YAxis,
-            self._dropAlpha(ToolHandle.ZAxisColor): ToolHandle.ZAxis,
-            self._dropAlpha(ToolHandle.AllAxisColor): ToolHandle.AllAxis,
-            ToolHandle.DisabledColor: ToolHandle.NoAxis,
-            ToolHandle.XAxisColor: ToolHandle.XAxis,
-            ToolHandle.YAxisColor: ToolHandle.YAxis,
-            ToolHandle.ZAxisColor: ToolHandle.ZAxis,
-            ToolHandle.AllAxisColor: ToolHandle.AllAxis
-        }
-
-        batch = RenderBatch(self._shader)
-        tool_handle = RenderBatch(self._tool_handle_shader, type = RenderBatch.RenderType.Overlay)
+        camera = self._scene.getActiveCamera()
+        state = (camera, camera.getWorldTransformation(), camera.getProjectionMatrix()) if camera else None
+        state = (state, self._width, self._height)
+        if not self._invalidated and state == self._rendered_state:
+            return
+        self._invalidated = False
+        self._rendered_state = state
+
+        statistics = self._renderer.getRecordingStatistics()
+        batch = RenderBatch(self._shader, statistics = statistics)
+        tool_handle = RenderBatch(self._tool_handle_shader, type = RenderBatch.RenderType.Overlay, statistics = statistics)
         selectable_objects = False
-        for node in DepthFirstIterator(self._scene.getRoot()):
+        rendered_ids = set()
+        for node in DepthFirstIterator(self._scene.getRoot(), prune = lambda node: not node.isVisible()): # Hidden objects can not be selected.
             if isinstance(node, ToolHandle):
                 tool_handle.addItem(node.getWorldTransformation(), mesh = node.getSelectionMesh())
                 continue
 
             if node.isSelectable() and node.getMeshData():
                 selectable_objects = True
+                rendered_ids.add(id(node))
                 batch.addItem(transformation = node.getWorldTransformation(), mesh = node.getMeshData(), uniforms = { "selection_color": self._getNodeColor(node)})
 
+        # Free the colors of nodes that were removed, so they can be reused.
+        for node_id in self._color_allocator.getIds():
+            if node_id not in rendered_ids:
+                self._color_allocator.free(node_id)
+
         self.bind()
         if selectable_objects:
             batch.render(self._scene.getActiveCamera())
@@ -79,38 +108,37 @@ class SelectionPass(RenderPass):
         self.release()
 
     ##  Get the object id at a certain pixel coordinate.
+    #
+    #   Only the pixel at the position is read back from the selection buffer.
     def getIdAtPosition(self, x, y):
-        output = self.getOutput()
-
         window_size = self._renderer.getWindowSize()
 
-        px = (0.5 + x / 2.0) * window_size[0]
-        py = (0.5 + y / 2.0) * window_size[1]
+        px = int((0.5 + x / 2.0) * window_size[0])
+        py = int((0.5 + y / 2.0) * window_size[1])
 
-        if px < 0 or px > (output.width() - 1) or py < 0 or py > (output.height() - 1):
+        if px < 0 or px > (self._width - 1) or py < 0 or py > (self._height - 1):
             return None
 
-        pixel = output.pixel(px, py)
-        return self._selection_map.get(Color.fromARGB(pixel), None)
-
+        pixel = self.getOutputRegion(px, py, 1, 1)[0, 0]
+        code = SelectionColorAllocator.colorToCode(pixel[0], pixel[1], pixel[2])
+        if code in self._tool_handle_codes:
+            return self._tool_handle_codes[code]
+        return self._color_allocator.getId(code)
 
+    ##  Get the color to render a node with.
+    #
+    #   The red, green and blue values encode the node. The alpha value is
+    #   used by the composite pass to draw an outline around selected nodes.
     def _getNodeColor(self, node):
-        while True:
-            r = random.randint(0, 255)
-            g = random.randint(0, 255)
-            b = random.randint(0, 255)
-            a = 255 if Selection.isSelected(node) or self._isInSelectedGroup(node) else 0
-            color = Color(r, g, b, a)
-
-            if color not in self._selection_map:
-                break
-
-        self._selection_map[color] = id(node)
+        code = self._color_allocator.allocate(id(node))
+        alpha = 255 if Selection.isSelected(node) or self._isInSelectedGroup(node) else 0
+        return SelectionColorAllocator.codeToColor(code, alpha)
 
-        return color
+    def _colorToCode(self, color):
+        return SelectionColorAllocator.colorToCode(round(color.r * 255), round(color.g * 255), round(color.b * 255))
 
-    def _dropAlpha(self, color):
-        return Color(color.r, color.g, color.b, 0.0)
+    def _onSceneChanged(self, *args):
+        self._invalidated = True
 
     ##  Get the top root group for a node
     #
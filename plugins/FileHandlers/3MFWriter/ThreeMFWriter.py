@@ -29,6 +29,10 @@ class ThreeMFWriter(MeshWriter):
 
         self._unit_matrix_string = self._convertMatrixToString(Matrix())
 
+    ##  Overrides MeshWriter::acceptsSnapshots()
+    def acceptsSnapshots(self):
+        return True
+
     def _convertMatrixToString(self, matrix):
         result = ""
         result += str(matrix._data[0,0]) + " "
@@ -177,7 +181,7 @@ class ThreeMFWriter(MeshWriter):
                 if node.getParent().callDecoration("isGroup") is None:
                     node_matrix = node.getLocalTransformation()
 
-                    ET.SubElement(build, "item", objectid = str(added_nodes.index(node) + 1), transform = self._convertMatrixToString(node_matrix.preMultiply(transformation_matrix)))
+                    ET.SubElement(build, "item", objectid = str(added_nodes.index(node) + 1), transform = self._convertMatrixToString(node_matrix.preMultiply(transformation_matrix, copy = True)))
 
             archive.writestr(model_file, b'<?xml version="1.0" encoding="UTF-8"?> \n' + ET.tostring(model))
             archive.writestr(content_types_file, b'<?xml version="1.0" encoding="UTF-8"?> \n' + ET.tostring(content_types))
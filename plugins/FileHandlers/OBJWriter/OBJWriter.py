@@ -10,6 +10,10 @@ import time
 import struct
 
 class OBJWriter(MeshWriter):
+    ##  Overrides MeshWriter::acceptsSnapshots()
+    def acceptsSnapshots(self):
+        return True
+
     ##  Writes the specified nodes to a stream in the OBJ format.
     #
     #   \param stream The stream to write the OBJ data to.
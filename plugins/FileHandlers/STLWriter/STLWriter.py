@@ -12,6 +12,10 @@ import struct
 import os
 
 class STLWriter(MeshWriter):
+    ##  Overrides MeshWriter::acceptsSnapshots()
+    def acceptsSnapshots(self):
+        return True
+
     ##  Write the specified sequence of nodes to a stream in the STL format.
     #
     #   \param stream The output stream to write to.
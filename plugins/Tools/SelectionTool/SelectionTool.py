@@ -106,39 +106,41 @@ class SelectionTool(Tool):
             return
 
         # Find the scene-node which matches the node-id
-        for node in BreadthFirstIterator(self._scene.getRoot()):
-            if id(node) == item_id:
-                if self._isNodeInGroup(node):
-                    is_selected = Selection.isSelected(self._findTopGroupNode(node))
-                else:
-                    is_selected = Selection.isSelected(node)
-                if self._shift_is_active:
-                    if is_selected:
-                        # Deselect the scenenode and its sibblings in a group
-                        if node.getParent():
-                            if self._ctrl_is_active or not self._isNodeInGroup(node):
-                                Selection.remove(node)
-                            else:
-                                Selection.remove(self._findTopGroupNode(node))
+        node = self._scene.findObject(item_id)
+        if node is None:
+            return
+
+        if self._isNodeInGroup(node):
+            is_selected = Selection.isSelected(self._findTopGroupNode(node))
+        else:
+            is_selected = Selection.isSelected(node)
+        if self._shift_is_active:
+            if is_selected:
+                # Deselect the scenenode and its sibblings in a group
+                if node.getParent():
+                    if self._ctrl_is_active or not self._isNodeInGroup(node):
+                        Selection.remove(node)
                     else:
-                        # Select the scenenode and its sibblings in a group
-                        if node.getParent():
-                            if self._ctrl_is_active or not self._isNodeInGroup(node):
-                                Selection.add(node)
-                            else:
-                                Selection.add(self._findTopGroupNode(node))
-                else:
-                    if not is_selected or Selection.getCount() > 1:
-                        # Select only the scenenode and its sibblings in a group
-                        Selection.clear()
-                        if node.getParent():
-                            if self._ctrl_is_active or not self._isNodeInGroup(node):
-                                Selection.add(node)
-                            else:
-                                Selection.add(self._findTopGroupNode(node))
-                    elif self._isNodeInGroup(node) and self._ctrl_is_active:
-                        Selection.clear()
+                        Selection.remove(self._findTopGroupNode(node))
+            else:
+                # Select the scenenode and its sibblings in a group
+                if node.getParent():
+                    if self._ctrl_is_active or not self._isNodeInGroup(node):
                         Selection.add(node)
+                    else:
+                        Selection.add(self._findTopGroupNode(node))
+        else:
+            if not is_selected or Selection.getCount() > 1:
+                # Select only the scenenode and its sibblings in a group
+                Selection.clear()
+                if node.getParent():
+                    if self._ctrl_is_active or not self._isNodeInGroup(node):
+                        Selection.add(node)
+                    else:
+                        Selection.add(self._findTopGroupNode(node))
+            elif self._isNodeInGroup(node) and self._ctrl_is_active:
+                Selection.clear()
+                Selection.add(node)
 
     ##  Check whether a node is in a group
     #
@@ -0,0 +1,147 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import numpy
+
+from PyQt5.QtGui import QOpenGLBuffer
+
+from UM.Resources import Resources
+
+from UM.Math.Color import Color
+from UM.Math.Matrix import Matrix
+
+from UM.View.RenderPass import RenderPass
+from UM.View.GL.OpenGL import OpenGL
+from UM.View.GL.VertexLayout import VertexLayout
+
+##  Draws a graph of the render statistics of recent frames on top of the window.
+#
+#   Every frame is a bar, stacked from the CPU time of every render pass. A
+#   horizontal line marks the time available for a frame at 60 frames per
+#   second. The graph is drawn on top of the output of the default pass, so
+#   the composite pass puts it in the window. It is only drawn again when the
+#   default pass was rendered again.
+#
+#   The vertices of the graph are written to a vertex buffer of this pass, so
+#   drawing the graph does not count as buffer uploads in the statistics.
+class RenderStatisticsPass(RenderPass):
+    ##  The number of frames shown in the graph.
+    FrameCount = 120
+
+    ##  The frame time that fills the height of the graph, in seconds.
+    MaximumTime = 1 / 30
+
+    ##  The size of the graph, in normalized device coordinates.
+    GraphWidth = 0.8
+    GraphHeight = 0.5
+
+    ##  The colors of the render passes, in the order they are rendered.
+    PassColors = [Color(0.9, 0.3, 0.2, 0.8), Color(0.2, 0.7, 0.3, 0.8), Color(0.2, 0.4, 0.9, 0.8), Color(0.9, 0.8, 0.2, 0.8), Color(0.7, 0.3, 0.8, 0.8)]
+    TargetColor = Color(1.0, 1.0, 1.0, 0.8)
+
+    ##  Create the pass.
+    #
+    #   \param renderer The renderer to show the statistics of.
+    #   \param view The view that shows the graph. Nothing is drawn while another view is active.
+    def __init__(self, renderer, view):
+        super().__init__("render_statistics", 0, 0, RenderPass.MaximumPriority - 1)
+
+        self._renderer = renderer
+        self._view = view
+        self._shader = OpenGL.getInstance().createShaderProgram(Resources.getPath(Resources.Shaders, "color.shader"))
+        self._layout = VertexLayout()
+
+        self._buffer = None
+        self._buffer_size = 0
+
+    def render(self):
+        if self._view.getController().getActiveView() is not self._view:
+            return
+        if not self._renderer.needsRendering():
+            return # The output of the default pass still has the graph of the last rendered frame.
+
+        default_pass = self._renderer.getRenderPass("default")
+        history = self._renderer.getStatisticsHistory()[-self.FrameCount:]
+        if not default_pass or not history:
+            return
+
+        ranges = [] # The color, first vertex and vertex count of every set of quads.
+        vertices = []
+        first = 0
+        for color, quads in self._createQuads(history):
+            quad_vertices = self._createVertices(numpy.array(quads, dtype = numpy.float32))
+            ranges.append((color, first, len(quad_vertices)))
+            vertices.append(quad_vertices)
+            first += len(quad_vertices)
+        self._writeVertices(numpy.concatenate(vertices))
+
+        default_pass.bind(clear = False)
+        self._shader.bind()
+        self._shader.setUniformValue("u_modelViewProjectionMatrix", Matrix())
+
+        self._gl.glDisable(self._gl.GL_DEPTH_TEST)
+        self._gl.glEnable(self._gl.GL_BLEND)
+        self._gl.glBlendFunc(self._gl.GL_SRC_ALPHA, self._gl.GL_ONE_MINUS_SRC_ALPHA)
+
+        self._buffer.bind()
+        self._layout.enableAttributes(self._shader)
+        for color, first, count in ranges:
+            self._shader.setUniformValue("u_color", color)
+            self._gl.glDrawArrays(self._gl.GL_TRIANGLES, first, count)
+        self._layout.disableAttributes(self._shader)
+        self._buffer.release()
+
+        self._gl.glEnable(self._gl.GL_DEPTH_TEST)
+        self._shader.release()
+        default_pass.release()
+
+    ## private:
+
+    #   The graph is drawn into the output of the default pass, so no frame buffer is needed.
+    def _updateRenderStorage(self):
+        pass
+
+    #   Get the quads to draw, as a list of (color, quads) tuples, where quads
+    #   is a list of (left, bottom, right, top) tuples.
+    def _createQuads(self, history):
+        bar_width = self.GraphWidth / self.FrameCount
+        scale = self.GraphHeight / self.MaximumTime
+
+        pass_quads = {} # The quads of every render pass, by name.
+        for index, statistics in enumerate(history):
+            left = -1.0 + index * bar_width
+            bottom = -1.0
+            for name, pass_time in statistics.pass_times.items():
+                top = min(bottom + pass_time * scale, -1.0 + self.GraphHeight)
+                pass_quads.setdefault(name, []).append((left, bottom, left + bar_width * 0.8, top))
+                bottom = top
+
+        quads = [(self.PassColors[index % len(self.PassColors)], pass_quads[name]) for index, name in enumerate(pass_quads)]
+
+        target = -1.0 + scale / 60
+        quads.append((self.TargetColor, [(-1.0, target - 0.002, -1.0 + self.GraphWidth, target + 0.002)]))
+        return quads
+
+    #   Get the vertices of the two triangles of every quad.
+    def _createVertices(self, quads):
+        left, bottom, right, top = quads[:, 0], quads[:, 1], quads[:, 2], quads[:, 3]
+        zero = numpy.zeros(len(quads), dtype = numpy.float32)
+        corners = [(left, bottom), (right, bottom), (right, top), (left, bottom), (right, top), (left, top)]
+        return numpy.stack([numpy.stack((x, y, zero), axis = 1) for x, y in corners], axis = 1).reshape(-1, 3)
+
+    #   Write vertices to the vertex buffer of this pass.
+    #
+    #   The buffer is created once and only grows when the graph has more
+    #   quads than fit, so every frame only overwrites its contents.
+    def _writeVertices(self, vertices):
+        if self._buffer is None:
+            self._buffer = QOpenGLBuffer(QOpenGLBuffer.VertexBuffer)
+            self._buffer.setUsagePattern(QOpenGLBuffer.DynamicDraw)
+            self._buffer.create()
+
+        self._buffer.bind()
+        if vertices.nbytes > self._buffer_size:
+            self._buffer_size = vertices.nbytes * 2 # Leave room for more render passes.
+            self._buffer.allocate(self._buffer_size)
+        self._buffer.write(0, vertices, vertices.nbytes)
+        self._buffer.release()
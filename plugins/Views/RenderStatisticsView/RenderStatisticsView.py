@@ -0,0 +1,52 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+from UM.Resources import Resources
+
+from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
+
+from UM.View.View import View
+from UM.View.GL.OpenGL import OpenGL
+
+from . import RenderStatisticsPass
+
+##  Solid mesh view with an overlay that shows where the frame time goes.
+#
+#   While this view is active, the renderer records statistics and a graph of
+#   the CPU time spent on every render pass of recent frames is drawn in the
+#   bottom left corner of the window.
+class RenderStatisticsView(View):
+    def __init__(self):
+        super().__init__()
+
+        self._shader = None
+        self._overlay_pass = None
+
+    def beginRendering(self):
+        scene = self.getController().getScene()
+        renderer = self.getRenderer()
+
+        if not self._shader:
+            self._shader = OpenGL.getInstance().createShaderProgram(Resources.getPath(Resources.Shaders, "object.shader"))
+
+        if not self._overlay_pass:
+            self._overlay_pass = RenderStatisticsPass.RenderStatisticsPass(renderer, self)
+            renderer.addRenderPass(self._overlay_pass)
+            self.getController().activeViewChanged.connect(self._onActiveViewChanged)
+
+        if not renderer.isStatisticsEnabled():
+            renderer.setStatisticsEnabled(True)
+
+        for node in DepthFirstIterator(scene.getRoot(), prune = lambda node: not node.isVisible()): # Hidden branches are skipped entirely.
+            if not node.render(renderer):
+                if node.getMeshData():
+                    renderer.queueNode(node, shader = self._shader)
+
+    def endRendering(self):
+        pass
+
+    ##  Stop recording statistics when another view is activated.
+    def _onActiveViewChanged(self):
+        if self.getController().getActiveView() is not self:
+            self.getRenderer().setStatisticsEnabled(False)
+            self.getRenderer().clearStatisticsHistory()
@@ -0,0 +1,26 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+from . import RenderStatisticsView
+
+from UM.i18n import i18nCatalog
+i18n_catalog = i18nCatalog("uranium")
+
+def getMetaData():
+    return {
+        "type": "view",
+        "plugin": {
+            "name": i18n_catalog.i18nc("@label", "Render Statistics View"),
+            "author": "Ultimaker",
+            "version": "1.0",
+            "description": i18n_catalog.i18nc("@info:whatsthis", "Provides a solid mesh view with a graph of the time spent rendering recent frames."),
+            "api": 3
+        },
+        "view": {
+            "name": i18n_catalog.i18nc("@item:inmenu", "Render Statistics"),
+            "visible": False
+        }
+    }
+
+def register(app):
+    return { "view": RenderStatisticsView.RenderStatisticsView() }
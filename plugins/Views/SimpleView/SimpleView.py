@@ -27,9 +27,9 @@ class SimpleView(View):
         if not self._shader:
             self._shader = OpenGL.getInstance().createShaderProgram(Resources.getPath(Resources.Shaders, "object.shader"))
 
-        for node in DepthFirstIterator(scene.getRoot()):
+        for node in DepthFirstIterator(scene.getRoot(), prune = lambda node: not node.isVisible()): # Hidden branches are skipped entirely.
             if not node.render(renderer):
-                if node.getMeshData() and node.isVisible():
+                if node.getMeshData():
                     renderer.queueNode(node, shader = self._shader)
 
     def endRendering(self):
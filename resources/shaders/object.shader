@@ -1,9 +1,9 @@
 [shaders]
 vertex =
-    uniform highp mat4 u_modelMatrix;
     uniform highp mat4 u_viewProjectionMatrix;
-    uniform highp mat4 u_normalMatrix;
 
+    attribute highp mat4 a_modelMatrix;
+    attribute highp mat4 a_normalMatrix;
     attribute highp vec4 a_vertex;
     attribute highp vec4 a_normal;
     attribute highp vec2 a_uvs;
@@ -13,11 +13,11 @@ vertex =
 
     void main()
     {
-        vec4 world_space_vert = u_modelMatrix * a_vertex;
+        vec4 world_space_vert = a_modelMatrix * a_vertex;
         gl_Position = u_viewProjectionMatrix * world_space_vert;
 
         v_vertex = world_space_vert.xyz;
-        v_normal = (u_normalMatrix * normalize(a_normal)).xyz;
+        v_normal = (a_normalMatrix * normalize(a_normal)).xyz;
     }
 
 fragment =
@@ -63,12 +63,12 @@ u_specularColor = [0.7, 0.7, 0.7, 1.0]
 u_shininess = 20.0
 
 [bindings]
-u_modelMatrix = model_matrix
 u_viewProjectionMatrix = view_projection_matrix
-u_normalMatrix = normal_matrix
 u_viewPosition = view_position
 u_lightPosition = light_0_position
 
 [attributes]
 a_vertex = vertex
 a_normal = normal
+a_modelMatrix = model_matrix
+a_normalMatrix = normal_matrix
@@ -169,5 +169,25 @@ class TestAxisAlignedBox(unittest.TestCase):
         box2 = AxisAlignedBox(minimum = Vector(5.0, 5.0, 5.0), maximum = Vector(10.0, 10.0, 10.0))
         self.assertEqual(box1.intersectsBox(box2), AxisAlignedBox.IntersectionResult.FullIntersection)
 
+    def test_combine(self):
+        box = AxisAlignedBox(minimum = Vector(0.0, 0.0, 0.0), maximum = Vector(1.0, 1.0, 1.0))
+        boxes = [
+            AxisAlignedBox(minimum = Vector(-5.0, 0.0, 0.0), maximum = Vector(-4.0, 1.0, 1.0)),
+            None,
+            AxisAlignedBox(minimum = Vector(2.0, 2.0, 2.0), maximum = Vector(3.0, 3.0, 3.0)),
+            AxisAlignedBox(minimum = Vector(10.0, 10.0, 10.0), maximum = Vector(20.0, 20.0, 10.0)) # Not valid, so ignored.
+        ]
+
+        combined = box.combine(boxes)
+        expected = box
+        for other in boxes:
+            expected = expected + other
+        self.assertEqual(combined.minimum, expected.minimum)
+        self.assertEqual(combined.maximum, expected.maximum)
+        self.assertEqual(combined.minimum, Vector(-5.0, 0.0, 0.0))
+        self.assertEqual(combined.maximum, Vector(3.0, 3.0, 3.0))
+
+        self.assertIs(box.combine([]), box)
+
 if __name__ == "__main__":
     unittest.main()
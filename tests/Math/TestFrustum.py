@@ -0,0 +1,38 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+from UM.Math.AxisAlignedBox import AxisAlignedBox
+from UM.Math.Frustum import Frustum
+from UM.Math.Matrix import Matrix
+from UM.Math.Vector import Vector
+
+import unittest
+
+class TestFrustum(unittest.TestCase):
+    def test_ortho(self):
+        projection = Matrix()
+        projection.setOrtho(-10, 10, -10, 10, -100, 100)
+        frustum = Frustum.fromMatrix(projection)
+
+        self.assertTrue(frustum.intersectsBox(AxisAlignedBox(Vector(-1, -1, -11), Vector(1, 1, -9))))
+        self.assertTrue(frustum.intersectsBox(AxisAlignedBox(Vector(9, 9, -11), Vector(11, 11, -9)))) # Partly inside.
+        self.assertFalse(frustum.intersectsBox(AxisAlignedBox(Vector(11, -1, -11), Vector(12, 1, -9))))
+        self.assertFalse(frustum.intersectsBox(AxisAlignedBox(Vector(-1, -1, 101), Vector(1, 1, 200)))) # Beyond the near plane.
+        self.assertFalse(frustum.intersectsBox(AxisAlignedBox(Vector(-1, -1, -200), Vector(1, 1, -101)))) # Beyond the far plane.
+
+        planes = frustum.getPlanes()
+        self.assertEqual(len(planes), 6)
+        self.assertEqual(planes[0].normal, Vector(1, 0, 0)) # The left plane points to the right.
+        self.assertAlmostEqual(planes[0].distance, -10)
+
+    def test_intersectsBoxes(self):
+        view = Matrix()
+        view.setByTranslation(Vector(0, 0, 100))
+        projection = Matrix()
+        projection.setPerspective(30, 1, 1, 500)
+        frustum = Frustum.fromMatrix(projection.multiply(view.getInverse()))
+
+        minimums = [[-1, -1, -1], [1000, -1, -1], [-1, -1, 150], [-30, -1, -1]]
+        maximums = [[1, 1, 1], [1001, 1, 1], [1, 1, 151], [-20, 1, 1]]
+        self.assertEqual(list(frustum.intersectsBoxes(minimums, maximums)), [True, False, False, True])
+        self.assertEqual(len(frustum.intersectsBoxes([], [])), 0)
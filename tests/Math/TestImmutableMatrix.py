@@ -0,0 +1,56 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import copy
+import unittest
+import numpy
+
+from UM.Math.ImmutableMatrix import ImmutableMatrix
+from UM.Math.ImmutableQuaternion import ImmutableQuaternion
+from UM.Math.Matrix import Matrix
+from UM.Math.Quaternion import Quaternion
+from UM.Math.Vector import Vector
+
+class TestImmutableMatrix(unittest.TestCase):
+    def setUp(self):
+        translation = Matrix()
+        translation.setByTranslation(Vector(1, 2, 3))
+        self._matrix = ImmutableMatrix.fromMatrix(translation)
+
+    def test_modify(self):
+        self.assertRaises(TypeError, self._matrix.multiply, Matrix())
+        self.assertRaises(TypeError, self._matrix.setByTranslation, Vector(1, 0, 0))
+        self.assertRaises(TypeError, self._matrix.setRow, 0, [1, 0, 0])
+        with self.assertRaises(ValueError): # The data itself is read-only too.
+            self._matrix._data[0, 0] = 10
+
+    def test_copy(self):
+        self.assertIs(copy.deepcopy(self._matrix), self._matrix)
+        self.assertIs(ImmutableMatrix.fromMatrix(self._matrix), self._matrix)
+
+        mutable = self._matrix.copy()
+        mutable.translate(Vector(1, 0, 0))
+        self.assertEqual(self._matrix.getTranslation(), Vector(1, 2, 3))
+        self.assertEqual(mutable.getTranslation(), Vector(2, 2, 3))
+
+    def test_operations(self):
+        result = self._matrix.multiply(self._matrix, copy = True)
+        self.assertEqual(type(result), Matrix)
+        self.assertEqual(result.getTranslation(), Vector(2, 4, 6))
+        self.assertEqual(self._matrix.getInverse().getTranslation(), Vector(-1, -2, -3))
+        self.assertEqual(self._matrix, self._matrix.copy())
+
+class TestImmutableQuaternion(unittest.TestCase):
+    def test_modify(self):
+        quaternion = ImmutableQuaternion.fromQuaternion(Quaternion.fromAngleAxis(0.5, Vector.Unit_Y))
+        self.assertRaises(TypeError, quaternion.normalize)
+        self.assertRaises(TypeError, quaternion.setByAngleAxis, 1, Vector.Unit_X)
+
+        original = quaternion
+        quaternion *= Quaternion.fromAngleAxis(0.5, Vector.Unit_Y) # Produces a new quaternion, like it does for tuples.
+        self.assertEqual(original, Quaternion.fromAngleAxis(0.5, Vector.Unit_Y))
+        self.assertEqual(quaternion, Quaternion.fromAngleAxis(1.0, Vector.Unit_Y))
+
+        mutable = original.copy()
+        mutable.invert()
+        self.assertEqual(mutable, original.getInverse())
@@ -61,5 +61,25 @@ class TestMatrix(unittest.TestCase):
     def test_dot(self):
         pass
 
+    def test_cachedData(self):
+        temp_matrix = Matrix()
+        data = temp_matrix.getData()
+        self.assertIs(temp_matrix.getData(), data) # Not copied again until the matrix changes.
+
+        version = temp_matrix.getVersion()
+        temp_matrix.setByTranslation(Vector(10, 0, 0))
+        self.assertNotEqual(temp_matrix.getVersion(), version)
+        numpy.testing.assert_array_almost_equal(temp_matrix.getData(), numpy.array([[1,0,0,10],[0,1,0,0],[0,0,1,0],[0,0,0,1]]))
+        numpy.testing.assert_array_almost_equal(data, numpy.identity(4)) # Earlier results are not affected.
+
+    def test_cachedDecomposition(self):
+        temp_matrix = Matrix()
+        temp_matrix.setByTranslation(Vector(10, 0, 0))
+        decomposition = temp_matrix.decompose()
+        self.assertIs(temp_matrix.decompose(), decomposition)
+
+        temp_matrix.setRow(3, [1, 2, 3, 1]) # Also for modifications in place.
+        self.assertEqual(temp_matrix.decompose()[3], Vector(1, 2, 3))
+
 if __name__ == "__main__":
     unittest.main()
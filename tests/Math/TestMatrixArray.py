@@ -0,0 +1,59 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import math
+import unittest
+import numpy
+
+from UM.Math.Matrix import Matrix
+from UM.Math.MatrixArray import MatrixArray
+from UM.Math.Quaternion import Quaternion
+from UM.Math.Vector import Vector
+from UM.Math.VectorArray import VectorArray
+
+class TestMatrixArray(unittest.TestCase):
+    def setUp(self):
+        self._positions = [Vector(10, 0, -5), Vector(0, 3, 1), Vector(-1, -2, 7)]
+        self._orientations = [Quaternion.fromAngleAxis(0.3, Vector.Unit_Y), Quaternion.fromAngleAxis(-1.2, Vector(1, 1, 0)), Quaternion()]
+        self._scales = [Vector(1, 1, 1), Vector(2, 0.5, 3), Vector(-1, 1, 1)]
+        self._matrices = [Matrix.fromPositionOrientationScale(*arguments) for arguments in zip(self._positions, self._orientations, self._scales)]
+        self._array = MatrixArray.fromMatrices(self._matrices)
+
+    def assertMatricesEqual(self, array, matrices, decimal = 5):
+        self.assertEqual(len(array), len(matrices))
+        for index, matrix in enumerate(matrices):
+            numpy.testing.assert_array_almost_equal(array[index].getData(), matrix.getData(), decimal)
+
+    def test_conversion(self):
+        self.assertMatricesEqual(self._array, self._matrices)
+        self.assertEqual(self._array.getData().shape, (3, 4, 4))
+        self.assertEqual(len(MatrixArray.identity(5)), 5)
+
+    def test_fromPositionOrientationScale(self):
+        array = MatrixArray.fromPositionOrientationScale(VectorArray.fromVectors(self._positions), self._orientations, VectorArray.fromVectors(self._scales))
+        self.assertMatricesEqual(array, self._matrices)
+
+    def test_multiply(self):
+        matrix = Matrix()
+        matrix.setByRotationAxis(math.pi / 3, Vector.Unit_Z)
+
+        self.assertMatricesEqual(self._array.multiply(matrix, copy = True), [m.multiply(matrix, copy = True) for m in self._matrices])
+        self.assertMatricesEqual(self._array.preMultiply(matrix, copy = True), [m.preMultiply(matrix, copy = True) for m in self._matrices])
+        self.assertMatricesEqual(self._array.multiply(self._array, copy = True), [m.multiply(m, copy = True) for m in self._matrices])
+
+    def test_inverse(self):
+        self.assertMatricesEqual(self._array.getInverse(), [m.getInverse() for m in self._matrices], 4)
+
+        singular = MatrixArray(numpy.array([numpy.zeros((4, 4)), numpy.identity(4) * 2]))
+        inverse = singular.getInverse()
+        numpy.testing.assert_array_equal(inverse[0].getData(), numpy.zeros((4, 4)))
+        numpy.testing.assert_array_almost_equal(inverse[1].getData(), numpy.identity(4) * 0.5)
+
+    def test_decompose(self):
+        results = self._array.decompose()
+        for index, matrix in enumerate(self._matrices):
+            expected = matrix.decompose()
+            for array, vector in zip(results, expected):
+                numpy.testing.assert_array_almost_equal(array[index].getData(), [vector.x, vector.y, vector.z], 4)
+
+        self.assertRaises(ValueError, MatrixArray(numpy.zeros((1, 4, 4))).decompose)
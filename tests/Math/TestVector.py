@@ -45,5 +45,17 @@ class TestVector(unittest.TestCase):
         self.assertEqual(Vector(0, -1, 0), -v)
         self.assertEqual(Vector(0, 1, 0), v) # - should have no side effects
 
+    def test_divideByZero(self):
+        v = 1.0 / Vector(1, 0, 0)
+        self.assertEqual(v.x, 1)
+        self.assertTrue(numpy.isinf(v.y))
+        self.assertTrue(numpy.isinf(v.z))
+
+    def test_getDataIsCopy(self):
+        v = Vector(1, 2, 3)
+        data = v.getData()
+        data[0] = 10
+        self.assertEqual(v, Vector(1, 2, 3)) # Vectors are immutable.
+
 if __name__ == "__main__":
     unittest.main()
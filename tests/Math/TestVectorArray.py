@@ -0,0 +1,55 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import unittest
+import numpy
+
+from UM.Math.Matrix import Matrix
+from UM.Math.MatrixArray import MatrixArray
+from UM.Math.Vector import Vector
+from UM.Math.VectorArray import VectorArray
+
+class TestVectorArray(unittest.TestCase):
+    def setUp(self):
+        self._vectors = [Vector(1, 0, 0), Vector(0, 3, 4), Vector(-2, 5, 1), Vector(0, 0, 0)]
+        self._array = VectorArray.fromVectors(self._vectors)
+
+    def test_conversion(self):
+        self.assertEqual(len(self._array), 4)
+        self.assertEqual(self._array.toVectors(), self._vectors)
+        self.assertEqual(self._array[2], Vector(-2, 5, 1))
+        self.assertEqual(len(VectorArray.fromVectors([])), 0)
+
+    def test_length(self):
+        numpy.testing.assert_array_almost_equal(self._array.length(), [vector.length() for vector in self._vectors])
+
+    def test_normalized(self):
+        expected = VectorArray.fromVectors([vector.normalized() for vector in self._vectors])
+        self.assertTrue(self._array.normalized().equals(expected))
+
+    def test_dotCross(self):
+        other = VectorArray.fromVectors([Vector(0, 1, 0)] * 4)
+        numpy.testing.assert_array_almost_equal(self._array.dot(other), [vector.dot(Vector(0, 1, 0)) for vector in self._vectors])
+        expected = VectorArray.fromVectors([vector.cross(Vector(0, 1, 0)) for vector in self._vectors])
+        self.assertTrue(self._array.cross(other).equals(expected))
+        self.assertTrue(self._array.cross(Vector(0, 1, 0)).equals(expected)) #A single vector applies to all of them.
+
+    def test_multiply(self):
+        matrix = Matrix()
+        matrix.setByRotationAxis(0.5, Vector.Unit_Y)
+        matrix.translate(Vector(1, 2, 3))
+
+        expected = VectorArray.fromVectors([vector.preMultiply(matrix) for vector in self._vectors])
+        self.assertTrue(self._array.preMultiply(matrix).equals(expected, 1e-5))
+        expected = VectorArray.fromVectors([vector.multiply(matrix) for vector in self._vectors])
+        self.assertTrue(self._array.multiply(matrix).equals(expected, 1e-5))
+
+        matrices = MatrixArray.fromMatrices([matrix] * 4)
+        self.assertTrue(self._array.preMultiply(matrices).equals(self._array.preMultiply(matrix)))
+
+    def test_arithmetic(self):
+        self.assertEqual((self._array + Vector(1, 1, 1))[0], Vector(2, 1, 1))
+        self.assertEqual((self._array - self._array)[2], Vector(0, 0, 0))
+        self.assertEqual((2 * self._array)[1], Vector(0, 6, 8))
+        self.assertEqual(self._array.getMinimum(), Vector(-2, 0, 0))
+        self.assertEqual(self._array.getMaximum(), Vector(1, 5, 4))
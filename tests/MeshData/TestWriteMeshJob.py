@@ -0,0 +1,87 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import io
+import threading
+
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshWriter import MeshWriter
+from UM.Mesh.WriteMeshJob import WriteMeshJob
+from UM.Scene.GroupDecorator import GroupDecorator
+from UM.Scene.SceneNode import SceneNode
+from UM.Scene.SceneNodeDecorator import SceneNodeDecorator
+
+class StackDecorator(SceneNodeDecorator):
+    def __init__(self, stack):
+        super().__init__()
+        self._stack = stack
+
+    def getStack(self):
+        return self._stack
+
+##  Records what a writer that saves groups and per-object settings sees of the nodes.
+class RecordingWriter(MeshWriter):
+    def __init__(self):
+        super().__init__()
+        self.written = []
+
+    def acceptsSnapshots(self):
+        return True
+
+    def write(self, stream, nodes, mode = MeshWriter.OutputMode.BinaryMode):
+        for node in MeshWriter._meshNodes(nodes):
+            self.written.append((node.getName(), node.callDecoration("getStack"), node.getParent().callDecoration("isGroup"), node.getWorldPosition()))
+        return True
+
+##  A writer that does not accept snapshots, like third-party writers written before snapshots existed.
+class LiveWriter(MeshWriter):
+    def __init__(self, scene):
+        super().__init__()
+        self._scene = scene
+        self.written = []
+        self.scene_locked = None
+
+    def write(self, stream, nodes, mode = MeshWriter.OutputMode.BinaryMode):
+        self.written = list(nodes)
+
+        # Operations can not take the write lock from another thread while writing.
+        acquired = []
+        thread = threading.Thread(target = lambda: acquired.append(self._scene.getSceneLock().acquire(False)))
+        thread.start()
+        thread.join()
+        self.scene_locked = acquired == [False]
+        return True
+
+def test_writeNodeInGroup(application):
+    builder = MeshBuilder()
+    builder.addCube(10, 10, 10)
+    scene = application.getController().getScene()
+
+    group = SceneNode(scene.getRoot(), name = "Group")
+    group.addDecorator(GroupDecorator())
+    node = SceneNode(group, name = "Cube")
+    node.setMeshData(builder.build())
+    node.translate(Vector(0, 0, 5))
+    stack = object()
+    node.addDecorator(StackDecorator(stack))
+
+    writer = RecordingWriter()
+    job = WriteMeshJob(writer, io.BytesIO(), [node], MeshWriter.OutputMode.BinaryMode)
+    node.setParent(scene.getRoot()) # Changes after the job was created are not written.
+    job.run()
+
+    assert job.getResult()
+    assert writer.written == [("Cube", stack, True, Vector(0, 0, 5))]
+
+def test_writeLiveNodes(application):
+    scene = application.getController().getScene()
+    node = SceneNode(scene.getRoot(), name = "Cube")
+
+    writer = LiveWriter(scene)
+    job = WriteMeshJob(writer, io.BytesIO(), [node], MeshWriter.OutputMode.BinaryMode)
+    job.run()
+
+    assert job.getResult()
+    assert writer.written == [node]
+    assert writer.scene_locked
@@ -0,0 +1,97 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import math
+
+import numpy
+
+from UM.Job import Job
+from UM.Math.Quaternion import Quaternion
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Operations.BestFaceLayFlatJob import BestFaceLayFlatBatch
+from UM.Operations.BestFaceLayFlatOperation import BestFaceLayFlatOperation
+from UM.Scene.SceneNode import SceneNode
+
+##  Creates a node with a pyramid, turned upside down so it balances on its tip.
+def createUpsideDownPyramid():
+    builder = MeshBuilder()
+    builder.addPyramid(20, 10, 20)
+    node = SceneNode()
+    node.setMeshData(builder.build())
+    node.setOrientation(Quaternion.fromAngleAxis(math.pi * 0.9, Vector.Unit_X))
+    return node
+
+##  Counts the vertices that lie on the lowest point of the node.
+def countLowestVertices(node):
+    vertices = node.getMeshDataTransformed().getVertices()
+    return numpy.sum(numpy.abs(vertices[:, 1] - vertices[:, 1].min()) < 1e-3)
+
+def test_findBestFaceCube():
+    builder = MeshBuilder()
+    builder.addCube(10, 20, 40)
+    normal, score = BestFaceLayFlatOperation.findBestFace(builder.getVertices())
+
+    #The largest face of the cube is the one perpendicular to the X axis, which is also the most stable one.
+    assert abs(abs(normal[0]) - 1) < 1e-6
+
+def test_findBestFaceDegenerate():
+    vertices = numpy.array([[0, 0, 0], [1, 0, 0], [0, 0, 1], [1, 0, 1]], dtype = numpy.float32)
+    assert BestFaceLayFlatOperation.findBestFace(vertices) is None
+
+def test_layFlatPyramid(application):
+    node = createUpsideDownPyramid()
+    assert countLowestVertices(node) == 1
+
+    operation = BestFaceLayFlatOperation(node)
+    operation.process()
+    operation.redo()
+    assert countLowestVertices(node) == 4 #Resting on its base.
+
+    operation.undo()
+    assert countLowestVertices(node) == 1
+
+def test_layFlatFlatMesh(application):
+    builder = MeshBuilder()
+    builder.addFace(Vector(0, 0, 0), Vector(10, 0, 0), Vector(10, 0, 10))
+    builder.addFace(Vector(0, 0, 0), Vector(10, 0, 10), Vector(0, 0, 10))
+    node = SceneNode()
+    node.setMeshData(builder.build())
+    node.setOrientation(Quaternion.fromAngleAxis(0.5, Vector.Unit_X))
+    orientation = node.getOrientation()
+
+    operation = BestFaceLayFlatOperation(node)
+    operation.process() #The mesh has no volume, so it is left untouched.
+    operation.redo()
+    assert operation.getScore() is None
+    assert node.getOrientation() == orientation
+
+def test_layFlatInRotatedParent(application):
+    parent = SceneNode()
+    parent.setOrientation(Quaternion.fromAngleAxis(math.pi / 3, Vector.Unit_Z))
+    node = createUpsideDownPyramid()
+    node.setParent(parent)
+    assert countLowestVertices(node) == 1
+
+    operation = BestFaceLayFlatOperation(node)
+    operation.process()
+    operation.redo()
+    assert countLowestVertices(node) == 4
+
+##  Runs jobs right away on the calling thread, so the finished signals are emitted on the main thread.
+def runJobImmediately(job):
+    job.run()
+    job._finished = True
+    job.finished.emit(job)
+
+def test_batch(application, monkeypatch):
+    monkeypatch.setattr(Job, "start", runJobImmediately)
+    nodes = [createUpsideDownPyramid() for i in range(5)]
+
+    batch = BestFaceLayFlatBatch(nodes)
+    batch.start()
+
+    assert batch.isFinished()
+    batch.getOperation().redo()
+    for node in nodes:
+        assert countLowestVertices(node) == 4
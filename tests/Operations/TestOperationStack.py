@@ -0,0 +1,44 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import threading
+
+from UM.Operations.Operation import Operation
+from UM.Operations.OperationStack import OperationStack
+
+##  Records whether another thread could read the scene while the operation was done.
+class RecordingOperation(Operation):
+    def __init__(self, scene):
+        super().__init__()
+        self._scene = scene
+        self.scene_readable = []
+
+    def redo(self):
+        self._record()
+
+    def undo(self):
+        self._record()
+
+    def _record(self):
+        acquired = []
+        def read():
+            acquired.append(self._scene.getSceneLock().acquireRead(False))
+            if acquired[-1]:
+                self._scene.getSceneLock().releaseRead()
+        thread = threading.Thread(target = read)
+        thread.start()
+        thread.join()
+        self.scene_readable.append(acquired[0])
+
+def test_operationsLockScene(application):
+    scene = application.getController().getScene()
+    stack = OperationStack()
+    operation = RecordingOperation(scene)
+
+    stack.push(operation)
+    stack.undo()
+    stack.redo()
+
+    assert operation.scene_readable == [False, False, False]
+    assert scene.getSceneLock().acquireRead(False) # Released again after the operations.
+    scene.getSceneLock().releaseRead()
@@ -0,0 +1,59 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import os
+
+import numpy
+import pytest
+
+from PyQt5.QtGui import QGuiApplication
+
+from UM.Math.Matrix import Matrix
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Scene.Camera import Camera
+from UM.Scene.Scene import Scene
+from UM.Scene.SceneNode import SceneNode
+from UM.View.GL.OpenGL import OpenGL
+
+@pytest.fixture(scope = "module")
+def gui_application():
+    return QGuiApplication.instance() or QGuiApplication([])
+
+@pytest.fixture()
+def offscreen_renderer(application, gui_application):
+    from UM.Qt.OffscreenRenderer import OffscreenRenderer
+
+    scene = Scene()
+    builder = MeshBuilder()
+    builder.addCube(2, 2, 2)
+    node = SceneNode(scene.getRoot())
+    node.setMeshData(builder.build())
+
+    try:
+        renderer = OffscreenRenderer(scene, 64, 64)
+    except RuntimeError:
+        if os.environ.get("URANIUM_REQUIRE_OPENGL"): # Set on CI machines that have a software OpenGL implementation.
+            raise
+        pytest.skip("No OpenGL context available to render offscreen")
+    yield renderer
+    renderer.destroy()
+
+def createCamera():
+    camera = Camera("offscreen")
+    camera.setPosition(Vector(0, 0, 10))
+    camera.lookAt(Vector(0, 0, 0))
+    projection = Matrix()
+    projection.setPerspective(30, 1, 1, 100)
+    camera.setProjectionMatrix(projection)
+    return camera
+
+def test_renderImage(offscreen_renderer):
+    image = offscreen_renderer.renderImage(createCamera())
+    assert image.shape == (64, 64, 4)
+    assert image.dtype == numpy.uint8
+    assert image[32, 32, 3] == 255 # The cube is in the center.
+    assert image[0, 0, 3] == 0 # The background is transparent.
+    assert OpenGL.getInstance() is None # The OpenGL instance is only set while rendering.
+
+    numpy.testing.assert_array_equal(offscreen_renderer.renderImage(createCamera()), image)
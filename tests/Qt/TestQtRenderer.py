@@ -0,0 +1,300 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import pytest
+
+from UM.Math.Matrix import Matrix
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshData import MeshData
+from UM.Qt.QtRenderer import QtRenderer
+from UM.Scene.Camera import Camera
+from UM.Scene.SceneNode import SceneNode
+from UM.Scene.Selection import Selection
+from UM.View.RenderBatch import RenderBatch
+from UM.View.RenderPass import RenderPass
+
+def createMesh():
+    return MeshData(vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0]], indices = [[0, 1, 2]])
+
+@pytest.fixture()
+def renderer(application, opengl):
+    renderer = QtRenderer()
+    renderer._default_material = opengl.createShaderProgram()
+    renderer._gl = opengl.getBindingsObject()
+    renderer._initialized = True # Do not create the default passes, which need a real OpenGL context.
+    return renderer
+
+class CountingRenderPass(RenderPass):
+    def __init__(self, name):
+        super().__init__(name, 0, 0)
+        self.render_count = 0
+
+    def render(self):
+        self.render_count += 1
+
+class ReusableRenderPass(CountingRenderPass):
+    def canReuseOutput(self):
+        return True
+
+def renderBatches(renderer):
+    camera = Camera("camera")
+    for batch in sorted(renderer.getBatches()):
+        batch.render(camera)
+
+def test_queueNodeMergesByState(renderer, opengl):
+    meshes = [createMesh() for i in range(3)]
+    nodes = []
+    for i in range(30):
+        node = SceneNode()
+        node.setMeshData(meshes[i % 3])
+        node.setPosition(Vector(i, 0, 0))
+        nodes.append(node)
+
+    for node in nodes:
+        renderer.queueNode(node)
+    transparent_shader = opengl.createShaderProgram()
+    renderer.queueNode(nodes[0], shader = transparent_shader, transparent = True)
+    renderer.queueNode(nodes[1], shader = transparent_shader, transparent = True, uniforms = { "alpha": 0.5 })
+    renderer.queueNode(nodes[2], shader = transparent_shader, transparent = True, mode = RenderBatch.RenderMode.Lines)
+
+    batches = renderer.getBatches()
+    assert len(batches) == 3 # One per distinct render state.
+    assert len(batches[0].items) == 30
+    assert len(batches[0].instances) == 3
+    assert len(batches[1].items) == 2
+
+    renderBatches(renderer)
+    gl = opengl.getBindingsObject()
+    assert len(gl.getCalls("bindShader")) == 3 # Every state is bound once.
+    assert len(gl.getCalls("glDrawElements")) == 33
+    assert len(gl.getCalls("glDrawArrays")) == 0
+    assert len([call for call in gl.getCalls("bindBuffer") if call[1] == "vertex"]) == 6 # Once per mesh per batch.
+    assert ("glDrawElements", RenderBatch.RenderMode.Lines, 1, "GL_UNSIGNED_INT", None) in gl.calls
+
+    # Depth writing is only disabled for the transparent batches.
+    assert gl.getCalls("glDepthMask") == [("glDepthMask", "GL_TRUE"), ("glDepthMask", "GL_FALSE"), ("glDepthMask", "GL_FALSE")]
+
+def test_endRendering(renderer):
+    node = SceneNode()
+    node.setMeshData(createMesh())
+    renderer.queueNode(node)
+    renderer.endRendering()
+    assert renderer.getBatches() == []
+
+    renderer.queueNode(node)
+    assert len(renderer.getBatches()) == 1
+    assert len(renderer.getBatches()[0].items) == 1 # Batches of the previous frame are not reused.
+
+def test_queueNodeUnhashableState(renderer):
+    node = SceneNode()
+    node.setMeshData(createMesh())
+    renderer.queueNode(node, range = [0, 1])
+    renderer.queueNode(node, range = [0, 1])
+    assert len(renderer.getBatches()) == 2
+
+def test_frustumCulling(renderer, application):
+    scene = application.getController().getScene()
+    camera = Camera("test", scene.getRoot())
+    camera.setPosition(Vector(0, 0, 100))
+    projection = Matrix()
+    projection.setPerspective(30, 1, 1, 500)
+    camera.setProjectionMatrix(projection)
+    scene.setActiveCamera("test")
+
+    mesh = MeshData(vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], indices = [[0, 1, 2], [0, 1, 3]])
+    positions = [Vector(0, 0, 0), Vector(1000, 0, 0), Vector(0, 0, 200), Vector(10, 10, 0)]
+    nodes = []
+    for position in positions:
+        node = SceneNode(scene.getRoot())
+        node.setMeshData(mesh)
+        node.setPosition(position)
+        nodes.append(node)
+
+    for node in nodes:
+        renderer.queueNode(node)
+    renderer.queueNode(nodes[1], mesh = createMesh()) # Rendered with another mesh, so never culled.
+
+    batches = renderer.getBatches()
+    assert len(batches) == 1
+    assert [item["mesh"] for item in batches[0].items][:2] == [mesh, mesh]
+    assert len(batches[0].items) == 3
+
+    renderer.render()
+    renderer.endRendering()
+    statistics = renderer.getStatistics()
+    assert statistics.queued_nodes == 5
+    assert statistics.culled_nodes == 2
+    assert statistics.batches == 1
+
+def renderFrame(renderer):
+    renderer.beginRendering()
+    rendered = renderer.needsRendering()
+    renderer.render()
+    renderer.endRendering()
+    return rendered
+
+def test_onDemandRendering(renderer, application):
+    scene = application.getController().getScene()
+    camera = Camera("test", scene.getRoot())
+    scene.setActiveCamera("test")
+    node = SceneNode(scene.getRoot())
+
+    offscreen_pass = ReusableRenderPass("offscreen")
+    window_pass = CountingRenderPass("window") # Passes are rendered every frame by default.
+    renderer.addRenderPass(offscreen_pass)
+    renderer.addRenderPass(window_pass)
+
+    assert renderFrame(renderer)
+    assert not renderFrame(renderer) # Nothing changed.
+    assert offscreen_pass.render_count == 1
+    assert window_pass.render_count == 2 # The window is composed every frame.
+
+    node.translate(Vector(1, 0, 0))
+    assert renderFrame(renderer)
+    assert not renderFrame(renderer)
+
+    camera.translate(Vector(0, 0, 10))
+    assert renderFrame(renderer)
+
+    Selection.add(node)
+    assert renderFrame(renderer)
+    Selection.clear()
+
+    renderFrame(renderer)
+    renderer.setViewportSize(100, 100)
+    assert renderFrame(renderer)
+
+    node.setVisible(False)
+    assert renderFrame(renderer)
+    node.setVisible(False)
+    assert not renderFrame(renderer) # The visibility did not change.
+
+    renderer.invalidate()
+    assert renderFrame(renderer)
+    assert not renderFrame(renderer)
+    assert offscreen_pass.render_count == 8
+
+class BatchRenderPass(RenderPass):
+    def __init__(self, renderer, camera):
+        super().__init__("batches", 0, 0)
+        self._renderer = renderer
+        self._camera = camera
+
+    def render(self):
+        for batch in sorted(self._renderer.getBatches()):
+            batch.render(self._camera)
+
+class FakeTimerQuery:
+    def __init__(self):
+        self.available = False
+        self.destroyed = False
+
+    def begin(self):
+        pass
+
+    def end(self):
+        pass
+
+    def isResultAvailable(self):
+        return self.available
+
+    def getResult(self):
+        return 0.002
+
+    def destroy(self):
+        self.destroyed = True
+
+def test_statistics(renderer, application, opengl, monkeypatch):
+    scene = application.getController().getScene()
+    camera = Camera("test", scene.getRoot())
+    scene.setActiveCamera("test")
+    renderer.addRenderPass(BatchRenderPass(renderer, camera))
+
+    mesh = MeshData(vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], indices = [[0, 1, 2], [0, 1, 3]])
+    nodes = []
+    for i in range(3):
+        node = SceneNode(scene.getRoot())
+        node.setMeshData(mesh)
+        nodes.append(node)
+
+    def renderNodes():
+        renderer.beginRendering()
+        for node in nodes:
+            renderer.queueNode(node)
+        renderer.render()
+        renderer.endRendering()
+
+    renderNodes()
+    assert renderer.getStatisticsHistory() == [] # Not recorded by default.
+    assert renderer.getStatistics().draw_calls == 0
+
+    queries = []
+    def createTimerQuery():
+        queries.append(FakeTimerQuery())
+        return queries[-1]
+    monkeypatch.setattr(opengl, "createTimerQuery", createTimerQuery)
+
+    renderer.setStatisticsEnabled(True)
+    renderer.invalidate()
+    renderNodes()
+    history = renderer.getStatisticsHistory()
+    assert len(history) == 1
+    statistics = history[0]
+    assert statistics is renderer.getStatistics()
+    assert statistics.draw_calls == 3
+    assert statistics.triangles == 6
+    assert statistics.shader_binds == 1
+    assert list(statistics.pass_times.keys()) == ["batches"]
+    assert statistics.frame_time >= statistics.pass_times["batches"] >= 0
+    assert statistics.pass_gpu_times == {} # The GPU has not finished yet.
+
+    queries[0].available = True
+    renderer.invalidate()
+    renderNodes()
+    assert statistics.pass_gpu_times == { "batches": 0.002 }
+    assert len(queries) == 1 # Finished queries are reused.
+
+    queries[0].available = False
+    renderer.invalidate()
+    renderNodes()
+    assert len(queries) == 2
+    assert len(renderer.getStatisticsHistory()) == 3
+
+    renderer.setStatisticsEnabled(False)
+    assert not any(query.destroyed for query in queries) # Not until the context is current again.
+    renderNodes()
+    assert len(renderer.getStatisticsHistory()) == 3
+    assert all(query.destroyed for query in queries)
+
+def test_statisticsPerRenderer(renderer, application, opengl):
+    scene = application.getController().getScene()
+    camera = Camera("test", scene.getRoot())
+    scene.setActiveCamera("test")
+    node = SceneNode(scene.getRoot())
+    node.setMeshData(MeshData(vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], indices = [[0, 1, 2], [0, 1, 3]]))
+
+    other_renderer = QtRenderer()
+    other_renderer._default_material = opengl.createShaderProgram()
+    other_renderer._gl = opengl.getBindingsObject()
+    other_renderer._initialized = True
+    other_renderer.addRenderPass(BatchRenderPass(other_renderer, camera))
+
+    # Another renderer, like an offscreen renderer, renders while the frame of the first is recorded.
+    class OtherRendererPass(BatchRenderPass):
+        def render(self):
+            other_renderer.beginRendering()
+            other_renderer.queueNode(node)
+            other_renderer.render()
+            other_renderer.endRendering()
+            super().render()
+
+    renderer.addRenderPass(OtherRendererPass(renderer, camera))
+    renderer.setStatisticsEnabled(True)
+    renderer.beginRendering()
+    renderer.queueNode(node)
+    renderer.render()
+    renderer.endRendering()
+
+    assert renderer.getRecordingStatistics() is None
+    assert renderer.getStatistics().draw_calls == 1 # Not the draw call of the other renderer.
+    assert other_renderer.getRecordingStatistics() is None
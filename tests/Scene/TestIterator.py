@@ -0,0 +1,71 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import unittest
+import unittest.mock
+
+from UM.Scene.Iterator.BreadthFirstIterator import BreadthFirstIterator
+from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
+from UM.Scene.Iterator.Iterator import Iterator
+from UM.Scene.SceneNode import SceneNode
+
+##  Iterator in the old style, which fills a list of all nodes in advance.
+class ListIterator(Iterator):
+    def _fillStack(self):
+        self._node_stack.append(self._scene_node)
+        self._node_stack.extend(self._scene_node.getAllChildren())
+
+class TestIterator(unittest.TestCase):
+    def setUp(self):
+        # root
+        # +- a
+        # |  +- a1
+        # |  +- a2
+        # |     +- a2x
+        # +- b
+        #    +- b1
+        self._root = SceneNode(name = "root")
+        a = SceneNode(self._root, name = "a")
+        SceneNode(a, name = "a1")
+        a2 = SceneNode(a, name = "a2")
+        SceneNode(a2, name = "a2x")
+        b = SceneNode(self._root, name = "b")
+        SceneNode(b, name = "b1")
+
+    def _names(self, iterator):
+        return [node.getName() for node in iterator]
+
+    def test_depthFirst(self):
+        self.assertEqual(self._names(DepthFirstIterator(self._root)), ["root", "a", "a1", "a2", "a2x", "b", "b1"])
+
+    def test_breadthFirst(self):
+        self.assertEqual(self._names(BreadthFirstIterator(self._root)), ["root", "a", "b", "a1", "a2", "b1", "a2x"])
+
+    def test_none(self):
+        self.assertEqual(list(DepthFirstIterator(None)), [])
+        self.assertEqual(list(BreadthFirstIterator(None)), [])
+
+    def test_prune(self):
+        prune = lambda node: node.getName() == "a2"
+        self.assertEqual(self._names(DepthFirstIterator(self._root, prune = prune)), ["root", "a", "a1", "b", "b1"])
+        self.assertEqual(self._names(BreadthFirstIterator(self._root, prune = prune)), ["root", "a", "b", "a1", "b1"])
+
+    def test_filter(self):
+        leaves = lambda node: not node.hasChildren()
+        self.assertEqual(self._names(DepthFirstIterator(self._root, filter = leaves)), ["a1", "a2x", "b1"])
+        self.assertEqual(self._names(BreadthFirstIterator(self._root, filter = leaves)), ["a1", "b1", "a2x"])
+
+    def test_lazy(self):
+        visited = []
+        prune = lambda node: visited.append(node.getName())
+        for node in DepthFirstIterator(self._root, prune = prune):
+            if node.getName() == "a1":
+                break
+        self.assertEqual(visited, ["root", "a", "a1"]) # The rest of the tree is not visited.
+
+    def test_fillStack(self):
+        self.assertEqual(self._names(ListIterator(self._root)), ["root", "a", "b", "a1", "a2", "a2x", "b1"])
+        self.assertEqual(self._names(ListIterator(self._root, prune = lambda node: node.getName() == "a")), ["root", "b", "a1", "a2", "a2x", "b1"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import threading
+import unittest
+import unittest.mock
+
+from UM.Math.Vector import Vector
+from UM.Operations.GroupedOperation import GroupedOperation
+from UM.Operations.TranslateOperation import TranslateOperation
+from UM.Scene.Scene import Scene
+from UM.Scene.SceneNode import SceneNode
+from UM.Signal import Signal
+
+class SignalRecorder:
+    def __init__(self):
+        self.emits = []
+
+    def slot(self, *args):
+        self.emits.append(args)
+
+class TestScene(unittest.TestCase):
+    def setUp(self):
+        # Signals are only emitted when there is an application.
+        application = unittest.mock.Mock(getMainThread = threading.current_thread)
+        self._patch = unittest.mock.patch.object(Signal, "_app", application)
+        self._patch.start()
+
+        self._scene = Scene()
+        self._nodes = [SceneNode(self._scene.getRoot()) for i in range(10)]
+
+        self._scene_changed = SignalRecorder()
+        self._scene.sceneChanged.connect(self._scene_changed.slot)
+        self._batch_finished = SignalRecorder()
+        self._scene.batchUpdateFinished.connect(self._batch_finished.slot)
+
+    def tearDown(self):
+        self._patch.stop()
+
+    def test_withoutBatchUpdate(self):
+        for node in self._nodes:
+            node.translate(Vector(1, 0, 0))
+        self.assertEqual(len(self._scene_changed.emits), len(self._nodes))
+        self.assertEqual(len(self._batch_finished.emits), 0)
+
+    def test_batchUpdate(self):
+        transformation_changed = SignalRecorder()
+        self._nodes[0].transformationChanged.connect(transformation_changed.slot)
+
+        with self._scene.batchUpdate():
+            for i in range(5):
+                for node in self._nodes:
+                    node.translate(Vector(1, 0, 0))
+            self.assertEqual(len(self._scene_changed.emits), 0)
+            self.assertEqual(len(transformation_changed.emits), 0)
+            self.assertEqual(self._nodes[0].getPosition(), Vector(5, 0, 0)) # The changes themselves are not postponed.
+
+        self.assertEqual(transformation_changed.emits, [(self._nodes[0], )]) # Once per node.
+        self.assertEqual(self._scene_changed.emits, [(self._scene.getRoot(), )])
+
+        self.assertEqual(len(self._batch_finished.emits), 1)
+        changes = self._batch_finished.emits[0][0]
+        self.assertEqual(set(changes.keys()), set(self._nodes))
+        self.assertIn("transformationChanged", changes[self._nodes[0]])
+
+    def test_nestedBatchUpdate(self):
+        with self._scene.batchUpdate():
+            with self._scene.batchUpdate():
+                self._nodes[0].translate(Vector(1, 0, 0))
+            self.assertEqual(len(self._scene_changed.emits), 0) # Only the outermost batch update emits.
+            self._nodes[1].setParent(self._nodes[2])
+
+        self.assertEqual(len(self._scene_changed.emits), 1)
+        changes = self._batch_finished.emits[0][0]
+        self.assertIn("transformationChanged", changes[self._nodes[0]])
+        self.assertIn("parentChanged", changes[self._nodes[1]])
+        self.assertIn("childrenChanged", changes[self._nodes[2]])
+
+    def test_emptyBatchUpdate(self):
+        with self._scene.batchUpdate():
+            pass
+        self.assertEqual(len(self._scene_changed.emits), 0)
+        self.assertEqual(len(self._batch_finished.emits), 0)
+
+    def test_groupedOperation(self):
+        operation = GroupedOperation()
+        for node in self._nodes:
+            operation.addOperation(TranslateOperation(node, Vector(0, 0, 10)))
+
+        operation.redo()
+        self.assertEqual(len(self._scene_changed.emits), 1)
+        operation.undo()
+        self.assertEqual(len(self._scene_changed.emits), 2)
+        self.assertEqual(self._nodes[0].getPosition(), Vector(0, 0, 0))
+
+    def test_findObject(self):
+        node = self._nodes[3]
+        child = SceneNode(node)
+        self.assertIs(self._scene.findObject(id(node)), node)
+        self.assertIs(self._scene.findObject(id(child)), child)
+        self.assertIs(self._scene.findObject(id(self._scene.getRoot())), self._scene.getRoot())
+
+        with unittest.mock.patch.object(self._scene, "_rebuildNodeIndex") as rebuild:
+            self.assertIs(self._scene.findObject(id(child)), child)
+            self.assertFalse(rebuild.called) # Found in the index.
+
+        node.setParent(None)
+        self.assertIsNone(self._scene.findObject(id(node)))
+        self.assertIsNone(self._scene.findObject(id(child)))
+
+        node.setParent(self._scene.getRoot())
+        self.assertIs(self._scene.findObject(id(child)), child)
+        self.assertIsNone(self._scene.findObject(0))
+
+    def test_findObjectMiss(self):
+        with unittest.mock.patch.object(self._scene, "_rebuildNodeIndex") as rebuild:
+            self.assertIsNone(self._scene.findObject(None))
+            self.assertIsNone(self._scene.findObject(id(SceneNode())))
+            self.assertFalse(rebuild.called) # A miss does not search the scene.
+
+    def test_findObjectChangedOutsideScene(self):
+        node = self._nodes[3]
+        node.setParent(None)
+        child = SceneNode(node) # Added while its parent is not in the scene.
+        node.setParent(self._scene.getRoot())
+        self.assertIs(self._scene.findObject(id(child)), child)
+
+if __name__ == "__main__":
+    unittest.main()
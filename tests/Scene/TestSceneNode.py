@@ -7,9 +7,31 @@ from UM.Math.Vector import Vector
 from UM.Math.Quaternion import Quaternion
 from UM.Math.Matrix import Matrix
 from UM.Math.Float import Float
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshData import MeshData
+from UM.Signal import Signal
+from UM.Scene.SceneNodeDecorator import SceneNodeDecorator
 
+from copy import deepcopy
+import gc
 import unittest
+import unittest.mock
 import math
+import threading
+
+class FirstDecorator(SceneNodeDecorator):
+    def getValue(self):
+        return 1
+
+    def fail(self):
+        raise ValueError("Failed")
+
+class SecondDecorator(SceneNodeDecorator):
+    def getValue(self):
+        return 2
+
+    def getSecond(self, value):
+        return value * 2
 
 class SceneNodeTest(unittest.TestCase):
     def setUp(self):
@@ -195,5 +217,156 @@ class SceneNodeTest(unittest.TestCase):
         self.assertEqual(node2.getWorldPosition(), Vector(15,10,10))
         pass
 
+    def test_lazyTransformation(self):
+        group = SceneNode()
+        children = [SceneNode(group) for i in range(10)]
+        for child in children:
+            child.getWorldPosition()
+
+        original_decompose = Matrix.decompose
+        calls = []
+        def countingDecompose(matrix):
+            calls.append(matrix)
+            return original_decompose(matrix)
+
+        with unittest.mock.patch.object(Matrix, "decompose", countingDecompose):
+            for i in range(20): # Moving the group only marks the children as changed.
+                group.translate(Vector(1, 0, 0))
+            self.assertEqual(len(calls), 0)
+
+            for child in children:
+                self.assertEqual(child.getWorldPosition(), Vector(20, 0, 0))
+            self.assertEqual(len(calls), len(children)) # Every child is only updated once.
+
+            children[0].getWorldPosition()
+            self.assertEqual(len(calls), len(children))
+
+    def test_transformationChangedOnce(self):
+        group = SceneNode()
+        children = [SceneNode(group) for i in range(3)]
+        grandchildren = [SceneNode(child) for child in children]
+
+        emitted = []
+        original_emit_change = SceneNode._emitChange
+        def recordingEmitChange(node, signal_name, *args):
+            if signal_name == "transformationChanged":
+                emitted.append(node)
+            original_emit_change(node, signal_name, *args)
+
+        with unittest.mock.patch.object(SceneNode, "_emitChange", recordingEmitChange):
+            group.translate(Vector(1, 0, 0))
+            grandchildren[0].getWorldPosition()
+            group.translate(Vector(1, 0, 0)) # Only the path to the updated grandchild is marked again.
+            children[1].translate(Vector(0, 1, 0))
+        self.assertEqual(emitted, [group, group, children[1]]) # Not the descendants that moved along.
+
+        self.assertEqual(grandchildren[0].getWorldPosition(), Vector(2, 0, 0))
+        self.assertEqual(grandchildren[1].getWorldPosition(), Vector(2, 1, 0))
+        self.assertEqual(grandchildren[2].getWorldPosition(), Vector(2, 0, 0))
+
+    def test_transformationNotCopied(self):
+        node = SceneNode()
+        node.translate(Vector(10, 0, 0))
+
+        # The same objects are returned until the node changes.
+        self.assertIs(node.getWorldTransformation(), node.getWorldTransformation())
+        self.assertIs(node.getOrientation(), node.getOrientation())
+
+        transformation = node.getLocalTransformation()
+        self.assertRaises(TypeError, transformation.translate, Vector(1, 0, 0))
+
+        node.translate(Vector(10, 0, 0))
+        self.assertEqual(transformation.getTranslation(), Vector(10, 0, 0)) # Earlier results are not affected by changes.
+        self.assertEqual(node.getLocalTransformation().getTranslation(), Vector(20, 0, 0))
+
+    def test_incrementalBoundingBox(self):
+        builder = MeshBuilder()
+        builder.addCube(10, 10, 10)
+        mesh = builder.build()
+
+        root = SceneNode()
+        group = SceneNode(root)
+        children = [SceneNode(group) for i in range(5)]
+        for index, child in enumerate(children):
+            child.setMeshData(mesh)
+            child.translate(Vector(20 * index, 0, 0))
+        self.assertEqual(root.getBoundingBox().right, 85)
+
+        original_get_extents = MeshData.getExtents
+        calls = []
+        def countingGetExtents(mesh_data, matrix = None):
+            calls.append(matrix)
+            return original_get_extents(mesh_data, matrix)
+
+        emitted = []
+        def onBoundingBoxChanged():
+            emitted.append(root)
+        root.boundingBoxChanged.connect(onBoundingBoxChanged)
+
+        application = unittest.mock.Mock(getMainThread = threading.current_thread) # Signals are only emitted with an application.
+        with unittest.mock.patch.object(MeshData, "getExtents", countingGetExtents), unittest.mock.patch.object(Signal, "_app", application):
+            with SceneNode.batchUpdate():
+                for i in range(10):
+                    children[-1].translate(Vector(1, 0, 0))
+            self.assertEqual(len(emitted), 1) # Coalesced for the whole batch.
+
+            self.assertEqual(root.getBoundingBox().right, 95)
+            self.assertEqual(len(calls), 1) # Only the moved child computes its extents again.
+
+            children[0].translate(Vector(-1, 0, 0))
+            children[0].translate(Vector(-1, 0, 0)) # Also emitted when the bounding box was not computed since.
+            self.assertEqual(len(emitted), 3)
+            self.assertEqual(root.getBoundingBox().left, -7)
+            self.assertEqual(len(calls), 2)
+
+            group.translate(Vector(0, 10, 0)) # The boxes of the children that moved along are out of date too.
+            self.assertEqual(len(emitted), 4)
+            self.assertEqual(children[1].getBoundingBox().bottom, 5)
+            self.assertEqual(group.getBoundingBox().bottom, 5)
+
+    def test_decorations(self):
+        node = SceneNode()
+        self.assertFalse(node.hasDecoration("getValue"))
+        self.assertIsNone(node.callDecoration("getValue"))
+
+        node.addDecorator(FirstDecorator())
+        node.addDecorator(SecondDecorator())
+        self.assertTrue(node.hasDecoration("getSecond"))
+        self.assertEqual(node.callDecoration("getValue"), 1) # The first decorator that has it.
+        self.assertEqual(node.callDecoration("getSecond", 21), 42)
+        self.assertIsNone(node.callDecoration("fail")) # Exceptions are logged.
+        self.assertFalse(node.hasDecoration("getMissing"))
+
+        node.removeDecorator(FirstDecorator)
+        self.assertEqual(node.callDecoration("getValue"), 2)
+        self.assertFalse(node.hasDecoration("fail"))
+
+        node.removeDecorators()
+        self.assertFalse(node.hasDecoration("getSecond"))
+
+    def test_sharedMeshData(self):
+        mesh = MeshData(vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]])
+        node = SceneNode()
+        node.setMeshData(mesh)
+        self.assertEqual(mesh.getReferences(), [node])
+        self.assertFalse(mesh.isShared())
+
+        copies = [deepcopy(node) for i in range(3)]
+        for node_copy in copies:
+            self.assertIs(node_copy.getMeshData(), mesh)
+        self.assertEqual(mesh.getReferenceCount(), 4)
+        self.assertTrue(mesh.isShared())
+
+        copies[0].setMeshData(None)
+        self.assertEqual(mesh.getReferenceCount(), 3)
+        copies[1].setCenterPosition(Vector(1, 0, 0))
+        self.assertIsNot(copies[1].getMeshData(), mesh)
+        self.assertEqual(copies[1].getMeshData().getReferences(), [copies[1]])
+        self.assertEqual(mesh.getReferenceCount(), 2)
+
+        del node_copy, copies
+        gc.collect()
+        self.assertEqual(mesh.getReferences(), [node]) # Deleted nodes are not kept alive.
+
 if __name__ == "__main__":
     unittest.main()
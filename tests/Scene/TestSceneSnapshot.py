@@ -0,0 +1,59 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import unittest
+
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshWriter import MeshWriter
+from UM.Scene.GroupDecorator import GroupDecorator
+from UM.Scene.Scene import Scene
+from UM.Scene.SceneNode import SceneNode
+
+class TestSceneSnapshot(unittest.TestCase):
+    def setUp(self):
+        builder = MeshBuilder()
+        builder.addCube(10, 10, 10)
+        self._mesh = builder.build()
+
+        self._scene = Scene()
+        self._group = SceneNode(self._scene.getRoot(), name = "Group")
+        self._group.addDecorator(GroupDecorator())
+        self._node = SceneNode(self._group, name = "Cube")
+        self._node.setMeshData(self._mesh)
+        self._group.translate(Vector(10, 0, 0))
+        self._node.translate(Vector(0, 0, 5))
+
+    def test_snapshot(self):
+        snapshot = self._scene.createSnapshot()
+        self.assertEqual(len(snapshot), 3)
+
+        node = snapshot.getSnapshotOf(self._node)
+        self.assertEqual(node.getName(), "Cube")
+        self.assertIs(node.getMeshData(), self._mesh) # Not copied.
+        self.assertEqual(node.getWorldPosition(), Vector(10, 0, 5))
+        self.assertEqual(node.getDepth(), 2)
+        self.assertIs(node.getParent(), snapshot.getSnapshotOf(self._group))
+        self.assertTrue(node.getParent().callDecoration("isGroup"))
+        self.assertIs(snapshot.getRoots()[0].getNode(), self._scene.getRoot())
+
+    def test_snapshotDoesNotChange(self):
+        snapshot = self._scene.createSnapshot([self._group])
+        self._group.translate(Vector(10, 0, 0))
+        self._node.setParent(self._scene.getRoot())
+
+        group = snapshot.getRoots()[0]
+        self.assertIs(group.getParent().getNode(), self._scene.getRoot())
+        self.assertEqual(group.getParent().getChildren(), (group, )) # Only the nodes in the snapshot.
+        self.assertIsNone(group.getParent().getParent())
+        self.assertEqual(group.getWorldPosition(), Vector(10, 0, 0))
+        self.assertEqual([child.getName() for child in group.getChildren()], ["Cube"])
+        self.assertEqual(group.getChildren()[0].getWorldPosition(), Vector(10, 0, 5))
+        self.assertEqual(self._node.getWorldPosition(), Vector(0, 0, 5))
+
+    def test_meshNodes(self):
+        snapshot = self._scene.createSnapshot()
+        self.assertEqual([node.getNode() for node in MeshWriter._meshNodes(snapshot.getRoots())], [self._node])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import itertools
+
+import numpy
+import pytest
+
+from UM.Arrange import Arrange
+from UM.Math.Polygon import Polygon
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Scene.SceneNode import SceneNode
+
+##  Creates a square polygon with its centre at a position.
+def createSquare(size, x = 0, z = 0):
+    half = size / 2
+    return Polygon(numpy.array([[x - half, z - half], [x + half, z - half], [x + half, z + half], [x - half, z + half]], numpy.float32))
+
+##  Checks whether the bounding boxes of two squares are at least spacing apart.
+def squaresApart(first, second, spacing):
+    first_points = first.getPoints()
+    second_points = second.getPoints()
+    gap_x = max(second_points[:, 0].min() - first_points[:, 0].max(), first_points[:, 0].min() - second_points[:, 0].max())
+    gap_z = max(second_points[:, 1].min() - first_points[:, 1].max(), first_points[:, 1].min() - second_points[:, 1].max())
+    return max(gap_x, gap_z) >= spacing - 1e-4
+
+def test_arrangePolygons():
+    arrange = Arrange(100, 100, spacing = 2, cell_size = 1)
+    squares = [createSquare(10 + i) for i in range(10)] #All on top of each other.
+
+    offsets = arrange.arrangePolygons(squares)
+
+    assert None not in offsets
+    placed = [square.translate(*offset) for square, offset in zip(squares, offsets)]
+    for square in placed: #Everything within the build area.
+        assert square.getPoints().min() >= -50
+        assert square.getPoints().max() <= 50
+    for first, second in itertools.combinations(placed, 2):
+        assert squaresApart(first, second, 2)
+
+def test_arrangeTooMany():
+    arrange = Arrange(30, 30, spacing = 2, cell_size = 1)
+    offsets = arrange.arrangePolygons([createSquare(20), createSquare(20)])
+
+    assert offsets[0] is not None
+    assert offsets[1] is None
+
+def test_occupy():
+    arrange = Arrange(100, 100, spacing = 0, cell_size = 1)
+    obstacle = createSquare(60)
+    arrange.occupy(obstacle)
+
+    square = createSquare(10)
+    offsets = arrange.arrangePolygons([square])
+
+    assert offsets[0] is not None
+    assert squaresApart(obstacle, square.translate(*offsets[0]), 0)
+
+def test_arrangeNodes():
+    nodes = []
+    for i in range(4):
+        builder = MeshBuilder()
+        builder.addCube(10, 10, 10)
+        node = SceneNode()
+        node.setMeshData(builder.build())
+        nodes.append(node)
+
+    operation, unplaced_nodes = Arrange(100, 100).arrange(nodes)
+    operation.redo()
+
+    assert unplaced_nodes == []
+    positions = [node.getWorldPosition() for node in nodes]
+    for first, second in itertools.combinations(positions, 2):
+        assert max(abs(first.x - second.x), abs(first.z - second.z)) >= 12 - 1e-4 #Size plus spacing.
+    for position in positions:
+        assert position.y == 0
@@ -0,0 +1,89 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import itertools
+
+import numpy
+import pytest
+
+from UM.CollisionDetector import CollisionDetector
+from UM.Math.Polygon import Polygon
+
+##  Creates random convex footprints, scattered over an area.
+def createFootprints(count, area = 100):
+    random = numpy.random.RandomState(42)
+    footprints = []
+    for i in range(count):
+        points = random.uniform(-1, 1, (10, 2)) * random.uniform(2, 10, 2) + random.uniform(0, area, 2)
+        footprints.append(Polygon(points).getConvexHull())
+    return footprints
+
+##  Gets the pairs of footprint indices that collide, computed one pair at a time.
+def bruteForceCollisions(footprints):
+    result = {}
+    for a, b in itertools.combinations(range(len(footprints)), 2):
+        penetration = footprints[a].intersectsPolygon(footprints[b])
+        if penetration is not None:
+            result[(a, b)] = penetration
+    return result
+
+def detectorCollisions(detector):
+    result = {}
+    for a, b, penetration in detector.getCollisions():
+        if a > b:
+            a, b = b, a
+            penetration = (-penetration[0], -penetration[1])
+        result[(a, b)] = penetration
+    return result
+
+def test_matchesIntersectsPolygon():
+    footprints = createFootprints(60)
+    detector = CollisionDetector()
+    for index, footprint in enumerate(footprints):
+        detector.setFootprint(index, footprint)
+
+    expected = bruteForceCollisions(footprints)
+    found = detectorCollisions(detector)
+    assert expected.keys() == found.keys()
+    assert len(found) > 0
+    for pair, penetration in found.items():
+        assert numpy.linalg.norm(penetration) == pytest.approx(numpy.linalg.norm(expected[pair]), abs = 1e-4)
+
+def test_penetrationSeparates():
+    square = Polygon(numpy.array([[0, 0], [10, 0], [10, 10], [0, 10]], numpy.float32))
+    detector = CollisionDetector()
+    detector.setFootprint("a", square)
+    detector.setFootprint("b", square.translate(8, 1))
+
+    penetration = detector.getCollisionsWith("a")["b"]
+    assert penetration == pytest.approx((-2, 0))
+    assert detector.getCollisionsWith("b")["a"] == pytest.approx((2, 0))
+
+    detector.setFootprint("a", square.translate(penetration[0] - 0.01, penetration[1]))
+    assert not detector.hasCollisions("a")
+    assert detector.getCollisions() == []
+
+def test_incremental():
+    footprints = createFootprints(40)
+    detector = CollisionDetector()
+    for index, footprint in enumerate(footprints):
+        detector.setFootprint(index, footprint)
+    detector.getCollisions()
+
+    #Move some footprints and remove one; the result must be the same as starting from scratch.
+    footprints[3] = footprints[3].translate(20, -5)
+    footprints[17] = footprints[17].translate(-30, 12)
+    detector.setFootprint(3, footprints[3])
+    detector.setFootprint(17, footprints[17])
+    detector.removeFootprint(0)
+    del footprints[0]
+
+    expected = {(a + 1, b + 1): penetration for (a, b), penetration in bruteForceCollisions(footprints).items()}
+    assert detectorCollisions(detector).keys() == expected.keys()
+
+def test_invalidFootprint():
+    detector = CollisionDetector()
+    detector.setFootprint("empty", Polygon())
+    detector.setFootprint("none", None)
+    assert detector.getCollisions() == []
+    assert detector.getCollisionsWith("empty") == {}
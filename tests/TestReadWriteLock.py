@@ -0,0 +1,95 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import threading
+import time
+
+import pytest
+
+from UM.ReadWriteLock import ReadWriteLock
+
+##  Run a function in another thread and return its result.
+def runInThread(function):
+    result = []
+    thread = threading.Thread(target = lambda: result.append(function()))
+    thread.start()
+    thread.join(5)
+    return result[0]
+
+##  Check whether another thread could acquire the read lock right now.
+def canRead(lock):
+    def tryRead():
+        if not lock.acquireRead(blocking = False):
+            return False
+        lock.releaseRead()
+        return True
+    return runInThread(tryRead)
+
+##  Check whether another thread could acquire the write lock right now.
+def canWrite(lock):
+    def tryWrite():
+        if not lock.acquireWrite(timeout = 0.01):
+            return False
+        lock.releaseWrite()
+        return True
+    return runInThread(tryWrite)
+
+def test_readersShareTheLock():
+    lock = ReadWriteLock()
+    with lock.read():
+        assert canRead(lock)
+        assert not canWrite(lock)
+
+def test_writerExcludesEveryone():
+    lock = ReadWriteLock()
+    with lock.write():
+        assert not canRead(lock)
+        assert not canWrite(lock)
+    assert canRead(lock)
+
+def test_waitingWriterHasPriority():
+    lock = ReadWriteLock()
+    lock.acquireRead()
+
+    writer_started = threading.Event()
+    def write():
+        writer_started.set()
+        with lock.write():
+            pass
+    writer = threading.Thread(target = write)
+    writer.start()
+    writer_started.wait(5)
+    while lock._waiting_writers == 0 and writer.is_alive():
+        time.sleep(0.001)
+
+    assert not canRead(lock) # New readers wait for the writer.
+    assert lock.acquireRead(blocking = False) # But the current reader can continue.
+    lock.releaseRead()
+
+    lock.releaseRead()
+    writer.join(5)
+    assert not writer.is_alive()
+
+def test_reentrant():
+    lock = ReadWriteLock()
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                pass
+        assert not canRead(lock)
+    assert canWrite(lock)
+
+def test_upgradeFails():
+    lock = ReadWriteLock()
+    with lock.read():
+        with pytest.raises(RuntimeError):
+            lock.acquireWrite()
+    with pytest.raises(RuntimeError):
+        lock.releaseRead()
+
+def test_usableAsLock():
+    lock = ReadWriteLock()
+    with lock:
+        assert not canRead(lock)
+    assert lock.acquire()
+    lock.release()
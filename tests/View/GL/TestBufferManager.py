@@ -0,0 +1,122 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import gc
+import unittest
+
+from UM.Mesh.MeshData import MeshData
+from UM.View.GL.BufferManager import BufferManager
+
+class FakeBuffer:
+    def __init__(self, size):
+        self.size = size
+        self.destroyed = 0
+
+    def destroy(self):
+        self.destroyed += 1
+
+def createBuffer(mesh):
+    buffer = FakeBuffer(100)
+    return buffer, buffer.size
+
+class TestBufferManager(unittest.TestCase):
+    def setUp(self):
+        self._manager = BufferManager(budget = 250)
+
+    def test_cache(self):
+        mesh = MeshData()
+        buffer = self._manager.getBuffer(mesh, "vertex", createBuffer)
+        self.assertIs(self._manager.getBuffer(mesh, "vertex", createBuffer), buffer)
+        self.assertIsNot(self._manager.getBuffer(mesh, "index", createBuffer), buffer)
+
+        statistics = self._manager.getStatistics()
+        self.assertEqual(statistics["buffers"], 2)
+        self.assertEqual(statistics["uploads"], 2)
+        self.assertEqual(statistics["upload_bytes"], 200)
+        self.assertEqual(self._manager.getMemoryUsage(), 200)
+
+    def test_forceRecreate(self):
+        mesh = MeshData()
+        buffer = self._manager.getBuffer(mesh, "vertex", createBuffer)
+        new_buffer = self._manager.getBuffer(mesh, "vertex", createBuffer, force_recreate = True)
+        self.assertIsNot(new_buffer, buffer)
+        self.assertEqual(buffer.destroyed, 1)
+        self.assertEqual(self._manager.getMemoryUsage(), 100)
+
+    def test_evictLeastRecentlyUsed(self):
+        meshes = [MeshData() for i in range(3)]
+        buffers = [self._manager.getBuffer(mesh, "vertex", createBuffer) for mesh in meshes]
+
+        self._manager.nextFrame()
+        self._manager.getBuffer(meshes[0], "vertex", createBuffer) # Now meshes[1] is the least recently used.
+        new_mesh = MeshData()
+        self._manager.getBuffer(new_mesh, "vertex", createBuffer)
+
+        # Buffers of the previous frame are evicted until the memory use is within budget.
+        self.assertEqual([buffer.destroyed for buffer in buffers], [0, 1, 1])
+        self.assertEqual(self._manager.getMemoryUsage(), 200)
+        self.assertEqual(self._manager.getStatistics()["evictions"], 2)
+
+    def test_keepBuffersOfCurrentFrame(self):
+        meshes = [MeshData() for i in range(4)]
+        buffers = [self._manager.getBuffer(mesh, "vertex", createBuffer) for mesh in meshes]
+        self.assertEqual([buffer.destroyed for buffer in buffers], [0, 0, 0, 0])
+        self.assertEqual(self._manager.getMemoryUsage(), 400) # Over budget, but all are needed in this frame.
+
+        self._manager.nextFrame()
+        self._manager.setBudget(150)
+        self.assertEqual([buffer.destroyed for buffer in buffers], [1, 1, 1, 0])
+        self.assertEqual(self._manager.getMemoryUsage(), 100)
+
+        # An evicted buffer is created again when it is needed.
+        self.assertIsNot(self._manager.getBuffer(meshes[0], "vertex", createBuffer), buffers[0])
+
+    def test_releaseDeletedMeshes(self):
+        mesh = MeshData()
+        buffer = self._manager.getBuffer(mesh, "vertex", createBuffer)
+        del mesh
+        gc.collect()
+        self.assertEqual(buffer.destroyed, 0) # Only destroyed at the start of a frame.
+
+        self._manager.nextFrame()
+        self.assertEqual(buffer.destroyed, 1)
+        self.assertEqual(self._manager.getStatistics()["buffers"], 0)
+        self.assertEqual(self._manager.getMemoryUsage(), 0)
+
+    def test_releaseBuffers(self):
+        mesh = MeshData()
+        other_mesh = MeshData()
+        vertex_buffer = self._manager.getBuffer(mesh, "vertex", createBuffer)
+        index_buffer = self._manager.getBuffer(mesh, "index", createBuffer)
+        other_buffer = self._manager.getBuffer(other_mesh, "vertex", createBuffer)
+
+        self._manager.releaseBuffers(mesh)
+        self.assertEqual((vertex_buffer.destroyed, index_buffer.destroyed, other_buffer.destroyed), (1, 1, 0))
+
+        self._manager.clear()
+        self.assertEqual(other_buffer.destroyed, 1)
+        self.assertEqual(self._manager.getMemoryUsage(), 0)
+    def test_releaseDeletedOwners(self):
+        class Shader:
+            pass
+
+        mesh = MeshData()
+        shader = Shader()
+        other_shader = Shader()
+        buffer_type = self._manager.getOwnedBufferType(shader, "vertex_array")
+        self.assertEqual(self._manager.getOwnedBufferType(shader, "vertex_array"), buffer_type)
+        self.assertNotEqual(self._manager.getOwnedBufferType(other_shader, "vertex_array"), buffer_type)
+
+        buffer = self._manager.getBuffer(mesh, buffer_type, createBuffer)
+        other_buffer = self._manager.getBuffer(mesh, self._manager.getOwnedBufferType(other_shader, "vertex_array"), createBuffer)
+        del shader
+        gc.collect()
+        self._manager.nextFrame()
+        self.assertEqual((buffer.destroyed, other_buffer.destroyed), (1, 0))
+        self.assertEqual(self._manager.getMemoryUsage(), 100)
+
+        # A new object gets a new buffer type, even if it has the id of the deleted one.
+        self.assertNotEqual(self._manager.getOwnedBufferType(Shader(), "vertex_array"), buffer_type)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import numpy
+import numpy.testing
+import unittest
+
+from UM.Mesh.MeshData import MeshData
+from UM.View.GL.VertexLayout import VertexLayout
+
+class TestVertexLayout(unittest.TestCase):
+    def test_fromMesh(self):
+        mesh = MeshData(vertices = [[0, 0, 0], [1, 0, 0]], colors = [[1, 0, 0, 1], [0, 1, 0, 1]])
+        layout = VertexLayout.fromMesh(mesh)
+        self.assertIs(VertexLayout.fromMesh(MeshData(vertices = [[0, 0, 0]], colors = [[1, 1, 1, 1]])), layout)
+        self.assertIsNot(VertexLayout.fromMesh(MeshData(vertices = [[0, 0, 0]])), layout)
+
+        self.assertEqual(layout.getAttributeNames(), ["a_vertex", "a_color"])
+        self.assertEqual(layout.getStride(), 7 * 4)
+        self.assertEqual(layout.getOffset("vertex"), 0)
+        self.assertEqual(layout.getOffset("color"), 3 * 4)
+        self.assertIsNone(layout.getOffset("normal"))
+
+    def test_createData(self):
+        vertices = numpy.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype = numpy.float32)
+        normals = numpy.array([[0, 0, 1]] * 3, dtype = numpy.float32)
+        uvs = numpy.array([[0, 0], [1, 0], [0, 1]], dtype = numpy.float32)
+        mesh = MeshData(vertices = vertices, normals = normals, uvs = uvs)
+        layout = VertexLayout.fromMesh(mesh)
+
+        data = layout.createData(mesh)
+        self.assertEqual(data.nbytes, 3 * layout.getStride())
+        numpy.testing.assert_array_equal(data["vertex"], vertices)
+        numpy.testing.assert_array_equal(data["normal"], normals)
+        numpy.testing.assert_array_equal(data["uv"], uvs)
+
+        # The attributes of a vertex are next to each other.
+        interleaved = numpy.frombuffer(data.tobytes(), dtype = numpy.float32).reshape(3, 8)
+        numpy.testing.assert_array_equal(interleaved, numpy.hstack((vertices, normals, uvs)))
+
+    def test_emptyMesh(self):
+        mesh = MeshData()
+        self.assertEqual(VertexLayout.fromMesh(mesh).createData(mesh).nbytes, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import numpy
+import numpy.testing
+import unittest
+import unittest.mock
+from collections import OrderedDict
+
+from UM.Math.Matrix import Matrix
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshData import MeshData
+from UM.View.GL.OpenGL import OpenGL
+from UM.View.RenderBatch import RenderBatch
+
+class TestRenderBatch(unittest.TestCase):
+    def setUp(self):
+        self._opengl = unittest.mock.Mock()
+        self._patch = unittest.mock.patch.object(OpenGL, "_instance", self._opengl)
+        self._patch.start()
+        self._gl = self._opengl.getBindingsObject()
+
+        self._camera = unittest.mock.Mock()
+        self._camera.getWorldTransformation.return_value = Matrix()
+        self._camera.getProjectionMatrix.return_value = Matrix()
+        self._camera.getWorldPosition.return_value = Vector(0, 0, 0)
+
+    def tearDown(self):
+        self._patch.stop()
+
+    def _createShader(self, instance_attributes = None):
+        shader = unittest.mock.Mock()
+        shader.getInstanceAttributes.return_value = OrderedDict(instance_attributes or [])
+        return shader
+
+    def _createMesh(self):
+        return MeshData(vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0]], normals = [[0, 0, 1], [0, 0, 1], [0, 0, 1]], indices = [[0, 1, 2]])
+
+    def test_instances(self):
+        shader = self._createShader()
+        batch = RenderBatch(shader)
+        mesh = self._createMesh()
+        other_mesh = self._createMesh()
+
+        for i in range(5):
+            transformation = Matrix()
+            transformation.setByTranslation(Vector(i, 0, 0))
+            batch.addItem(transformation, mesh)
+        batch.addItem(Matrix(), other_mesh, { "diffuse_color": [1, 0, 0, 1] })
+        self.assertEqual(len(batch.items), 6)
+        self.assertEqual(list(batch.instances.keys()), [mesh, other_mesh])
+
+        batch.render(self._camera)
+
+        shader.bind.assert_called_once_with()
+        self.assertEqual(self._opengl.createVertexArrayObject.call_count, 2) # Once per mesh, not per item.
+        self.assertEqual(self._opengl.createVertexArrayObject().bind.call_count, 2)
+        self.assertFalse(shader.enableAttribute.called) # Stored in the vertex array object.
+        self.assertEqual(self._gl.glDrawElements.call_count, 6)
+
+        model_view_projection_matrices = [call[1]["model_view_projection_matrix"] for call in shader.updateBindings.call_args_list if "model_view_projection_matrix" in call[1]]
+        self.assertEqual(len(model_view_projection_matrices), 6)
+        for i in range(5):
+            self.assertEqual(list(model_view_projection_matrices[i][:3, 3]), [i, 0, 0])
+        shader.updateBindings.assert_any_call(diffuse_color = [1, 0, 0, 1])
+
+    def test_instancedDraw(self):
+        shader = self._createShader([("a_modelMatrix", "model_matrix"), ("a_normalMatrix", "normal_matrix")])
+        batch = RenderBatch(shader)
+        mesh = self._createMesh()
+        for i in range(3):
+            transformation = Matrix()
+            transformation.setByTranslation(Vector(i, 0, 0))
+            batch.addItem(transformation, mesh)
+        batch.render(self._camera)
+
+        instance_buffer = self._opengl.getInstanceBuffer()
+        self.assertFalse(self._gl.glDrawElements.called)
+        instance_buffer.drawElements.assert_called_once_with(RenderBatch.RenderMode.Triangles, 3, self._gl.GL_UNSIGNED_INT, 3)
+        self.assertEqual(instance_buffer.enableAttribute.call_args_list, [
+            unittest.mock.call(shader, "a_modelMatrix", "matrix4f", 0),
+            unittest.mock.call(shader, "a_normalMatrix", "matrix4f", 64)
+        ])
+        instance_buffer.disableAttributes.assert_called_once_with(shader)
+
+        # A row per item, with the matrices in column-major order.
+        data = instance_buffer.setData.call_args[0][0]
+        self.assertEqual(data.shape, (3, 32))
+        self.assertEqual(data.dtype, numpy.float32)
+        for i in range(3):
+            self.assertEqual(list(data[i, 12:16]), [i, 0, 0, 1])
+            self.assertEqual(list(data[i, 16:32]), list(numpy.identity(4).ravel()))
+
+    def test_instancedDrawFallback(self):
+        self._opengl.getInstanceBuffer.return_value = None
+        shader = self._createShader([("a_modelMatrix", "model_matrix")])
+        batch = RenderBatch(shader)
+        mesh = self._createMesh()
+        for i in range(3):
+            transformation = Matrix()
+            transformation.setByTranslation(Vector(i, 0, 0))
+            batch.addItem(transformation, mesh)
+        batch.render(self._camera)
+
+        # Without instanced arrays, the matrix attributes are set for every draw.
+        self.assertEqual(self._gl.glDrawElements.call_count, 3)
+        self.assertEqual(shader.setAttributeValue.call_count, 3)
+        for i, call in enumerate(shader.setAttributeValue.call_args_list):
+            self.assertEqual(call[0][0], "a_modelMatrix")
+            self.assertEqual(list(call[0][1][:3, 3]), [i, 0, 0])
+
+    def test_instancedDrawWithUniforms(self):
+        shader = self._createShader([("a_modelMatrix", "model_matrix")])
+        batch = RenderBatch(shader)
+        mesh = self._createMesh()
+        batch.addItem(Matrix(), mesh)
+        batch.addItem(Matrix(), mesh, { "diffuse_color": [1, 0, 0, 1] })
+        batch.render(self._camera)
+
+        # Uniforms of an item can not differ per instance.
+        self.assertFalse(self._opengl.getInstanceBuffer.called)
+        self.assertEqual(self._gl.glDrawElements.call_count, 2)
+
+    def test_withoutVertexArrayObjects(self):
+        self._opengl.createVertexArrayObject.return_value = None
+        shader = self._createShader()
+        batch = RenderBatch(shader)
+        mesh = self._createMesh()
+        for i in range(3):
+            batch.addItem(Matrix(), mesh)
+        batch.render(self._camera)
+
+        self.assertEqual(self._opengl.createVertexBuffer.call_count, 1)
+        self.assertEqual(self._gl.glDrawElements.call_count, 3)
+        # The vertex data is interleaved, so every attribute is read with the stride of a vertex.
+        self.assertEqual(shader.enableAttribute.call_args_list, [
+            unittest.mock.call("a_vertex", "vector3f", 0, 24),
+            unittest.mock.call("a_normal", "vector3f", 12, 24)
+        ])
+        self.assertEqual(shader.disableAttribute.call_count, 2)
+
+    def test_itemMatrices(self):
+        shader = self._createShader()
+        batch = RenderBatch(shader)
+        camera_transformation = Matrix()
+        camera_transformation.setByTranslation(Vector(0, 0, 10))
+        self._camera.getWorldTransformation.return_value = camera_transformation
+
+        transformations = []
+        for scale in (1, 2, 0): # Includes a singular matrix.
+            transformation = Matrix()
+            transformation.setByScaleFactor(scale)
+            transformation.translate(Vector(1, 2, 3))
+            transformations.append(transformation)
+            batch.addItem(transformation, self._createMesh())
+        batch.render(self._camera)
+
+        calls = [call[1] for call in shader.updateBindings.call_args_list if "model_matrix" in call[1]]
+        self.assertEqual(len(calls), 3)
+        view_matrix = camera_transformation.getInverse()
+        for transformation, bindings in zip(transformations, calls):
+            numpy.testing.assert_array_almost_equal(bindings["model_matrix"], transformation.getData())
+            numpy.testing.assert_array_almost_equal(bindings["model_view_matrix"], transformation.preMultiply(view_matrix, copy = True).getData())
+
+            expected_normal_matrix = transformation.copy()
+            expected_normal_matrix.setRow(3, [0, 0, 0, 1])
+            expected_normal_matrix.setColumn(3, [0, 0, 0, 1])
+            expected_normal_matrix = expected_normal_matrix.getInverse().getTransposed()
+            numpy.testing.assert_array_almost_equal(bindings["normal_matrix"], expected_normal_matrix.getData())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import unittest
+
+from UM.Math.Color import Color
+from UM.View.SelectionColorAllocator import SelectionColorAllocator
+
+class TestSelectionColorAllocator(unittest.TestCase):
+    def test_allocate(self):
+        allocator = SelectionColorAllocator()
+        self.assertEqual([allocator.allocate(object_id) for object_id in (100, 200, 300)], [1, 2, 3])
+        self.assertEqual(allocator.allocate(200), 2) # An object keeps its code.
+        self.assertEqual(len(allocator), 3)
+
+        self.assertEqual(allocator.getId(2), 200)
+        self.assertIsNone(allocator.getId(0))
+        self.assertIsNone(allocator.getId(4))
+        self.assertIsNone(allocator.getId(-1))
+
+    def test_free(self):
+        allocator = SelectionColorAllocator()
+        for object_id in range(10):
+            allocator.allocate(object_id)
+
+        allocator.free(7)
+        allocator.free(3)
+        allocator.free(3) # Freeing twice has no effect.
+        self.assertIsNone(allocator.getId(4))
+        self.assertIsNone(allocator.getCode(3))
+
+        # The smallest free codes are used first.
+        self.assertEqual(allocator.allocate(100), 4)
+        self.assertEqual(allocator.allocate(101), 8)
+        self.assertEqual(allocator.allocate(102), 11)
+
+    def test_reservedCodes(self):
+        allocator = SelectionColorAllocator(reserved_codes = (2, 3))
+        self.assertEqual([allocator.allocate(object_id) for object_id in range(3)], [1, 4, 5])
+        self.assertIsNone(allocator.getId(2))
+
+    def test_overflow(self):
+        allocator = SelectionColorAllocator()
+        allocator._next_code = SelectionColorAllocator.MaximumCode
+        allocator._ids.extend([None] * (SelectionColorAllocator.MaximumCode - 1))
+        self.assertEqual(allocator.allocate(1), SelectionColorAllocator.MaximumCode)
+        with self.assertRaises(OverflowError):
+            allocator.allocate(2)
+
+    def test_colors(self):
+        self.assertEqual(SelectionColorAllocator.codeToColor(0x123456), Color(0x12, 0x34, 0x56, 255))
+        self.assertEqual(SelectionColorAllocator.codeToColor(0x123456, 0).a, 0)
+        self.assertEqual(SelectionColorAllocator.colorToCode(0x12, 0x34, 0x56), 0x123456)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import pytest
+
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshData import MeshData
+from UM.Scene.Camera import Camera
+from UM.Scene.SceneNode import SceneNode
+from UM.Scene.Selection import Selection
+from UM.Scene.ToolHandle import ToolHandle
+from UM.View.SelectionPass import SelectionPass
+
+@pytest.fixture()
+def selection_pass(application, opengl, monkeypatch):
+    renderer = type("WindowRenderer", (), { "getWindowSize": lambda self: (100, 50), "getRecordingStatistics": lambda self: None })()
+    monkeypatch.setattr(application, "getRenderer", lambda: renderer)
+
+    scene = application.getController().getScene()
+    Camera("camera", scene.getRoot())
+    scene.setActiveCamera("camera")
+
+    node = SceneNode(scene.getRoot())
+    node.setMeshData(MeshData(vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0]], indices = [[0, 1, 2]]))
+    node.setSelectable(True)
+    return SelectionPass(100, 50)
+
+def renderCount(opengl):
+    return len(opengl.getBindingsObject().getCalls("bindFrameBuffer"))
+
+def test_renderOnlyWhenChanged(application, opengl, selection_pass):
+    scene = application.getController().getScene()
+    selection_pass.render()
+    assert renderCount(opengl) == 1
+
+    selection_pass.render()
+    assert renderCount(opengl) == 1 # Nothing changed, so the selection buffer is still valid.
+
+    scene.getActiveCamera().setPosition(Vector(0, 0, 10))
+    selection_pass.render()
+    assert renderCount(opengl) == 2
+
+    node = scene.getRoot().getChildren()[-1]
+    Selection.add(node)
+    selection_pass.render()
+    assert renderCount(opengl) == 3
+    Selection.clear()
+
+    selection_pass.setSize(200, 100)
+    selection_pass.render()
+    selection_pass.invalidate()
+    selection_pass.render()
+    assert renderCount(opengl) == 5
+
+    node.setVisible(False) # Hidden nodes can not be picked.
+    selection_pass.render()
+    assert renderCount(opengl) == 6
+
+def test_getIdAtPosition(application, opengl, selection_pass):
+    selection_pass.render()
+    node = application.getController().getScene().getRoot().getChildren()[-1]
+    assert selection_pass._color_allocator.getCode(id(node)) == 1 # The first node gets the first color.
+    selection_pass._fbo.contents[20, 75] = [0, 0, 1, 0]
+    selection_pass._fbo.contents[40, 10] = [0, 0, 255, 255] # The color of the Y axis of tool handles.
+
+    assert selection_pass.getIdAtPosition(0.5, -0.2) == id(node)
+    assert selection_pass.getIdAtPosition(0, 0) is None
+    assert selection_pass.getIdAtPosition(-0.79, 0.62) == ToolHandle.YAxis
+    assert selection_pass.getIdAtPosition(1.5, 0) is None # Outside the window.
+
+    # Only the pixel at the position is read back.
+    reads = opengl.getBindingsObject().getCalls("readFrameBuffer")
+    assert [read[2:] for read in reads] == [(75, 20, 1, 1), (50, 25, 1, 1), (10, 40, 1, 1)]
+
+def test_reuseColors(application, opengl, selection_pass):
+    scene = application.getController().getScene()
+    mesh = MeshData(vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0]], indices = [[0, 1, 2]])
+    nodes = []
+    for i in range(3):
+        node = SceneNode(scene.getRoot())
+        node.setMeshData(mesh)
+        node.setSelectable(True)
+        nodes.append(node)
+    selection_pass.render()
+    assert [selection_pass._color_allocator.getCode(id(node)) for node in nodes] == [2, 3, 4]
+
+    nodes[0].setParent(None)
+    selection_pass.render()
+    assert selection_pass._color_allocator.getCode(id(nodes[0])) is None
+    assert selection_pass._color_allocator.getId(2) is None
+
+    node = SceneNode(scene.getRoot())
+    node.setMeshData(mesh)
+    node.setSelectable(True)
+    selection_pass.render()
+    assert selection_pass._color_allocator.getCode(id(node)) == 2 # The freed color is used again.
@@ -0,0 +1,26 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import numpy
+import pytest
+
+from UM.Arrange import Arrange
+from UM.Math.Polygon import Polygon
+
+##  Creates random convex footprints of a few millimetres across.
+def createFootprints(count):
+    random = numpy.random.RandomState(1337)
+    footprints = []
+    for i in range(count):
+        points = random.uniform(-1, 1, (12, 2)) * random.uniform(3, 8, 2)
+        footprints.append(Polygon(points.astype(numpy.float32)).getConvexHull())
+    return footprints
+
+benchmark_arrange_data = [50, 200, 500]
+
+@pytest.mark.parametrize("count", benchmark_arrange_data)
+def benchmark_arrangePolygons(benchmark, count):
+    footprints = createFootprints(count)
+
+    offsets = benchmark(lambda: Arrange(300, 300, spacing = 2, cell_size = 1).arrangePolygons(footprints))
+    assert None not in offsets
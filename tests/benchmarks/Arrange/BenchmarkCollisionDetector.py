@@ -0,0 +1,43 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import numpy
+import pytest
+
+from UM.CollisionDetector import CollisionDetector
+from UM.Math.Polygon import Polygon
+
+##  Creates random convex footprints scattered over a build plate, so some of them overlap.
+def createFootprints(count):
+    random = numpy.random.RandomState(1337)
+    footprints = []
+    for i in range(count):
+        points = random.uniform(-1, 1, (12, 2)) * random.uniform(3, 8, 2) + random.uniform(-150, 150, 2)
+        footprints.append(Polygon(points).getConvexHull())
+    return footprints
+
+benchmark_collisions_data = [100, 500, 2000]
+
+@pytest.mark.parametrize("count", benchmark_collisions_data)
+def benchmark_getCollisions(benchmark, count):
+    footprints = createFootprints(count)
+
+    def detect():
+        detector = CollisionDetector()
+        for index, footprint in enumerate(footprints):
+            detector.setFootprint(index, footprint)
+        return detector.getCollisions()
+    benchmark(detect)
+
+@pytest.mark.parametrize("count", benchmark_collisions_data)
+def benchmark_moveOneNode(benchmark, count):
+    footprints = createFootprints(count)
+    detector = CollisionDetector()
+    for index, footprint in enumerate(footprints):
+        detector.setFootprint(index, footprint)
+    detector.getCollisions()
+
+    def move():
+        detector.setFootprint(0, footprints[0].translate(1, 0))
+        return detector.getCollisions()
+    benchmark(move)
@@ -0,0 +1,26 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import math
+
+import pytest
+
+from UM.Math.Matrix import Matrix
+from UM.Math.Vector import Vector
+
+def createTransformation():
+    matrix = Matrix()
+    matrix.setByRotationAxis(math.pi / 3, Vector(1, 1, 0))
+    matrix.translate(Vector(10, 20, 30))
+    return matrix
+
+def benchmark_getData(benchmark):
+    benchmark(createTransformation().getData)
+
+def benchmark_decompose(benchmark):
+    benchmark(createTransformation().decompose)
+
+def benchmark_multiplyCopy(benchmark):
+    first = createTransformation()
+    second = createTransformation()
+    benchmark(first.multiply, second, copy = True)
@@ -0,0 +1,43 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import pytest
+
+from UM.Math.Vector import Vector
+
+def benchmark_create(benchmark):
+    benchmark(Vector, 1.0, 2.0, 3.0)
+
+def benchmark_add(benchmark):
+    first = Vector(1, 2, 3)
+    second = Vector(4, 5, 6)
+    benchmark(first.__add__, second)
+
+def benchmark_multiplyScalar(benchmark):
+    vector = Vector(1, 2, 3)
+    benchmark(vector.__mul__, 2.5)
+
+def benchmark_dot(benchmark):
+    first = Vector(1, 2, 3)
+    second = Vector(4, 5, 6)
+    benchmark(first.dot, second)
+
+def benchmark_cross(benchmark):
+    first = Vector(1, 2, 3)
+    second = Vector(4, 5, 6)
+    benchmark(first.cross, second)
+
+def benchmark_normalized(benchmark):
+    vector = Vector(1, 2, 3)
+    benchmark(vector.normalized)
+
+##  A typical chain of vector math, as done by tools when handling events.
+def benchmark_arithmeticChain(benchmark):
+    origin = Vector(10, 0, 10)
+    direction = Vector(0.3, -1, 0.2)
+
+    def chain():
+        point = origin + direction * 5.0
+        offset = (point - origin).normalized()
+        return offset.dot(direction) + offset.cross(Vector.Unit_Y).length()
+    benchmark(chain)
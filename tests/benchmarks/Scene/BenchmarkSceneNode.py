@@ -0,0 +1,74 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import pytest
+
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Scene.GroupDecorator import GroupDecorator
+from UM.Scene.SceneNode import SceneNode
+from UM.Scene.SceneNodeDecorator import SceneNodeDecorator
+
+benchmark_drag_group_data = [10, 200]
+
+##  Moves a group a few times, as a drag over several mouse events does, and then reads the world transformations of the children once, as a frame does.
+@pytest.mark.parametrize("child_count", benchmark_drag_group_data)
+def benchmark_dragGroup(benchmark, child_count):
+    root = SceneNode()
+    group = SceneNode(root)
+    children = [SceneNode(group) for i in range(child_count)]
+
+    def drag():
+        for i in range(5):
+            group.translate(Vector(0.1, 0, 0), SceneNode.TransformSpace.World)
+        for child in children:
+            child.getWorldTransformation()
+    benchmark(drag)
+
+benchmark_move_in_assembly_data = [10, 200]
+
+##  Moves one part of a large group a few times and then reads the bounding box of the scene, as a frame does.
+@pytest.mark.parametrize("child_count", benchmark_move_in_assembly_data)
+def benchmark_moveInAssembly(benchmark, child_count):
+    builder = MeshBuilder()
+    builder.addCube(10, 10, 10)
+    mesh = builder.build()
+
+    root = SceneNode()
+    group = SceneNode(root)
+    children = []
+    for i in range(child_count):
+        child = SceneNode(group)
+        child.setMeshData(mesh)
+        child.translate(Vector(20 * i, 0, 0))
+        children.append(child)
+    root.getBoundingBox()
+
+    def move():
+        for i in range(5):
+            children[0].translate(Vector(0.1, 0, 0))
+        root.getBoundingBox()
+    benchmark(move)
+
+class ExampleDecorator(SceneNodeDecorator):
+    def getExample(self):
+        return 1
+
+class OtherDecorator(SceneNodeDecorator):
+    def getOther(self):
+        return 2
+
+benchmark_call_decoration_data = ["isGroup", "getExample", "getMissing"]
+
+##  Calls a decoration on a node with a few decorators, as the loops over all nodes in tools and views do.
+@pytest.mark.parametrize("decoration", benchmark_call_decoration_data)
+def benchmark_callDecoration(benchmark, decoration):
+    node = SceneNode()
+    node.addDecorator(OtherDecorator())
+    node.addDecorator(ExampleDecorator())
+    node.addDecorator(GroupDecorator())
+
+    def call():
+        for i in range(1000):
+            node.callDecoration(decoration)
+    benchmark(call)
@@ -0,0 +1,64 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import math
+import os
+
+import pytest
+
+from PyQt5.QtGui import QGuiApplication
+
+from UM.Math.Matrix import Matrix
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Scene.Camera import Camera
+from UM.Scene.Scene import Scene
+from UM.Scene.SceneNode import SceneNode
+
+##  Create a scene with a grid of cubes that all fit in the view of a camera.
+#
+#   \return A tuple of the scene and the camera.
+def createScene(node_count):
+    builder = MeshBuilder()
+    builder.addCube(8, 8, 8)
+    mesh = builder.build()
+
+    scene = Scene()
+    columns = math.ceil(math.sqrt(node_count))
+    for i in range(node_count):
+        node = SceneNode(scene.getRoot())
+        node.setMeshData(mesh)
+        node.setPosition(Vector((i % columns - columns / 2) * 10, 0, (i // columns - columns / 2) * 10))
+
+    camera = Camera("benchmark", scene.getRoot())
+    camera.setPosition(Vector(0, columns * 10, columns * 10))
+    camera.lookAt(Vector(0, 0, 0))
+    projection = Matrix()
+    projection.setPerspective(30, 1, 1, columns * 50)
+    camera.setProjectionMatrix(projection)
+    scene.setActiveCamera("benchmark")
+    return scene, camera
+
+benchmark_renderImage_data = [10, 100, 1000]
+
+##  Renders a frame of a scene of many nodes offscreen, including reading back the image.
+#
+#   This needs an OpenGL context, which may be a software implementation such
+#   as Mesa's llvmpipe. The benchmark is skipped when none is available,
+#   unless URANIUM_REQUIRE_OPENGL is set.
+@pytest.mark.parametrize("node_count", benchmark_renderImage_data)
+def benchmark_renderImage(benchmark, node_count):
+    from UM.Qt.OffscreenRenderer import OffscreenRenderer
+
+    application = QGuiApplication.instance() or QGuiApplication([]) # Must be kept alive while rendering.
+    scene, camera = createScene(node_count)
+    try:
+        renderer = OffscreenRenderer(scene, 256, 256)
+    except RuntimeError:
+        if os.environ.get("URANIUM_REQUIRE_OPENGL"):
+            raise
+        pytest.skip("No OpenGL context available to render offscreen")
+
+    renderer.renderImage(camera) # Upload the buffers before measuring.
+    benchmark(renderer.renderImage, camera)
+    renderer.destroy()
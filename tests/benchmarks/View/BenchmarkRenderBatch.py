@@ -0,0 +1,89 @@
+# Copyright (c) 2016 Ultimaker B.V.
+# Uranium is released under the terms of the AGPLv3 or higher.
+
+import unittest.mock
+
+import pytest
+
+from UM.Math.Matrix import Matrix
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.View.GL.OpenGL import OpenGL
+from UM.View.GL.ShaderProgram import ShaderProgram
+from UM.View.RenderBatch import RenderBatch
+
+##  A shader that only resolves its bindings, so the benchmark measures the work done by the batch.
+class NullShaderProgram(ShaderProgram):
+    def __init__(self):
+        super().__init__()
+        for name in ("model_matrix", "normal_matrix", "model_view_matrix", "model_view_projection_matrix"):
+            self.addBinding(name, name)
+
+    def setUniformValue(self, name, value, **kwargs):
+        pass
+
+    def enableAttribute(self, name, type, offset, stride = 0):
+        pass
+
+    def disableAttribute(self, name):
+        pass
+
+    def bind(self):
+        pass
+
+    def release(self):
+        pass
+
+##  OpenGL bindings where every function does nothing.
+class NullGL:
+    def __getattr__(self, name):
+        if name.startswith("GL_"):
+            value = 0
+        else:
+            value = lambda *args: None
+        setattr(self, name, value) # Look it up only once.
+        return value
+
+class NullBuffer:
+    def bind(self):
+        pass
+
+    def release(self):
+        pass
+
+class NullOpenGL(OpenGL):
+    def __init__(self):
+        self._gl = NullGL()
+        self._buffer = NullBuffer()
+
+    def getBindingsObject(self):
+        return self._gl
+
+    def createVertexBuffer(self, mesh, **kwargs):
+        return self._buffer
+
+    def createIndexBuffer(self, mesh, **kwargs):
+        return self._buffer
+
+benchmark_render_data = [10, 300]
+
+##  Renders a batch with many copies of one part, as a frame of a full build plate does.
+@pytest.mark.parametrize("item_count", benchmark_render_data)
+def benchmark_render(benchmark, item_count):
+    builder = MeshBuilder()
+    builder.addCube(10, 10, 10)
+    mesh = builder.build()
+
+    camera = unittest.mock.Mock()
+    camera.getWorldTransformation.return_value = Matrix()
+    camera.getProjectionMatrix.return_value = Matrix()
+    camera.getWorldPosition.return_value = Vector(0, 0, 0)
+
+    with unittest.mock.patch.object(OpenGL, "_instance", NullOpenGL()):
+        batch = RenderBatch(NullShaderProgram())
+        for i in range(item_count):
+            transformation = Matrix()
+            transformation.setByTranslation(Vector(i, 0, 0))
+            batch.addItem(transformation, mesh)
+
+        benchmark(batch.render, camera)
@@ -1,18 +1,20 @@
 # Copyright (c) 2016 Ultimaker B.V.
 # Uranium is released under the terms of the AGPLv3 or higher.
 
+import warnings
+
 import pytest
 
 warn = True
 
 @pytest.hookimpl
-def pytest_ignore_collect(path, config):
+def pytest_ignore_collect(collection_path, config):
     if config.pluginmanager.hasplugin("pytest-benchmark"):
         return False
     else:
         global warn
         if warn:
-            config.warn("", "Skipping benchmarks because pytest-benchmark plugin was not found.", "tests/benchmarks/conftest.py")
+            warnings.warn("Skipping benchmarks because pytest-benchmark plugin was not found.")
             warn = False
 
         return True
@@ -1,11 +1,16 @@
 # Copyright (c) 2016 Ultimaker B.V.
 # Uranium is released under the terms of the AGPLv3 or higher.
 
+import numpy
 import pytest
 
 from UM.Application import Application
 from UM.Signal import Signal
 from UM.PluginRegistry import PluginRegistry
+from UM.View.GL.BufferManager import BufferManager
+from UM.View.GL.FrameBufferObject import FrameBufferObject
+from UM.View.GL.OpenGL import OpenGL
+from UM.View.GL.ShaderProgram import ShaderProgram
 
 class FixtureApplication(Application):
     def __init__(self):
@@ -30,3 +35,124 @@ def plugin_registry(application):
     plugin_registry.setApplication(application)
     return plugin_registry
 
+
+##  The name of an OpenGL constant, which can be combined like a bit flag.
+class GLConstant(str):
+    def __or__(self, other):
+        return GLConstant(self + "|" + other)
+
+##  OpenGL bindings that record the functions called on them instead of calling OpenGL.
+#
+#   Constants evaluate to their name, so the recorded calls are readable.
+class RecordingGL:
+    def __init__(self):
+        self.calls = [] # Tuples of the function name followed by the arguments.
+
+    def __getattr__(self, name):
+        if name.startswith("GL_"):
+            return GLConstant(name)
+
+        def record(*args):
+            self.calls.append((name, ) + args)
+        return record
+
+    ##  Get the recorded calls of one function.
+    def getCalls(self, name):
+        return [call for call in self.calls if call[0] == name]
+
+    def clear(self):
+        self.calls.clear()
+
+##  A buffer that records binding and releasing it in the recorded calls of the bindings.
+class RecordingBuffer:
+    def __init__(self, gl, mesh, buffer_type):
+        self._gl = gl
+        self._mesh = mesh
+        self._type = buffer_type
+
+    def bind(self):
+        self._gl.calls.append(("bindBuffer", self._type, self._mesh))
+
+    def release(self):
+        self._gl.calls.append(("releaseBuffer", self._type, self._mesh))
+
+##  A shader program that records its use in the recorded calls of the bindings.
+class RecordingShaderProgram(ShaderProgram):
+    def __init__(self, gl):
+        super().__init__()
+        self._gl = gl
+
+    def setUniformValue(self, name, value, **kwargs):
+        self._gl.calls.append(("setUniformValue", name, value))
+
+    def enableAttribute(self, name, type, offset, stride = 0):
+        self._gl.calls.append(("enableAttribute", name))
+
+    def disableAttribute(self, name):
+        self._gl.calls.append(("disableAttribute", name))
+
+    def bind(self):
+        self._gl.calls.append(("bindShader", self))
+
+    def release(self):
+        self._gl.calls.append(("releaseShader", self))
+
+##  A frame buffer object that records binding and releasing it in the recorded calls of the bindings.
+#
+#   The pixels that can be read back are in the contents array, which is black by default.
+class RecordingFrameBufferObject(FrameBufferObject):
+    def __init__(self, gl, width, height):
+        super().__init__()
+        self._gl = gl
+        self.width = width
+        self.height = height
+        self.contents = numpy.zeros((max(height, 0), max(width, 0), 4), dtype = numpy.uint8)
+
+    def getTextureId(self):
+        return id(self)
+
+    def bind(self):
+        self._gl.calls.append(("bindFrameBuffer", self))
+
+    def release(self):
+        self._gl.calls.append(("releaseFrameBuffer", self))
+
+    def getContentsRegion(self, x, y, width, height):
+        self._gl.calls.append(("readFrameBuffer", self, x, y, width, height))
+        return self.contents[y:y + height, x:x + width]
+
+##  An OpenGL implementation that records all calls made to it.
+class RecordingOpenGL(OpenGL):
+    def __init__(self):
+        self._gl = RecordingGL()
+        self._buffer_manager = BufferManager()
+
+    def getBindingsObject(self):
+        return self._gl
+
+    def getBufferManager(self):
+        return self._buffer_manager
+
+    def createFrameBufferObject(self, width, height):
+        return RecordingFrameBufferObject(self._gl, width, height)
+
+    def createShaderProgram(self, file_name = None):
+        shader = RecordingShaderProgram(self._gl)
+        for name in ("model_matrix", "normal_matrix", "model_view_matrix", "model_view_projection_matrix", "view_matrix", "projection_matrix", "view_projection_matrix"):
+            shader.addBinding(name, name)
+        return shader
+
+    def createVertexBuffer(self, mesh, **kwargs):
+        return RecordingBuffer(self._gl, mesh, "vertex")
+
+    def createIndexBuffer(self, mesh, **kwargs):
+        if not mesh.hasIndices():
+            return None
+        return RecordingBuffer(self._gl, mesh, "index")
+
+@pytest.fixture()
+def opengl():
+    instance = RecordingOpenGL()
+    OpenGL.setInstance(instance)
+    yield instance
+    OpenGL.setInstance(None)